@@ -0,0 +1,66 @@
+"""
+Agreement report: clitics found with the tables of function words (clitic_mode='lexicon')
+vs clitics found with the dependency parser (clitic_mode='parser').
+
+Every text of the corpus is transcribed in both modes, the pairs (main word, clitic) of every section are compared.
+
+Usage:
+    PYTHONPATH=src python benchmarks/clitics_agreement.py [benchmarks/data/clitics_corpus.txt] [--show 10]
+"""
+import argparse
+import time
+from pathlib import Path
+
+from ru_transcript import transcribe_batch
+
+DEFAULT_CORPUS = Path(__file__).resolve().parent / 'data' / 'clitics_corpus.txt'
+
+
+def find_pairs(texts: list[str], clitic_mode: str) -> tuple[list[tuple[list[str], set]], float]:
+    start = time.perf_counter()
+    transcripts = transcribe_batch(texts, clitic_mode=clitic_mode)
+    elapsed = time.perf_counter() - start
+
+    sections = [
+        (transcript._tokens[section_num], transcript._phrasal_words_indexes[section_num])
+        for transcript in transcripts
+        for section_num in range(transcript._sections_len)
+    ]
+    return sections, elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('corpus', nargs='?', type=Path, default=DEFAULT_CORPUS)
+    parser.add_argument('--show', type=int, default=10, help='Number of disagreements to print.')
+    args = parser.parse_args()
+
+    texts = [line.strip() for line in args.corpus.read_text(encoding='utf-8').splitlines() if line.strip()]
+    parser_sections, parser_time = find_pairs(texts, 'parser')
+    lexicon_sections, lexicon_time = find_pairs(texts, 'lexicon')
+
+    same_sections = 0
+    true_positives = parser_total = lexicon_total = 0
+    disagreements = []
+    for (tokens, parser_pairs), (_, lexicon_pairs) in zip(parser_sections, lexicon_sections, strict=True):
+        same_sections += parser_pairs == lexicon_pairs
+        true_positives += len(parser_pairs & lexicon_pairs)
+        parser_total += len(parser_pairs)
+        lexicon_total += len(lexicon_pairs)
+        if parser_pairs != lexicon_pairs:
+            disagreements.append((tokens, parser_pairs, lexicon_pairs))
+
+    def describe(tokens: list[str], pairs: set) -> str:
+        return ', '.join(f'{tokens[clitic]}→{tokens[main]}' for main, clitic in sorted(pairs)) or '-'
+
+    print(f'texts: {len(texts)}, sections: {len(parser_sections)}')
+    print(f'sections with the same clitics: {same_sections / max(len(parser_sections), 1):.1%}')
+    print(f'precision of the lexicon: {true_positives / max(lexicon_total, 1):.1%}')
+    print(f'recall of the lexicon: {true_positives / max(parser_total, 1):.1%}')
+    print(f'time: parser {parser_time:.2f} s, lexicon {lexicon_time:.2f} s')
+    for tokens, parser_pairs, lexicon_pairs in disagreements[: args.show]:
+        print(f'\n{" ".join(tokens)}\n  parser:  {describe(tokens, parser_pairs)}\n  lexicon: {describe(tokens, lexicon_pairs)}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+"""
+Cold-start benchmark: parsing the source tables vs loading the precompiled data bundle.
+
+Every measurement runs in a fresh interpreter, so imports (openpyxl, nltk) are included.
+
+Usage:
+    PYTHONPATH=src python benchmarks/cold_start.py [--repeat 10]
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+
+SNIPPETS = {
+    'source files': (
+        'import time; t = time.perf_counter(); '
+        'from ru_transcript.data_bundle import parse_sources; parse_sources(); '
+        'print(time.perf_counter() - t)'
+    ),
+    'data bundle': (
+        'import time; t = time.perf_counter(); '
+        'from ru_transcript.data_bundle import read_bundle, sources_checksums; '
+        'b = read_bundle(); assert b is not None and b["sources"] == sources_checksums(); '
+        'print(time.perf_counter() - t)'
+    ),
+}
+
+
+def measure(snippet: str, repeat: int) -> list[float]:
+    # ru_transcript.data_bundle is imported through the package, so the time of importing the package
+    # itself is excluded by importing it before the timer starts
+    snippet = 'import ru_transcript.data_bundle as _; ' + snippet
+    return [
+        float(subprocess.run([sys.executable, '-c', snippet], capture_output=True, text=True, check=True).stdout)
+        for _ in range(repeat)
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    results = {name: measure(snippet, args.repeat) for name, snippet in SNIPPETS.items()}
+    for name, times in results.items():
+        print(f'{name:<15} median {statistics.median(times) * 1000:8.2f} ms   min {min(times) * 1000:8.2f} ms')
+
+    speedup = statistics.median(results['source files']) / statistics.median(results['data bundle'])
+    print(f'speedup: {speedup:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""
+Microbenchmark: splitting transliterated sections into phonemes.
+
+The compiled longest-match segmenter (`RuTranscript._join_phonemes`) is compared with the previous implementation
+that probed slices of 4, 3, 2 and 1 characters against a list of symbols (here without the iteration limit,
+the old limit of 10000 iterations was reached by sections of about 3000 symbols).
+
+Usage:
+    PYTHONPATH=src python benchmarks/join_phonemes.py [--lengths 10 100 1000 10000] [--repeat 5]
+"""
+import argparse
+import random
+import statistics
+import time
+from collections.abc import Callable
+
+from ru_transcript.ru_transcript import RuTranscript
+from ru_transcript.tools import epi_symbols
+
+
+def join_phonemes_probing(transliterated_tokens: list[str]) -> list[str]:
+    section_phonemes_list = []
+    joined_tokens = '_'.join(transliterated_tokens).replace('‑', '-')
+    i = 0
+    default_len = len(joined_tokens)
+    while i < default_len:
+        if joined_tokens[i] not in ['+', '-']:
+            n = 4
+            if i != default_len - 1:
+                while (joined_tokens[i : i + n] not in [*epi_symbols, '_', '|', '||', 'γ', 'ʐ']) and (n > 0):
+                    n -= 1
+                section_phonemes_list.append(joined_tokens[i : i + n])
+            elif joined_tokens[i] in [*epi_symbols, '||', 'γ']:
+                section_phonemes_list.append(joined_tokens[i])
+            i += n
+        else:
+            section_phonemes_list.append(joined_tokens[i])
+            i += 1
+
+    return [x for x in section_phonemes_list if x not in ['', 'ʲ']]
+
+
+def make_section(n_tokens: int, rng: random.Random) -> list[str]:
+    symbols = [symbol for symbol in epi_symbols if symbol not in {'_', '|', '||'}]
+    return [''.join(rng.choices(symbols, k=rng.randint(2, 8))) for _ in range(n_tokens)]
+
+
+def measure(function: Callable[[list[str]], list[str]], section: list[str], repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(section)
+        times.append(time.perf_counter() - start)
+
+    return statistics.median(times)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--lengths', type=int, nargs='+', default=[10, 100, 1000, 10000], help='Tokens in a section.')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    print(f'{"tokens":>8} {"symbols":>9} {"probing, ms":>12} {"compiled, ms":>13} {"speedup":>8}')
+    for n_tokens in args.lengths:
+        section = make_section(n_tokens, rng)
+        probing = measure(join_phonemes_probing, section, args.repeat)
+        compiled = measure(RuTranscript._join_phonemes, section, args.repeat)
+        n_symbols = len('_'.join(section))
+        print(f'{n_tokens:>8} {n_symbols:>9} {probing * 1000:>12.2f} {compiled * 1000:>13.2f} {probing / compiled:>7.1f}x')
+
+
+if __name__ == '__main__':
+    main()
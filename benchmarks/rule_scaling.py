@@ -0,0 +1,118 @@
+"""
+Microbenchmark: scaling of the rules that merge phonemes with the length of a section.
+
+The one-pass implementations of `long_ge`, `long_consonants` and of the removal of [s] after [t͡s]
+(`RuTranscript._join_phonemes`) are compared with the previous ones that deleted and inserted phonemes
+in the middle of the section and so took quadratic time. Time per phoneme of a linear implementation doesn't grow.
+
+Usage:
+    PYTHONPATH=src python benchmarks/rule_scaling.py [--lengths 1000 10000 50000 100000] [--repeat 3]
+"""
+import argparse
+import random
+import statistics
+import time
+from collections.abc import Callable
+
+from ru_transcript.consts import CAN_BE_LONG
+from ru_transcript.tools import allophone_records, long_consonants, long_ge
+from ru_transcript.tools.allophones_tools import get_allophone, get_phon
+
+
+def long_ge_in_place(section: list[str]) -> None:
+    for i, current_phon in enumerate(section[:-1]):
+        _, next_allophone = get_allophone(section, i + 1)
+        two_current = (get_phon(section, i), get_phon(section, i + 1))
+
+        if two_current in [('ʐ', 'ʐ'), ('z', 'ʐ')]:
+            section[i] = 'ʑː'
+            del section[i + 1]
+        elif (current_phon == 'ɕː') and next_allophone.is_voiced and not next_allophone.is_nasal:
+            section[i] = 'ʑː'
+
+
+def long_consonants_in_place(section: list[str]) -> None:
+    n = 0
+    section_iter = section[:]
+    for i, current_phon in enumerate(section_iter):
+        add_symb = False
+        try:
+            if not allophone_records[section_iter[i + 1]].is_symbol:
+                next_phon = section_iter[i + 1]
+            else:
+                next_phon = section_iter[i + 2]
+                add_symb = True
+        except IndexError:
+            next_phon = ''
+
+        if (current_phon[0] in CAN_BE_LONG) and (current_phon == next_phon):
+            del section[i + n]
+            del section[i + n + add_symb]
+            section.insert(i + n, current_phon + 'ː')
+            n -= 1
+
+
+def affricates_in_place(section: list[str]) -> list[str]:
+    n = 0
+    for allophone_index in range(len(section) - 1):
+        allophone = section[allophone_index + n]
+        next_allophone = section[allophone_index + n + 1]
+        if (allophone == 't͡s' and next_allophone == 's') or (allophone == 'd͡ʒ' and next_allophone == 'ʐ'):
+            del section[allophone_index + n + 1]
+            n -= 1
+
+    return section
+
+
+def affricates_one_pass(section: list[str]) -> list[str]:
+    # the loop of `RuTranscript._join_phonemes` after the split into phonemes
+    result = []
+    for phon in section:
+        if not (result and (result[-1], phon) in {('t͡s', 's'), ('d͡ʒ', 'ʐ')}):
+            result.append(phon)
+
+    return result
+
+
+RULES = {
+    'long_ge': (long_ge_in_place, long_ge, ['ʐ', 'ʐ', 'a', 'z', 'ʐ', 'o', 'ɕː', 'b', 'u', 't']),
+    'long_consonants': (long_consonants_in_place, long_consonants, ['t', 't', 'a', 's', '_', 's', 'o', 'n', 'n', 'u']),
+    'affricates': (affricates_in_place, affricates_one_pass, ['t͡s', 's', 'a', 'd͡ʒ', 'ʐ', 'o', 'k', 'u']),
+}
+
+
+def make_section(length: int, pattern: list[str], rng: random.Random) -> list[str]:
+    return [rng.choice(pattern) for _ in range(length)]
+
+
+def measure(function: Callable[[list[str]], object], section: list[str], repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        copy = section[:]
+        start = time.perf_counter()
+        function(copy)
+        times.append(time.perf_counter() - start)
+
+    return statistics.median(times)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--lengths', type=int, nargs='+', default=[1000, 10000, 50000, 100000], help='Phonemes.')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    print(f'{"rule":>16} {"phonemes":>9} {"in place, ms":>13} {"one pass, ms":>13} {"one pass, ns/phon":>18}')
+    for name, (in_place, one_pass, pattern) in RULES.items():
+        for length in args.lengths:
+            section = make_section(length, pattern, rng)
+            before = measure(in_place, section, args.repeat)
+            after = measure(one_pass, section, args.repeat)
+            print(
+                f'{name:>16} {length:>9} {before * 1000:>13.2f} {after * 1000:>13.2f} {after / length * 1e9:>18.0f}'
+            )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""
+Time to the first section: `RuTranscript.iter_sections` vs `RuTranscript.transcribe`.
+
+Paragraphs of a growing number of sentences are transcribed. With `transcribe` the first section can be read only
+when the whole paragraph is done, with `iter_sections` it is yielded as soon as it is transcribed.
+
+Usage:
+    PYTHONPATH=src python benchmarks/streaming.py [--sentences 1 4 16 64] [--repeat 3]
+"""
+import argparse
+import statistics
+import time
+from collections.abc import Callable
+
+from ru_transcript import RuTranscript
+from ru_transcript.models import preload
+
+SENTENCES = [
+    'Мороз и солнце, день чудесный.',
+    'Ещё ты дремлешь, друг прелестный.',
+    'Пора, красавица, проснись!',
+    'Открой сомкнуты негой взоры навстречу северной Авроры.',
+]
+
+
+def first_section_by_transcribe(text: str) -> float:
+    start = time.perf_counter()
+    ru_transcript = RuTranscript(text)
+    ru_transcript.transcribe()
+    ru_transcript.get_allophones()
+    return time.perf_counter() - start
+
+
+def first_section_by_iter_sections(text: str) -> float:
+    start = time.perf_counter()
+    next(RuTranscript(text).iter_sections())
+    return time.perf_counter() - start
+
+
+def measure(function: Callable[[str], float], text: str, repeat: int) -> float:
+    return statistics.median(function(text) for _ in range(repeat))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sentences', type=int, nargs='+', default=[1, 4, 16, 64])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    preload()
+    # the word caches are warmed up by the first paragraph, so both ways are measured with the same caches
+    first_section_by_transcribe(' '.join(SENTENCES))
+    print(f'{"sentences":>10} {"transcribe, ms":>15} {"iter_sections, ms":>18}')
+    for n_sentences in args.sentences:
+        text = ' '.join(SENTENCES[i % len(SENTENCES)] for i in range(n_sentences))
+        transcribe_time = measure(first_section_by_transcribe, text, args.repeat)
+        iter_sections_time = measure(first_section_by_iter_sections, text, args.repeat)
+        print(f'{n_sentences:>10} {transcribe_time * 1e3:>15.1f} {iter_sections_time * 1e3:>18.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""
+Microbenchmark: transliteration of stressed tokens.
+
+The built-in table-driven transliterator (`ru_transcript.transliterator.RusCyrlTransliterator`) is compared with
+Epitran 'rus-Cyrl' with the replacement of non-IPA symbols: time to create the transliterator and time per token.
+
+Usage:
+    PYTHONPATH=src python benchmarks/transliterator.py [--tokens 20000] [--repeat 3]
+"""
+import argparse
+import random
+import statistics
+import time
+from collections.abc import Callable
+
+from ru_transcript.transliterator import EpitranTransliterator, RusCyrlTransliterator, Transliterator
+
+LETTERS = 'абвгдеёжзийклмнопрстуфхцчшщъыьэюя'
+
+
+def load_epitran() -> EpitranTransliterator:
+    import epitran
+
+    return EpitranTransliterator(epitran.Epitran('rus-Cyrl'))
+
+
+def make_tokens(n_tokens: int, rng: random.Random) -> list[str]:
+    tokens = []
+    for _ in range(n_tokens):
+        token = [rng.choice(LETTERS) for _ in range(rng.randint(2, 12))]
+        token.insert(rng.randint(1, len(token)), '+')
+        tokens.append(''.join(token))
+
+    return tokens
+
+
+def measure(transliterator: Transliterator, tokens: list[str], repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for token in tokens:
+            transliterator.transliterate(token)
+        times.append(time.perf_counter() - start)
+
+    return statistics.median(times)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tokens', type=int, default=20000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    tokens = make_tokens(args.tokens, random.Random(0))
+    loaders: dict[str, Callable[[], Transliterator]] = {'builtin': RusCyrlTransliterator, 'epitran': load_epitran}
+    print(f'{"transliterator":>15} {"load, s":>8} {"per token, us":>14}')
+    for name, loader in loaders.items():
+        start = time.perf_counter()
+        transliterator = loader()
+        load_time = time.perf_counter() - start
+        per_token = measure(transliterator, tokens, args.repeat) / len(tokens)
+        print(f'{name:>15} {load_time:>8.3f} {per_token * 1e6:>14.1f}')
+
+
+if __name__ == '__main__':
+    main()
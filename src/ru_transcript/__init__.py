@@ -1,5 +1,5 @@
-from .ru_transcript import RuTranscript
+from .ru_transcript import RuTranscript, transcribe_batch
 from .tools.allophones_tools import get_allophone_info
 from .tools.main_tools import text_norm_tok
 
-__all__ = ['RuTranscript', 'get_allophone_info', 'text_norm_tok']
+__all__ = ['RuTranscript', 'get_allophone_info', 'text_norm_tok', 'transcribe_batch']
@@ -0,0 +1,154 @@
+import argparse
+import json
+import sys
+from collections import deque
+from collections.abc import Iterator
+from pathlib import Path
+from typing import IO, Any
+
+from .parallel import CorpusItem, CorpusResult, transcribe_corpus
+from .ru_transcript import CLITIC_MODES, DEFAULT_BATCH_SIZE, RuTranscript
+
+OUTPUT_FORMATS = ('allophones', 'phonemes', 'stressed')
+
+
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog='ru-transcript',
+        description='Phonetic transcription of russian texts. '
+        'Reads plain text lines or JSONL records and writes JSONL records, one per input line.',
+    )
+    parser.add_argument('input', nargs='?', default='-', help='Input file (default: stdin).')
+    parser.add_argument('-o', '--output', default='-', help='Output file (default: stdout).')
+    parser.add_argument('--input-format', choices=['text', 'jsonl'], default='text')
+    parser.add_argument('--text-field', default='text', help='Field with the text in JSONL records.')
+    parser.add_argument('--stressed-field', default=None, help='Field with the stressed text in JSONL records.')
+    parser.add_argument('-f', '--format', choices=OUTPUT_FORMATS, default='allophones', help='What to output.')
+    parser.add_argument('--workers', type=int, default=1, help='Number of worker processes (0 - all CPUs).')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help='Texts processed together.')
+    parser.add_argument('--stress-place', choices=['after', 'before'], default='after')
+    parser.add_argument('--stress-symbol', default='+')
+    parser.add_argument('--stress-accuracy-threshold', type=float, default=0.86)
+    parser.add_argument('--clitic-mode', choices=CLITIC_MODES, default='parser')
+    parser.add_argument('--save-stresses', action='store_true')
+    parser.add_argument('--save-spaces', action='store_true')
+    parser.add_argument('--save-pauses', action='store_true')
+
+    return parser.parse_args(argv)
+
+
+def _read_records(file: IO[str], args: argparse.Namespace) -> Iterator[tuple[dict[str, Any], str | None]]:
+    """
+    Read input records.
+
+    An invalid line doesn't stop the stream, it is returned with an error (a line that isn't a JSON object - as an
+    empty record).
+
+    param file: Input stream.
+    param args: Parsed command line arguments.
+    return: Iterator of pairs (record, error).
+    """
+    for line_num, line in enumerate(file, start=1):
+        if args.input_format == 'text':
+            yield {'text': line.rstrip('\n')}, None
+            continue
+
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield {}, f'Line {line_num}: invalid JSON ({e.msg}).'
+            continue
+        if not isinstance(record, dict):
+            yield {}, f'Line {line_num}: a JSON object is expected, got {type(record).__name__}.'
+        elif not isinstance(record.get(args.text_field), str):
+            yield record, f"No text in the field '{args.text_field}'."
+        elif args.stressed_field and not isinstance(record.get(args.stressed_field), str | None):
+            yield record, f"The field '{args.stressed_field}' is not a string."
+        else:
+            yield record, None
+
+
+def _get_output(transcript: RuTranscript, args: argparse.Namespace) -> list[str] | str:
+    if args.format == 'stressed':
+        return transcript.get_stressed_text(stress_symbol=args.stress_symbol)
+
+    get_sounds = transcript.get_allophones if args.format == 'allophones' else transcript.get_phonemes
+    return get_sounds(
+        save_stresses=args.save_stresses,
+        save_spaces=args.save_spaces,
+        save_pauses=args.save_pauses,
+        stress_symbol=args.stress_symbol,
+    )
+
+
+def transcribe_stream(file: IO[str], args: argparse.Namespace) -> Iterator[dict[str, Any]]:
+    """
+    Transcribe records of a stream.
+
+    Only the records that are being transcribed are kept in memory.
+
+    param file: Input stream.
+    param args: Parsed command line arguments.
+    return: Iterator of output records in the input order.
+    """
+    # the records are kept with their errors, a rejected record isn't sent to transcription
+    in_flight: deque[tuple[dict[str, Any], str | None]] = deque()
+
+    def corpus() -> Iterator[CorpusItem]:
+        for record, error in _read_records(file, args):
+            in_flight.append((record, error))
+            if error is not None:
+                continue
+            if args.input_format == 'text':
+                yield record['text']
+            else:
+                stressed_text = record.get(args.stressed_field) if args.stressed_field else None
+                yield record[args.text_field], stressed_text
+
+    def flush_invalid() -> Iterator[dict[str, Any]]:
+        while in_flight and in_flight[0][1] is not None:
+            record, error = in_flight.popleft()
+            record['error'] = error
+            yield record
+
+    results: Iterator[CorpusResult] = transcribe_corpus(
+        corpus(),
+        workers=args.workers or None,
+        chunksize=args.batch_size,
+        batch_size=args.batch_size,
+        stress_place=args.stress_place,
+        stress_accuracy_threshold=args.stress_accuracy_threshold,
+        clitic_mode=args.clitic_mode,
+    )
+    for result in results:
+        yield from flush_invalid()
+        record, _ = in_flight.popleft()
+        if result.error is None:
+            record[args.format] = _get_output(result.transcript, args)
+        else:
+            record['error'] = result.error
+        yield record
+
+    yield from flush_invalid()
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Command line entry point."""
+    args = _parse_args(argv)
+
+    file_in = sys.stdin if args.input == '-' else Path(args.input).open(encoding='utf-8')  # noqa: SIM115
+    file_out = sys.stdout if args.output == '-' else Path(args.output).open('w', encoding='utf-8')  # noqa: SIM115
+    try:
+        for record in transcribe_stream(file_in, args):
+            file_out.write(json.dumps(record, ensure_ascii=False) + '\n')
+    finally:
+        if file_in is not sys.stdin:
+            file_in.close()
+        if file_out is not sys.stdout:
+            file_out.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,316 @@
+import hashlib
+import mmap
+import pickle
+import warnings
+from collections import defaultdict
+from functools import cache
+from pathlib import Path
+from typing import Any
+
+DATA_DIR: Path = Path(__file__).resolve().parent / 'data'
+BUNDLE_PATH: Path = DATA_DIR / 'tables.bundle'
+# increase when the structure of the bundled tables changes
+BUNDLE_VERSION = 2
+BUNDLE_MAGIC = b'RUTB'
+SOURCE_FILES = (
+    'alphabet.txt',
+    'epi_symbols.txt',
+    'error_words_stresses_default.txt',
+    'function_words.txt',
+    'irregular_exceptions.xlsx',
+    'jotised.txt',
+    'paired_consonants.txt',
+    'ru_symbols.txt',
+    'ru_vowel_symbols.txt',
+    'sorted_allophones.txt',
+    'ts.txt',
+    'zh_sh_ts.txt',
+)
+ENCODING = 'utf-8'
+
+_HEADER_LEN = len(BUNDLE_MAGIC) + hashlib.sha256().digest_size
+
+# vowels
+# row
+row_map = {
+    'front_v': 'front',
+    'near_front_v': 'near front',
+    'central_v': 'central',
+    'near_back_v': 'near back',
+    'back_v': 'back',
+}
+# rise
+rise_map = {
+    'close_v': 'close',
+    'near_close_v': 'near close',
+    'close_mid_v': 'close mid',
+    'mid_v': 'mid',
+    'open_mid_v': 'open mid',
+    'near_open_v': 'near open',
+    'open_v': 'open',
+}
+# round / velarize
+round_map = {'rounded_v': 'round', 'velarize_v': 'velarize'}
+# consonants
+# place
+place_map = {
+    'bilabial_c': 'labial, bilabial',
+    'labiodental_c': 'labial, labiodental',
+    'dental_c': 'lingual, dental',
+    'palatinodental_c': 'lingual, palatinоdental',
+    'palatal_c': 'lingual, palatal',
+    'velar_c': 'lingual, velar',
+    'glottal_c': 'glottal',
+}
+# manner
+manner_map = {
+    'explosive_c': 'obstruent, explosive',
+    'affricate_c': 'obstruent, affricate',
+    'fricative_c': 'obstruent, fricative',
+    'nasal_c': 'sonorant, nasal',
+    'lateral_c': 'sonorant, lateral',
+    'vibrant_c': 'sonorant, vibrant',
+}
+# hard / soft
+palatalization_map = {'hard_c': 'hard', 'always_hard_c': 'ahard', 'soft_c': 'soft', 'always_soft_c': 'asoft'}
+# voice / silent
+voice_map = {'voiced_c': 'voiced', 'voiceless_c': 'voiceless'}
+# hissing sounds
+hissing_map = {'hissing_c': 'hissing'}
+# class
+class_map = {
+    'sonorous_class': 'sonorous',
+    'voiced_class': 'voiced',
+    'voiceless_class': 'voiceless',
+    'hissing_class': 'hissing',
+}
+
+
+def _read_symbols(file_name: str) -> tuple[str, ...]:
+    with DATA_DIR.joinpath(file_name).open(encoding=ENCODING) as f:
+        return tuple(f.read().split(', '))
+
+
+def _read_sorted_phonemes() -> dict[str, list[str]]:
+    with DATA_DIR.joinpath('sorted_allophones.txt').open(encoding=ENCODING) as f:
+        sorted_phonemes_txt = (line.replace('\n', '') for line in f)
+        sorted_phonemes_1 = {}
+        for group in sorted_phonemes_txt:
+            group_name, phonemes = group.split(' = ')
+            sorted_phonemes_1[group_name] = phonemes.split(', ')
+
+    sorted_phonemes = defaultdict(list)
+    for key, value in sorted_phonemes_1.items():
+        for element in value:
+            sorted_phonemes[element].append(key)
+
+    return dict(sorted_phonemes)
+
+
+def _read_paired_consonants() -> dict[str, str]:
+    with DATA_DIR.joinpath('paired_consonants.txt').open(encoding=ENCODING) as f:
+        paired_c_txt = f.read().replace(')', ')_').split('_, ')
+
+    pairs = (pair.split(', ') for pair in paired_c_txt)
+    return {voiced.replace('(', ''): silent.replace(')', '') for voiced, silent in pairs}
+
+
+def _build_allophones(
+    alphabet: tuple[str, ...], sorted_phonemes: dict[str, list[str]], paired_c: dict[str, str]
+) -> dict[str, dict[str, str | None]]:
+    """
+    Create a dictionary with phonetic information about all allophones.
+
+    param alphabet: All allophones.
+    param sorted_phonemes: Groups of every allophone.
+    param paired_c: Voiced consonants with their voiceless pairs.
+    return: Dictionary with phonetic information about every allophone and service symbol.
+    """
+    allophones = {
+        key: {'phon': 'V', 'row': None, 'rise': None, 'round': None, 'class': 'vowel'}
+        if 'total_v' in sorted_phonemes.get(key, [])
+        else {
+            'phon': 'C',
+            'place': None,
+            'manner': None,
+            'palatalization': None,
+            'voice': None,
+            'pair': None,
+            'hissing': None,
+            'class': None,
+        }
+        for key in alphabet
+    }
+    paired_c_inv = {v: k for k, v in paired_c.items()}
+
+    for key in allophones:  # noqa: PLC0206
+        for group in sorted_phonemes.get(key, []):
+            # vowels
+            if allophones[key]['phon'] == 'V':
+                row = row_map.get(group)
+                allophones[key]['row'] = row if row is not None else allophones[key]['row']
+                rise = rise_map.get(group)
+                allophones[key]['rise'] = rise if rise is not None else allophones[key]['rise']
+                round_ph = round_map.get(group)
+                allophones[key]['round'] = round_ph if round_ph is not None else allophones[key]['round']
+
+            # consonants
+            if allophones[key]['phon'] == 'C':
+                place = place_map.get(group)
+                allophones[key]['place'] = place if place is not None else allophones[key]['place']
+                manner = manner_map.get(group)
+                allophones[key]['manner'] = manner if manner is not None else allophones[key]['manner']
+                palatalization = palatalization_map.get(group)
+                allophones[key]['palatalization'] = (
+                    palatalization if palatalization is not None else allophones[key]['palatalization']
+                )
+                hissing = hissing_map.get(group)
+                allophones[key]['hissing'] = hissing if hissing is not None else allophones[key]['hissing']
+                class_consonants = class_map.get(group)
+                allophones[key]['class'] = class_consonants
+                voice = voice_map.get(group)
+                allophones[key]['voice'] = voice if voice is not None else allophones[key]['voice']
+                if (allophones[key]['voice'] == 'voiced') and (key in paired_c):
+                    allophones[key]['pair'] = paired_c[key]
+                elif (allophones[key]['voice'] == 'voiceless') and (key in paired_c.values()):
+                    allophones[key]['pair'] = paired_c_inv[key]
+
+    # symbols
+    allophones.update({symbol: {'phon': 'symb'} for symbol in ['+', '-', '|', '||', '_', '']})
+
+    return allophones
+
+
+def _read_function_words() -> dict[str, frozenset[str]]:
+    with DATA_DIR.joinpath('function_words.txt').open(encoding=ENCODING) as f:
+        groups = (line.rstrip('\n').split(' = ') for line in f if line.strip())
+        return {group_name: frozenset(words.split(', ')) for group_name, words in groups}
+
+
+def _read_irregular_exceptions() -> dict[str, str]:
+    from openpyxl import load_workbook  # noqa: PLC0415
+
+    wb = load_workbook(DATA_DIR / 'irregular_exceptions.xlsx')
+    sheet = wb.active
+
+    return {sheet[f'A{i}'].value: sheet[f'B{i}'].value for i in range(2, sheet.max_row + 1)}
+
+
+def _read_stress_defaults() -> dict[str, str]:
+    with DATA_DIR.joinpath('error_words_stresses_default.txt').open(encoding=ENCODING) as file:
+        error_words_stresses = file.readlines()
+
+    return {word.replace('+', '').replace('\n', ''): word.replace('\n', '') for word in error_words_stresses}
+
+
+def parse_sources() -> dict[str, Any]:
+    """
+    Parse all source tables from the data directory.
+
+    return: Dictionary with all tables used by the pipeline.
+    """
+    from nltk.stem.snowball import SnowballStemmer  # noqa: PLC0415
+
+    alphabet = _read_symbols('alphabet.txt')
+    sorted_phonemes = _read_sorted_phonemes()
+    paired_c = _read_paired_consonants()
+    irregular_exceptions = _read_irregular_exceptions()
+    snowball = SnowballStemmer('russian')
+
+    return {
+        'epi_symbols': _read_symbols('epi_symbols.txt'),
+        'ru_symbols': _read_symbols('ru_symbols.txt'),
+        'ru_vowel_symbols': _read_symbols('ru_vowel_symbols.txt'),
+        'alphabet': alphabet,
+        'zh_sh_ts': _read_symbols('zh_sh_ts.txt'),
+        'ts': _read_symbols('ts.txt'),
+        'jotised': _read_symbols('jotised.txt'),
+        'sorted_phonemes': sorted_phonemes,
+        'paired_c': paired_c,
+        'allophones': _build_allophones(alphabet, sorted_phonemes, paired_c),
+        'irregular_exceptions': irregular_exceptions,
+        'irregular_exceptions_stems': {snowball.stem(ex): pron for ex, pron in irregular_exceptions.items()},
+        'stress_default_dict': _read_stress_defaults(),
+        'function_words': _read_function_words(),
+    }
+
+
+def sources_checksums() -> dict[str, str]:
+    """
+    Compute checksums of the source tables.
+
+    return: Dictionary {file name: sha256 hex digest}.
+    """
+    return {name: hashlib.sha256(DATA_DIR.joinpath(name).read_bytes()).hexdigest() for name in SOURCE_FILES}
+
+
+def build_bundle(path: Path = BUNDLE_PATH) -> Path:
+    """
+    Compile all source tables into one binary bundle.
+
+    The bundle consists of a magic number, the sha256 of the payload and the payload itself -
+    a pickled dictionary with the bundle version, checksums of the source files and the parsed tables.
+
+    param path: Where to save the bundle.
+    return: Path to the bundle.
+    """
+    payload = pickle.dumps(
+        {'version': BUNDLE_VERSION, 'sources': sources_checksums(), 'tables': parse_sources()},
+        protocol=pickle.HIGHEST_PROTOCOL,
+    )
+    path.write_bytes(BUNDLE_MAGIC + hashlib.sha256(payload).digest() + payload)
+
+    return path
+
+
+def read_bundle(path: Path = BUNDLE_PATH) -> dict[str, Any] | None:
+    """
+    Read the binary bundle.
+
+    param path: Path to the bundle.
+    return: The bundle content or None if the bundle is missing, damaged or was built by another version.
+    """
+    if not path.is_file():
+        return None
+
+    with path.open('rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        if len(mm) < _HEADER_LEN or mm[: len(BUNDLE_MAGIC)] != BUNDLE_MAGIC:
+            return None
+        payload = memoryview(mm)[_HEADER_LEN:]
+        try:
+            if hashlib.sha256(payload).digest() != mm[len(BUNDLE_MAGIC) : _HEADER_LEN]:
+                return None
+            # the payload is our own artifact and its checksum has just been verified
+            bundle = pickle.loads(payload)  # noqa: S301
+        finally:
+            payload.release()
+
+    if bundle.get('version') != BUNDLE_VERSION:
+        return None
+
+    return bundle
+
+
+@cache
+def load_tables() -> dict[str, Any]:
+    """
+    Load the tables used by the pipeline.
+
+    The precompiled bundle is used if it is up to date, otherwise the tables are parsed from the source files.
+
+    return: Dictionary with all tables.
+    """
+    bundle = read_bundle()
+    if bundle is not None and bundle['sources'] == sources_checksums():
+        return bundle['tables']
+
+    warnings.warn(
+        f'The data bundle {BUNDLE_PATH.name} is missing or stale, the tables are parsed from the source files. '
+        'Run `python -m ru_transcript.data_bundle` to rebuild it.',
+        stacklevel=2,
+    )
+    return parse_sources()
+
+
+if __name__ == '__main__':
+    print(f'The data bundle is saved to {build_bundle()}')  # noqa: T201
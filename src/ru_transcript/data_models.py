@@ -1,3 +1,5 @@
+from dataclasses import dataclass
+
 from pydantic import BaseModel
 
 
@@ -16,3 +18,131 @@ class FirstPretonicAllophones(BaseModel):
     after_zh_sh_ts: str | None = None
     after_hard: str | None = None
     after_others: str | None = None
+
+
+class SectionTranscription(BaseModel):
+    """Transcription of one section of a text (the text between punctuation marks)."""
+
+    index: int
+    stressed_tokens: list[str]
+    # with stresses and spaces ('_')
+    phonemes: list[str]
+    allophones: list[str]
+    # pause after the section: '||' for long pauses, '|' for short pauses, None if there is no punctuation mark
+    pause: str | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class Allophone:
+    """Immutable phonetic features of an allophone or a service symbol with precomputed predicates."""
+
+    phon: str | None = None
+    # consonants
+    place: str | None = None
+    manner: str | None = None
+    palatalization: str | None = None
+    voice: str | None = None
+    pair: str | None = None
+    hissing: str | None = None
+    # vowels
+    row: str | None = None
+    rise: str | None = None
+    roundness: str | None = None
+    sound_class: str | None = None
+
+    is_vowel: bool = False
+    is_consonant: bool = False
+    is_symbol: bool = False
+    is_voiced: bool = False
+    is_voiceless: bool = False
+    # 'soft' or 'asoft' (always soft)
+    is_soft: bool = False
+    # 'hard' or 'ahard' (always hard)
+    is_hard: bool = False
+    always_hard: bool = False
+    always_soft: bool = False
+    # consonants that have a hard and a soft variant
+    paired_palatalization: bool = False
+    is_labial: bool = False
+    is_bilabial: bool = False
+    is_labiodental: bool = False
+    is_dental: bool = False
+    is_palatinodental: bool = False
+    is_velar: bool = False
+    is_nasal: bool = False
+    is_hissing: bool = False
+    is_round: bool = False
+    is_velarized: bool = False
+
+    @classmethod
+    def from_dict(cls, info: dict[str, str | None]) -> 'Allophone':
+        """
+        Create a record from phonetic information in the form of `get_allophone_info`.
+
+        param info: Phonetic information.
+        return: Record.
+        """
+        place = info.get('place') or ''
+        manner = info.get('manner') or ''
+        palatalization = info.get('palatalization') or ''
+        return cls(
+            phon=info.get('phon'),
+            place=info.get('place'),
+            manner=info.get('manner'),
+            palatalization=info.get('palatalization'),
+            voice=info.get('voice'),
+            pair=info.get('pair'),
+            hissing=info.get('hissing'),
+            row=info.get('row'),
+            rise=info.get('rise'),
+            roundness=info.get('round'),
+            sound_class=info.get('class'),
+            is_vowel=info.get('phon') == 'V',
+            is_consonant=info.get('phon') == 'C',
+            is_symbol=info.get('phon') == 'symb',
+            is_voiced=info.get('voice') == 'voiced',
+            is_voiceless=info.get('voice') == 'voiceless',
+            is_soft='soft' in palatalization,
+            is_hard='hard' in palatalization,
+            always_hard=palatalization == 'ahard',
+            always_soft=palatalization == 'asoft',
+            paired_palatalization=palatalization in {'hard', 'soft'},
+            is_labial='lab' in place,
+            is_bilabial=place == 'labial, bilabial',
+            is_labiodental=place == 'labial, labiodental',
+            is_dental=place == 'lingual, dental',
+            is_palatinodental=place == 'lingual, palatinоdental',
+            is_velar=place == 'lingual, velar',
+            is_nasal='nasal' in manner,
+            is_hissing=info.get('hissing') == 'hissing',
+            is_round=info.get('round') == 'round',
+            is_velarized=info.get('round') == 'velarize',
+        )
+
+    def to_dict(self) -> dict[str, str | None]:
+        """
+        Return phonetic information in the form of `get_allophone_info`.
+
+        return: Dictionary with the features of a vowel, a consonant or a service symbol.
+        """
+        if self.phon == 'V':
+            return {
+                'phon': self.phon,
+                'row': self.row,
+                'rise': self.rise,
+                'round': self.roundness,
+                'class': self.sound_class,
+            }
+        if self.phon == 'C':
+            return {
+                'phon': self.phon,
+                'place': self.place,
+                'manner': self.manner,
+                'palatalization': self.palatalization,
+                'voice': self.voice,
+                'pair': self.pair,
+                'hissing': self.hissing,
+                'class': self.sound_class,
+            }
+
+        return {'phon': self.phon}
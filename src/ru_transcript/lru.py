@@ -0,0 +1,110 @@
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Any, NamedTuple
+
+
+class CacheInfo(NamedTuple):
+    """Statistics of a cache."""
+
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class LRUCache:
+    """Bounded thread-safe cache that evicts the least recently used items."""
+
+    def __init__(self, maxsize: int) -> None:
+        """
+        Initialize the cache.
+
+        param maxsize: Maximum number of items. With 0 the cache is disabled.
+        """
+        self.maxsize = maxsize
+        self._data: OrderedDict[Hashable, Any] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def __len__(self) -> int:
+        """Return the number of cached items."""
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        """Check whether the key is cached (doesn't change statistics and the order of items)."""
+        return key in self._data
+
+    def get(self, key: Hashable, default: Any = None) -> Any:  # noqa: ANN401
+        """
+        Return a cached value and mark it as recently used.
+
+        param key: Key of the value.
+        param default: What to return if the key isn't cached.
+        return: The cached value or `default`.
+        """
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self._misses += 1
+                return default
+            self._data.move_to_end(key)
+            self._hits += 1
+
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:  # noqa: ANN401
+        """
+        Cache a value, evicting the least recently used one if the cache is full.
+
+        param key: Key of the value.
+        param value: Value to cache.
+        """
+        if self.maxsize <= 0:
+            return
+
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:  # noqa: ANN401
+        """
+        Return a cached value, computing and caching it on a miss.
+
+        param key: Key of the value.
+        param compute: Function that computes the value.
+        return: The value.
+        """
+        sentinel = object()
+        value = self.get(key, sentinel)
+        if value is sentinel:
+            value = compute()
+            self.put(key, value)
+
+        return value
+
+    def resize(self, maxsize: int) -> None:
+        """
+        Change the maximum size of the cache.
+
+        param maxsize: New maximum number of items. With 0 the cache is disabled and cleared.
+        """
+        with self._lock:
+            self.maxsize = maxsize
+            while len(self._data) > max(maxsize, 0):
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all items and reset statistics."""
+        with self._lock:
+            self._data.clear()
+            self._hits = 0
+            self._misses = 0
+
+    def cache_info(self) -> CacheInfo:
+        """Return statistics of the cache."""
+        return CacheInfo(self._hits, self._misses, self.maxsize, len(self._data))
@@ -0,0 +1,182 @@
+import os
+import threading
+from collections.abc import Callable, Iterable
+from typing import TYPE_CHECKING, Any, TypeVar
+
+from .replacer import DictReplacer, load_plane_dict
+from .resources import resource_path
+from .transliterator import EpitranTransliterator, RusCyrlTransliterator
+
+if TYPE_CHECKING:
+    from epitran import Epitran
+    from spacy.language import Language
+    from stressrnn import StressRNN
+    from tps.modules import Replacer
+
+    from .transliterator import Transliterator
+
+SPACY_MODEL = 'ru_core_news_sm'
+# components that are not needed when only the lemma of an isolated token is required
+# (the lemmatizer doesn't use the results of the parser and the NER)
+LEMMA_DISABLED_PIPES = ('tok2vec', 'tagger', 'morphologizer', 'attribute_ruler', 'parser', 'ner')
+# components that are not needed for the parse of a section (lemmas are always taken from isolated tokens)
+PARSE_DISABLED_PIPES = ('lemmatizer', 'ner')
+TRANSLITERATOR_ENV = 'RU_TRANSCRIPT_TRANSLITERATOR'
+# transliterators of stressed tokens, the first one is the default
+TRANSLITERATORS = ('builtin', 'epitran')
+
+T = TypeVar('T')
+
+_lock = threading.RLock()
+_instances: dict[str, Any] = {}
+# transliterator chosen with `set_transliterator` (None - RU_TRANSCRIPT_TRANSLITERATOR or the default one)
+_transliterator: str | None = None
+
+
+def _get_or_load(name: str, loader: Callable[[], T]) -> T:
+    """
+    Return a shared instance of a heavy resource, loading it on the first request.
+
+    param name: Name of the resource in the registry.
+    param loader: Function that creates the resource.
+    return: The shared instance.
+    """
+    try:
+        return _instances[name]
+    except KeyError:
+        with _lock:
+            if name not in _instances:
+                _instances[name] = loader()
+
+            return _instances[name]
+
+
+def _load_nlp() -> 'Language':
+    import spacy  # noqa: PLC0415
+
+    # one pipeline for both uses: the parse of a section needs the morphologizer, the lemmas of isolated tokens
+    # are found without it (LEMMA_DISABLED_PIPES), so they don't depend on POS tags
+    return spacy.load(SPACY_MODEL)
+
+
+def _load_epitran() -> 'Epitran':
+    import epitran  # noqa: PLC0415
+
+    return epitran.Epitran('rus-Cyrl')
+
+
+def _load_stress_rnn() -> 'StressRNN':
+    from stressrnn import StressRNN  # noqa: PLC0415
+
+    return StressRNN()
+
+
+def _load_replacer(dict_name: str) -> 'Replacer':
+    from tps import modules as md  # noqa: PLC0415
+
+    return md.Replacer([str(resource_path(dict_name)), 'plane'])
+
+
+def get_nlp() -> 'Language':
+    """Return the shared spaCy pipeline."""
+    return _get_or_load('nlp', _load_nlp)
+
+
+def get_epitran() -> 'Epitran':
+    """Return the shared Epitran transliterator for russian."""
+    return _get_or_load('epitran', _load_epitran)
+
+
+def get_transliterator_name() -> str:
+    """Return the name of the transliterator set by `set_transliterator`, RU_TRANSCRIPT_TRANSLITERATOR or 'builtin'."""
+    name = _transliterator or os.environ.get(TRANSLITERATOR_ENV) or TRANSLITERATORS[0]
+    if name not in TRANSLITERATORS:
+        raise ValueError(f'Unknown transliterator {name!r}, use one of {TRANSLITERATORS}.')  # noqa: TRY003
+
+    return name
+
+
+def set_transliterator(name: str | None) -> None:
+    """
+    Choose the transliterator of stressed tokens.
+
+    param name: One of TRANSLITERATORS. If None, RU_TRANSCRIPT_TRANSLITERATOR or 'builtin' is used.
+    """
+    global _transliterator  # noqa: PLW0603
+    if name is not None and name not in TRANSLITERATORS:
+        raise ValueError(f'Unknown transliterator {name!r}, use one of {TRANSLITERATORS}.')  # noqa: TRY003
+    _transliterator = name
+
+
+def get_transliterator() -> 'Transliterator':
+    """Return the shared transliterator of stressed tokens (the built-in one or Epitran)."""
+    if get_transliterator_name() == 'epitran':
+        return _get_or_load('epitran_transliterator', lambda: EpitranTransliterator(get_epitran()))
+
+    return _get_or_load('builtin_transliterator', RusCyrlTransliterator)
+
+
+def get_stress_rnn() -> 'StressRNN':
+    """Return the shared StressRNN model."""
+    return _get_or_load('stress_rnn', _load_stress_rnn)
+
+
+def _load_dict_replacer(dict_name: str) -> DictReplacer:
+    return DictReplacer(
+        load_plane_dict(resource_path(dict_name)),
+        lambda: _get_or_load(f'{dict_name}_tps_replacer', lambda: _load_replacer(dict_name)),
+    )
+
+
+def get_e_replacer() -> DictReplacer:
+    """Return the shared 'е - э' replacer."""
+    return _get_or_load('e_replacer', lambda: _load_dict_replacer('e.dict'))
+
+
+def get_yo_replacer() -> DictReplacer:
+    """Return the shared 'е - ё' replacer."""
+    return _get_or_load('yo_replacer', lambda: _load_dict_replacer('yo.dict'))
+
+
+def get_lemma(token: str) -> str:
+    """
+    Return the lemma of an isolated token.
+
+    param token: Input token.
+    return: Lemma of the token.
+    """
+    return get_nlp()(token, disable=LEMMA_DISABLED_PIPES)[0].lemma_
+
+
+def get_lemmas(tokens: Iterable[str], batch_size: int = 64) -> dict[str, str]:
+    """
+    Return lemmas of isolated tokens, processing them with one `nlp.pipe` call.
+
+    param tokens: Input tokens.
+    param batch_size: Batch size for the spaCy pipeline.
+    return: Dictionary {token: lemma}.
+    """
+    tokens = list(dict.fromkeys(tokens))
+    docs = get_nlp().pipe(tokens, batch_size=batch_size, disable=LEMMA_DISABLED_PIPES)
+
+    return {token: doc[0].lemma_ for token, doc in zip(tokens, docs, strict=True)}
+
+
+def preload() -> None:
+    """Load all heavy resources at once (for example, in a worker initializer)."""
+    get_nlp()
+    get_transliterator()
+    get_stress_rnn()
+    get_e_replacer()
+    get_yo_replacer()
+
+
+def is_loaded(name: str) -> bool:
+    """
+    Check whether a resource has already been loaded.
+
+    param name: One of 'nlp', 'epitran', 'builtin_transliterator', 'epitran_transliterator', 'stress_rnn',
+        'e_replacer', 'yo_replacer', 'e.dict_tps_replacer', 'yo.dict_tps_replacer'.
+    return: True if the resource is loaded.
+    """
+    return name in _instances
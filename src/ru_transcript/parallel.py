@@ -0,0 +1,202 @@
+import os
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from itertools import islice
+from typing import Any, NamedTuple
+
+from .models import preload
+from .ru_transcript import DEFAULT_BATCH_SIZE, RuTranscript, transcribe_batch
+
+CorpusItem = str | tuple[str, str | None]
+_Task = tuple[int, str, str | None]
+# error of a text that crashed a worker process
+CRASH_ERROR = 'BrokenProcessPool: the worker process crashed'
+
+
+class CorpusResult(NamedTuple):
+    """Result of transcription of one text of a corpus."""
+
+    index: int
+    text: str
+    transcript: RuTranscript | None
+    error: str | None
+
+
+def _init_worker() -> None:
+    """Load all models once per worker process."""
+    preload()
+
+
+def _format_error(e: BaseException) -> str:
+    return f'{type(e).__name__}: {e}'
+
+
+def _transcribe_chunk(chunk: list[_Task], batch_size: int, kwargs: dict[str, Any]) -> list[CorpusResult]:
+    """
+    Transcribe a chunk of texts.
+
+    If the batch fails, texts are transcribed one by one, so an error affects only the text that caused it.
+
+    param chunk: Tasks (index, text, stressed text).
+    param batch_size: Batch size for `transcribe_batch`.
+    param kwargs: Other arguments of `RuTranscript`.
+    return: Results in the order of the chunk.
+    """
+    try:
+        transcripts = transcribe_batch(
+            [text for _, text, _ in chunk], [stressed for _, _, stressed in chunk], batch_size=batch_size, **kwargs
+        )
+        return [
+            CorpusResult(index, text, transcript, None)
+            for (index, text, _), transcript in zip(chunk, transcripts, strict=True)
+        ]
+    except Exception:
+        results = []
+        for index, text, stressed_text in chunk:
+            try:
+                transcript = RuTranscript(text, stressed_text, **kwargs)
+                transcript.transcribe(batch_size=batch_size)
+                results.append(CorpusResult(index, text, transcript, None))
+            except Exception as e:  # noqa: PERF203
+                results.append(CorpusResult(index, text, None, _format_error(e)))
+
+        return results
+
+
+def _tasks(texts: Iterable[CorpusItem]) -> Iterator[_Task]:
+    for index, item in enumerate(texts):
+        if isinstance(item, str):
+            yield index, item, None
+        else:
+            text, stressed_text = item
+            yield index, text, stressed_text
+
+
+def _chunks(tasks: Iterator[_Task], chunksize: int) -> Iterator[list[_Task]]:
+    while chunk := list(islice(tasks, chunksize)):
+        yield chunk
+
+
+class _PoolRunner:
+    """Process pool that survives crashes of its workers."""
+
+    def __init__(self, workers: int, batch_size: int, kwargs: dict[str, Any]) -> None:
+        """
+        Initialize the runner.
+
+        param workers: Number of worker processes.
+        param batch_size: Batch size for `transcribe_batch`.
+        param kwargs: Other arguments of `RuTranscript`.
+        """
+        self._workers = workers
+        self._batch_size = batch_size
+        self._kwargs = kwargs
+        self._executor = self._new_executor()
+        self.pending: deque[tuple[list[_Task], Future]] = deque()
+
+    def _new_executor(self, workers: int | None = None) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(max_workers=workers or self._workers, initializer=_init_worker)
+
+    def _submit(self, chunk: list[_Task]) -> Future:
+        return self._executor.submit(_transcribe_chunk, chunk, self._batch_size, self._kwargs)
+
+    def submit(self, chunk: list[_Task]) -> None:
+        """Queue a chunk of texts."""
+        self.pending.append((chunk, self._submit(chunk)))
+
+    def _restart(self) -> None:
+        """Replace the broken pool and resubmit the chunks that didn't finish in it."""
+        self._executor = self._new_executor()
+        for i, (chunk, future) in enumerate(self.pending):
+            if not future.done() or future.cancelled() or future.exception() is not None:
+                self.pending[i] = (chunk, self._submit(chunk))
+
+    def _isolate(self, chunk: list[_Task]) -> list[CorpusResult]:
+        """
+        Transcribe the texts of a chunk that was in a crashed pool one by one.
+
+        Every text runs alone in a separate single-worker pool, so a crash is caused by the text itself.
+
+        param chunk: Tasks (index, text, stressed text).
+        return: Results in the order of the chunk.
+        """
+        results = []
+        executor = self._new_executor(1)
+        try:
+            for task in chunk:
+                try:
+                    results.extend(executor.submit(_transcribe_chunk, [task], self._batch_size, self._kwargs).result())
+                except BrokenProcessPool:  # noqa: PERF203
+                    executor.shutdown(wait=True)
+                    executor = self._new_executor(1)
+                    results.append(CorpusResult(task[0], task[1], None, CRASH_ERROR))
+        finally:
+            executor.shutdown(wait=True)
+
+        return results
+
+    def next_results(self) -> Iterator[CorpusResult]:
+        """Wait for the oldest chunk and return its results."""
+        chunk, future = self.pending.popleft()
+        try:
+            results = future.result()
+        except BrokenProcessPool:
+            # any chunk in flight could crash the pool: nothing else runs while the oldest one is isolated,
+            # the other unfinished chunks are resubmitted after that
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            results = self._isolate(chunk)
+            self._restart()
+
+        yield from results
+
+    def shutdown(self) -> None:
+        """Stop the worker processes."""
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+
+def transcribe_corpus(
+    texts: Iterable[CorpusItem],
+    workers: int | None = None,
+    chunksize: int = DEFAULT_BATCH_SIZE,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    max_pending_chunks: int | None = None,
+    **kwargs: str | dict | float | None,
+) -> Iterator[CorpusResult]:
+    """
+    Transcribe a corpus with a pool of worker processes.
+
+    Every worker loads the models once in its initializer and transcribes chunks of texts with `transcribe_batch`.
+    The input is read lazily and results are yielded in the input order as soon as they are ready,
+    so memory use doesn't depend on the size of the corpus. An error on one text is reported in its result
+    (`CorpusResult.error`) and doesn't stop the run, the same is true for a crash of a worker process.
+
+    :param texts: Texts or pairs (text, stressed text).
+    :param workers: Number of worker processes (all CPUs by default). With 1 texts are transcribed in this process.
+    :param chunksize: Number of texts sent to a worker at once.
+    :param batch_size: Batch size for `transcribe_batch`.
+    :param max_pending_chunks: Maximum number of chunks in flight (2 * workers by default).
+    :param kwargs: Other arguments of `RuTranscript` (stress_place, replacement_dict, stress_accuracy_threshold,
+        clitic_mode).
+    :return: Iterator of `CorpusResult` in the input order.
+    """
+    workers = workers or os.cpu_count() or 1
+    chunks = _chunks(_tasks(texts), chunksize)
+
+    if workers == 1:
+        for chunk in chunks:
+            yield from _transcribe_chunk(chunk, batch_size, kwargs)
+        return
+
+    max_pending_chunks = max_pending_chunks or 2 * workers
+    runner = _PoolRunner(workers, batch_size, kwargs)
+    try:
+        for chunk in chunks:
+            runner.submit(chunk)
+            if len(runner.pending) >= max_pending_chunks:
+                yield from runner.next_results()
+        while runner.pending:
+            yield from runner.next_results()
+    finally:
+        runner.shutdown()
@@ -0,0 +1,55 @@
+import re
+from collections.abc import Callable
+from pathlib import Path
+
+# tokens that are looked up in the dictionary as a whole, other tokens are given to the replacer of tps
+_WORD_PATTERN = re.compile('[а-яё]+')
+
+
+def load_plane_dict(path: str | Path) -> dict[str, str]:
+    """
+    Read a 'plane' dictionary of tps (one 'word|replacement' pair per line).
+
+    param path: Path to the dictionary.
+    return: Dictionary {word: replacement}.
+    """
+    table = {}
+    with Path(path).open(encoding='utf-8') as file:
+        for line in file:
+            key, sep, value = line.rstrip('\r\n').partition('|')
+            if sep:
+                table[key] = value
+
+    return table
+
+
+class DictReplacer:
+    """
+    Replacer of words by a 'plane' dictionary of tps.
+
+    A token of lowercase russian letters is replaced with one lookup in the dictionary. Other tokens (with hyphens,
+    latin letters and so on) are split into words by tps, so they are given to the replacer of tps, which is loaded
+    only on the first such token.
+    """
+
+    def __init__(self, table: dict[str, str], load_fallback: Callable[[], Callable[[str], str]]) -> None:
+        """
+        Initialize the replacer.
+
+        param table: Dictionary {word: replacement}.
+        param load_fallback: Function that returns the replacer of tps for the same dictionary.
+        """
+        self.table = table
+        self._load_fallback = load_fallback
+
+    def __call__(self, token: str) -> str:
+        """
+        Replace a token without stresses.
+
+        param token: Token without stresses.
+        return: Replaced token.
+        """
+        if _WORD_PATTERN.fullmatch(token) is not None:
+            return self.table.get(token, token)
+
+        return self._load_fallback()(token)
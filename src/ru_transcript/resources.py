@@ -0,0 +1,317 @@
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import threading
+import warnings
+from pathlib import Path
+
+CACHE_DIR_ENV = 'RU_TRANSCRIPT_CACHE_DIR'
+OFFLINE_ENV = 'RU_TRANSCRIPT_OFFLINE'
+DEFAULT_CACHE_DIR: Path = Path.home() / '.cache' / 'ru_transcript'
+MANIFEST_NAME = 'manifest.json'
+# sha256 of the known resources in the format of `sha256sum`, filled with `python -m ru_transcript.resources pin`
+PINS_PATH: Path = Path(__file__).resolve().parent / 'data' / 'resources.sha256'
+# dictionaries of the tps package that are used for 'е - ё' and 'е - э' replacements
+RESOURCES = ('yo.dict', 'e.dict')
+DOWNLOAD_TIMEOUT = 30.0
+
+_lock = threading.Lock()
+# names of the resources whose download timed out but is still running in the background
+_abandoned_downloads: set[str] = set()
+_downloads_lock = threading.Lock()
+
+
+class ResourceError(Exception):
+    """Base class for errors of the resource manager."""
+
+
+class ResourceUnavailableError(ResourceError, FileNotFoundError):
+    """The resource is not cached and can't be downloaded."""
+
+
+class ResourceChecksumError(ResourceError):
+    """The cached resource doesn't match its checksum."""
+
+
+def read_pins(path: Path = PINS_PATH) -> dict[str, str]:
+    """
+    Read pinned checksums of resources.
+
+    param path: File with lines '<sha256>  <name>'.
+    return: Dictionary {name: sha256 hex digest}.
+    """
+    if not path.is_file():
+        return {}
+
+    pins = {}
+    for line in path.read_text(encoding='utf-8').splitlines():
+        if line.strip() and not line.startswith('#'):
+            checksum, name = line.split(maxsplit=1)
+            pins[name.strip()] = checksum
+
+    return pins
+
+
+# a resource with a pinned checksum is accepted only if it matches the pin, other resources are trusted on first use
+PINNED_CHECKSUMS: dict[str, str] = read_pins()
+
+
+def get_cache_dir(cache_dir: str | Path | None = None) -> Path:
+    """
+    Return the directory where resources are cached.
+
+    param cache_dir: Explicit cache directory. If None, RU_TRANSCRIPT_CACHE_DIR or ~/.cache/ru_transcript is used.
+    return: Path to the cache directory.
+    """
+    if cache_dir is None:
+        cache_dir = os.environ.get(CACHE_DIR_ENV) or DEFAULT_CACHE_DIR
+
+    return Path(cache_dir).expanduser()
+
+
+def is_offline() -> bool:
+    """Check whether the strict offline mode is enabled with RU_TRANSCRIPT_OFFLINE."""
+    return os.environ.get(OFFLINE_ENV, '').lower() in {'1', 'true', 'yes', 'on'}
+
+
+def file_checksum(path: Path) -> str:
+    """
+    Compute sha256 of a file.
+
+    param path: Path to the file.
+    return: Hex digest.
+    """
+    sha256 = hashlib.sha256()
+    with path.open('rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            sha256.update(chunk)
+
+    return sha256.hexdigest()
+
+
+def _read_manifest(cache_dir: Path) -> dict[str, str]:
+    manifest_path = cache_dir / MANIFEST_NAME
+    if not manifest_path.is_file():
+        return {}
+
+    return json.loads(manifest_path.read_text(encoding='utf-8'))
+
+
+def _write_manifest(cache_dir: Path, manifest: dict[str, str]) -> None:
+    tmp_path = cache_dir / f'{MANIFEST_NAME}.{os.getpid()}.tmp'
+    tmp_path.write_text(json.dumps(manifest, indent=2, sort_keys=True), encoding='utf-8')
+    tmp_path.replace(cache_dir / MANIFEST_NAME)
+
+
+def _download(name: str, timeout: float) -> Path:
+    """
+    Download a resource with tps, waiting for it at most `timeout` seconds.
+
+    tps doesn't take a timeout and chooses the URL itself, so the download runs in a daemon thread
+    (the global socket timeout isn't changed). A thread can't be stopped, so after a timeout the download goes on
+    in the background: until it ends the resource is reported as unavailable (see `_locate`), and the file
+    it writes after that is removed, so it is never used without a new check.
+
+    param name: Name of the resource.
+    param timeout: Timeout in seconds.
+    return: Path to the downloaded resource.
+    """
+    from tps import download  # noqa: PLC0415
+
+    result: dict[str, Path | BaseException] = {}
+    abandoned = threading.Event()
+
+    def run() -> None:
+        try:
+            outcome: dict[str, Path | BaseException] = {'path': Path(download(name))}
+        except BaseException as e:
+            outcome = {'error': e}
+        with _downloads_lock:
+            if not abandoned.is_set():
+                result.update(outcome)
+                return
+            _abandoned_downloads.discard(name)
+            if 'path' in outcome:
+                outcome['path'].unlink(missing_ok=True)
+
+    thread = threading.Thread(target=run, name=f'download-{name}', daemon=True)
+    thread.start()
+    thread.join(timeout)
+    with _downloads_lock:
+        if not result:
+            abandoned.set()
+            _abandoned_downloads.add(name)
+            raise TimeoutError(f'no response in {timeout} s')  # noqa: TRY003
+    if 'error' in result:
+        raise result['error']
+
+    return result['path']
+
+
+def _locate(name: str, offline: bool) -> Path:
+    """
+    Find a resource in the local tps data or download it.
+
+    param name: Name of the resource.
+    param offline: If True, never go to the network.
+    return: Path to the resource outside the cache.
+    """
+    from tps import find  # noqa: PLC0415
+
+    if name in _abandoned_downloads:
+        # the file of a download that is still running may be incomplete
+        raise ResourceUnavailableError(f"Resource '{name}' is still being downloaded after a timeout.")  # noqa: TRY003
+
+    try:
+        return Path(find(name, raise_exception=True))
+    except FileNotFoundError:
+        if offline:
+            raise ResourceUnavailableError(  # noqa: B904, TRY003
+                f"Resource '{name}' is not cached and the offline mode is enabled ({OFFLINE_ENV}). "
+                'Run `python -m ru_transcript.resources prefetch` with network access first.'
+            )
+
+    try:
+        return _download(name, DOWNLOAD_TIMEOUT)
+    except Exception as e:
+        raise ResourceUnavailableError(f"Resource '{name}' can't be downloaded: {e}") from e  # noqa: TRY003
+
+
+def _check_pin(name: str, path: Path, checksum: str) -> None:
+    pin = PINNED_CHECKSUMS.get(name)
+    if pin is None:
+        warnings.warn(f"Resource '{name}' has no pinned checksum, '{path}' is trusted on first use.", stacklevel=3)
+    elif checksum != pin:
+        raise ResourceChecksumError(f"Checksum of '{path}' doesn't match the pinned checksum of '{name}'.")  # noqa: TRY003
+
+
+def _add_to_cache(name: str, source: Path, cache_dir: Path) -> Path:
+    checksum = file_checksum(source)
+    _check_pin(name, source, checksum)
+
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    path = cache_dir / name
+    tmp_path = cache_dir / f'{name}.{os.getpid()}.tmp'
+    shutil.copyfile(source, tmp_path)
+    tmp_path.replace(path)
+
+    manifest = _read_manifest(cache_dir)
+    manifest[name] = checksum
+    _write_manifest(cache_dir, manifest)
+
+    return path
+
+
+def verify(name: str, cache_dir: str | Path | None = None) -> Path:
+    """
+    Verify the checksum of a cached resource.
+
+    A resource with a pinned checksum must match the pin. Other resources must match the manifest, a resource that was
+    put into the cache by hand (without a manifest record) is recorded on the first check.
+
+    param name: Name of the resource.
+    param cache_dir: Cache directory.
+    return: Path to the verified resource.
+    """
+    cache_dir = get_cache_dir(cache_dir)
+    path = cache_dir / name
+    if not path.is_file():
+        raise ResourceUnavailableError(f"Resource '{name}' is not in the cache {cache_dir}.")  # noqa: TRY003
+
+    checksum = file_checksum(path)
+    if name in PINNED_CHECKSUMS:
+        if checksum != PINNED_CHECKSUMS[name]:
+            raise ResourceChecksumError(  # noqa: TRY003
+                f"Checksum of '{path}' doesn't match the pinned checksum. "
+                'Remove the file and run `python -m ru_transcript.resources prefetch` again.'
+            )
+        return path
+
+    manifest = _read_manifest(cache_dir)
+    if name not in manifest:
+        _check_pin(name, path, checksum)
+        manifest[name] = checksum
+        _write_manifest(cache_dir, manifest)
+    elif manifest[name] != checksum:
+        raise ResourceChecksumError(  # noqa: TRY003
+            f"Checksum of '{path}' doesn't match the manifest. "
+            'Remove the file and run `python -m ru_transcript.resources prefetch` again.'
+        )
+
+    return path
+
+
+def resource_path(name: str, cache_dir: str | Path | None = None, offline: bool | None = None) -> Path:
+    """
+    Return a path to a verified local copy of a resource, fetching it into the cache if needed.
+
+    param name: Name of the resource (for example, 'yo.dict').
+    param cache_dir: Cache directory. If None, RU_TRANSCRIPT_CACHE_DIR or ~/.cache/ru_transcript is used.
+    param offline: Never go to the network. If None, RU_TRANSCRIPT_OFFLINE is used.
+    return: Path to the resource.
+    """
+    cache_dir = get_cache_dir(cache_dir)
+    if offline is None:
+        offline = is_offline()
+
+    with _lock:
+        if (cache_dir / name).is_file():
+            return verify(name, cache_dir)
+
+        return _add_to_cache(name, _locate(name, offline), cache_dir)
+
+
+def prefetch(names: tuple[str, ...] = RESOURCES, cache_dir: str | Path | None = None) -> dict[str, Path]:
+    """
+    Put resources into the cache in advance (for example, while building an image).
+
+    param names: Names of the resources.
+    param cache_dir: Cache directory.
+    return: Dictionary {name: path}.
+    """
+    return {name: resource_path(name, cache_dir=cache_dir, offline=False) for name in names}
+
+
+def pin(names: tuple[str, ...] = RESOURCES, cache_dir: str | Path | None = None, path: Path = PINS_PATH) -> None:
+    """
+    Pin the checksums of cached resources (for maintainers, the cached copies must be trusted).
+
+    param names: Names of the resources.
+    param cache_dir: Cache directory.
+    param path: File of pinned checksums.
+    """
+    cache_dir = get_cache_dir(cache_dir)
+    pins = read_pins(path)
+    for name in names:
+        pins[name] = file_checksum(cache_dir / name)
+    lines = (
+        [line for line in path.read_text(encoding='utf-8').splitlines() if line.startswith('#')]
+        if path.is_file()
+        else []
+    )
+    lines += [f'{checksum}  {name}' for name, checksum in sorted(pins.items())]
+    path.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Command line interface of the resource manager."""
+    parser = argparse.ArgumentParser(prog='python -m ru_transcript.resources', description='RuTranscript resources.')
+    parser.add_argument('command', choices=['prefetch', 'verify', 'pin'])
+    parser.add_argument('--cache-dir', default=None, help=f'Cache directory (default: ${CACHE_DIR_ENV} or ~/.cache).')
+    args = parser.parse_args(argv)
+
+    if args.command == 'prefetch':
+        paths = prefetch(cache_dir=args.cache_dir)
+    else:
+        if args.command == 'pin':
+            pin(cache_dir=args.cache_dir)
+        paths = {name: verify(name, cache_dir=args.cache_dir) for name in RESOURCES}
+
+    for name, path in paths.items():
+        print(f'{name}: {path}')  # noqa: T201
+
+
+if __name__ == '__main__':
+    main()
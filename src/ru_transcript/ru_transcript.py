@@ -1,69 +1,207 @@
+# the batch pipeline drives the stages of many RuTranscript objects
+# ruff: noqa: SLF001
+import re
 import warnings
+from collections.abc import Callable, Iterable, Iterator
 from pathlib import Path
+from typing import NamedTuple
 
-import epitran
-import spacy
 from nltk.stem.snowball import SnowballStemmer
-from openpyxl import load_workbook
-from openpyxl.workbook.workbook import Workbook
-from tps import download, find
-from tps import modules as md
 
+from .data_bundle import load_tables
+from .data_models import SectionTranscription
+from .lru import CacheInfo, LRUCache
+from .models import get_e_replacer, get_lemmas, get_transliterator, get_yo_replacer, set_transliterator
 from .tools import (
+    NO_ALLOPHONE,
+    SectionParse,
     SyntaxTree,
-    allophones,
+    allophone_records,
     apply_differences,
     assimilative_palatalization,
+    consonant_rules,
     epi_symbols,
     find_clitics,
-    first_jot,
+    find_clitics_lexicon,
     fix_jotised,
     get_punctuation_dict,
     labia_velar,
     long_consonants,
     long_ge,
     merge_phrasal_words,
-    nasal_m_n,
     process_shch,
-    put_stresses,
+    put_stresses_batch,
     remove_extra_stresses,
     replace_stress_before,
-    silent_r,
-    stunning,
     text_norm_tok,
-    voiced_ts,
     vowels,
 )
 
 snowball = SnowballStemmer('russian')
-nlp = spacy.load('ru_core_news_sm', disable=['tagger', 'morphologizer', 'attribute_ruler'])
 
-ROOT_DIR: Path = Path(__file__).resolve().parent
-wb: Workbook = load_workbook(ROOT_DIR / 'data' / 'irregular_exceptions.xlsx')
+irregular_exceptions: dict[str, str] = load_tables()['irregular_exceptions']
+irregular_exceptions_stems: dict[str, str] = load_tables()['irregular_exceptions_stems']
+# Snowball stems a token through a latin transliteration, so the stem of a token of russian letters is its prefix
+# (with 'е' instead of 'ё') except the last letter, which may be cut ('х' --> 'к'), and the merged pairs 'шч' --> 'щ'
+# and 'ьь' --> 'ъ', which aren't found in the exception stems. A token that doesn't start with any of these prefixes
+# can't have an exception stem.
+_exception_stem_prefixes = tuple(sorted({stem[:-1] for stem in irregular_exceptions_stems}))
+_russian_token_pattern = re.compile('[а-яё-]+', re.IGNORECASE)
 
-sheet = wb.active
-irregular_exceptions = {sheet[f'A{i}'].value: sheet[f'B{i}'].value for i in range(2, sheet.max_row + 1)}
-irregular_exceptions_stems = {snowball.stem(ex): pron for ex, pron in irregular_exceptions.items()}
-
-epi = epitran.Epitran('rus-Cyrl')
 second_silent = ['стн', 'стл', 'здн', 'рдн', 'нтск', 'ндск', 'лвств']
 first_silent = ['лнц', 'дц', 'вств']
 hissing_rd = {'сш': 'шш', 'зш': 'шш', 'сж': 'жж', 'сч': 'щ'}
-non_ipa_symbols = {'t͡ɕʲ': 't͡ɕ', 'ʂʲː': 'ʂ', 'ɕːʲ': 'ɕː', 'ʒ': 'ʐ', 'd͡ʐ': 'd͡ʒ'}
 
-try:
-    yo_dict = find('yo.dict', raise_exception=True)
-except FileNotFoundError:
-    yo_dict = download('yo.dict')
 
-try:
-    e_dict = find('e.dict', raise_exception=True)
-except FileNotFoundError:
-    e_dict = download('e.dict')
+class Lpt2Rule(NamedTuple):
+    """
+    Regular exception of LPT-2 (after the adjective endings 'ого его').
+
+    The rule is a candidate if one of its triggers is found in the token, a trigger that ends with '$' must be
+    at the end of the token. `rewrite(token, result)` returns the new result or None if the rule isn't applied.
+    """
+
+    name: str
+    triggers: tuple[str, ...]
+    rewrite: Callable[[str, str], str | None]
+
+
+def _rewrite_noun_ending(token: str, _: str) -> str | None:
+    if token[-3] in {'ц', 'щ'}:
+        return None
+
+    return token[:-2] + ('ь' if token[-3] not in {'ж', 'ш'} else 'й') + token[-1]
+
+
+def _rewrite_hissing_suffix(token: str, _: str) -> str | None:
+    if stem(token)[-3:] not in {'чик', 'чиц'}:
+        return None
+
+    return token.replace('зч', 'щ').replace('тч', 'ч').replace('дч', 'ч')
+
+
+# in the order of application, every applied rule rewrites the token anew and replaces the result of the previous ones
+LPT2_RULES = (
+    # 'что' --> 'што'
+    Lpt2Rule('what', ('что',), lambda token, result: token.replace('что', 'што') if 'что' in result else None),
+    # verb endings 'тся ться'
+    Lpt2Rule(
+        'verb_ending',
+        ('тся$',),
+        lambda token, _: token[:-3] + 'ца' if token not in {'заботься', 'отметься'} else None,
+    ),
+    Lpt2Rule(
+        'verb_soft_ending',
+        ('ться$',),
+        lambda token, _: token[:-4] + 'ца' if token not in {'заботься', 'отметься'} else None,
+    ),
+    # noun endings 'ия ие ию'
+    Lpt2Rule('noun_ending', ('ия$', 'ие$', 'ию$'), _rewrite_noun_ending),
+    # unpronounceable consonants are kept in the token
+    Lpt2Rule('silent', tuple(first_silent + second_silent), lambda token, _: token),
+    # combinations with hissing consonants
+    Lpt2Rule('hissing_suffix', ('зч', 'тч', 'дч'), _rewrite_hissing_suffix),
+    *(
+        Lpt2Rule(f'hissing_{key}', (key,), lambda token, _, key=key, value=value: token.replace(key, value))
+        for key, value in hissing_rd.items()
+    ),
+)
+# all triggers of the rules are found in one scan, every trigger has its own group (no two triggers start alike)
+_lpt2_trigger_rules = [rule_index for rule_index, rule in enumerate(LPT2_RULES) for _ in rule.triggers]
+_lpt2_pattern = re.compile(
+    '(?=(?:'
+    + '|'.join(
+        f'({re.escape(trigger[:-1])})\\Z' if trigger.endswith('$') else f'({re.escape(trigger)})'
+        for rule in LPT2_RULES
+        for trigger in rule.triggers
+    )
+    + '))'
+)
 
-e_replacer = md.Replacer([e_dict, 'plane'])
-yo_replacer = md.Replacer([yo_dict, 'plane'])
 syntax_tree = SyntaxTree()
+DEFAULT_BATCH_SIZE = 64
+CLITIC_MODES = ('parser', 'lexicon')
+WORD_CACHE_SIZE = 100_000
+
+# symbols of transliterated tokens, stress and prestressed syllable marks
+PHONEME_SYMBOLS = frozenset([*epi_symbols, '_', '|', '||', 'γ', 'ʐ', '+', '-'])
+# symbols that are kept at the end of a section
+LAST_SYMBOLS = frozenset([*epi_symbols, '||', 'γ', '+', '-'])
+# longest match first, any other character is matched alone and reported as an unknown symbol
+_phoneme_pattern = re.compile(
+    '|'.join(re.escape(symbol) for symbol in sorted(PHONEME_SYMBOLS, key=len, reverse=True)) + '|.', re.DOTALL
+)
+
+# results of the word-internal stages (LPT parts 1-3) for pairs (token, stressed token)
+word_cache = LRUCache(WORD_CACHE_SIZE)
+# phonemes of transliterated tokens, the key also says whether the token is the last one in its section
+phonemes_cache = LRUCache(WORD_CACHE_SIZE)
+# transliterations of stressed tokens
+transliteration_cache = LRUCache(WORD_CACHE_SIZE)
+# tokens after the 'е - э' and 'е - ё' replacements
+replacement_cache = LRUCache(WORD_CACHE_SIZE)
+# Snowball stems of tokens, shared by LPT parts 1 and 2
+stem_cache = LRUCache(WORD_CACHE_SIZE)
+
+
+def stem(token: str) -> str:
+    """
+    Stem a token with the Snowball stemmer for russian, using `stem_cache`.
+
+    param token: Token without stresses.
+    return: Stem of the token.
+    """
+    return stem_cache.get_or_compute(token, lambda: snowball.stem(token))
+
+
+def replace_e_yo(token: str) -> str:
+    """
+    Replace 'е - э' and 'е - ё' in a token, using `replacement_cache`.
+
+    param token: Token, stresses are removed.
+    return: Token without stresses after the replacements.
+    """
+    return replacement_cache.get_or_compute(token, lambda: _replace_e_yo(token))
+
+
+def replace_e_yo_batch(tokens: Iterable[str]) -> list[str]:
+    """
+    Replace 'е - э' and 'е - ё' in tokens, every unique token is processed once.
+
+    param tokens: Tokens, stresses are removed.
+    return: Tokens without stresses after the replacements, in the same order.
+    """
+    tokens = list(tokens)
+    replaced = {token: replace_e_yo(token) for token in dict.fromkeys(tokens)}
+
+    return [replaced[token] for token in tokens]
+
+
+def _replace_e_yo(token: str) -> str:
+    token = get_e_replacer()(token.replace('+', ''))
+
+    return get_yo_replacer()(token.replace('+', ''))
+
+
+def _may_have_exception_stem(token: str) -> bool:
+    if _russian_token_pattern.fullmatch(token) is None:
+        return True
+
+    return token.lower().replace('ё', 'е').startswith(_exception_stem_prefixes)
+
+
+def transliterate(token: str) -> str:
+    """
+    Transliterate a stressed token into IPA symbols used by the framework, using `transliteration_cache`.
+
+    param token: Stressed token.
+    return: Transliterated token.
+    """
+    return transliteration_cache.get_or_compute(token, lambda: _transliterate(token))
+
+
+def _transliterate(token: str) -> str:
+    return get_transliterator().transliterate(token)
 
 
 class RuTranscript:
@@ -73,13 +211,14 @@ class RuTranscript:
     This class provides methods to convert Russian text into its phonetic transcription.
     """
 
-    def __init__(
+    def __init__(  # noqa: PLR0913
         self,
         text: str,
         stressed_text: str | None = None,
         stress_place: str = 'after',
         replacement_dict: dict | None = None,
         stress_accuracy_threshold: float = 0.86,
+        clitic_mode: str = 'parser',
     ) -> None:
         """
         Make a phonetic transcription in russian using IPA.
@@ -92,7 +231,12 @@ class RuTranscript:
             'before' - if the stress symbol is before the stressed vowel.
         :param replacement_dict: Custom dictionary for replacing words (for example, {'tts': 'синтез речи'}).
         :param stress_accuracy_threshold: A threshold for the accuracy of stress placement for StressRNN.
+        :param clitic_mode: 'parser' - to find proclitics and enclitics with the dependency parser,
+            'lexicon' - to find them with the tables of function words (faster, the parser isn't used at all).
         """
+        if clitic_mode not in CLITIC_MODES:
+            raise ValueError(f'Unknown clitic mode {clitic_mode!r}, use one of {CLITIC_MODES}.')  # noqa: TRY003
+
         text, stressed_text = self._get_text_and_stressed_text(text, stressed_text, replacement_dict)
         self._pause_dict = get_punctuation_dict(text)
         self._tokens = text_norm_tok(text)
@@ -101,10 +245,11 @@ class RuTranscript:
 
         self._stress_accuracy_threshold = stress_accuracy_threshold
         self._stress_place = stress_place
+        self._clitic_mode = clitic_mode
 
-        self._phrasal_words_indexes = []
-        self._letters_list = []
-        self._phonemes_list = []
+        self._phrasal_words_indexes = [set()] * self._sections_len
+        self._letters_list = [[]] * self._sections_len
+        self._phonemes_list = [[]] * self._sections_len
         self._allophones_list = [[]] * self._sections_len
         self._transliterated_tokens = [[]] * self._sections_len
         self._phrasal_words = [[]] * self._sections_len
@@ -133,6 +278,8 @@ class RuTranscript:
         )
 
         if replacement_dict is not None:
+            from tps import modules as md  # noqa: PLC0415
+
             user_replacer = md.Replacer([replacement_dict, 'plane'])
             text = user_replacer(text)
             stressed_text = user_replacer(stressed_text)
@@ -160,59 +307,51 @@ class RuTranscript:
         param section_num: Index of the section to process.
         """
         default_section = self._tokens[section_num]
-        self._tokens[section_num] = [e_replacer(token.replace('+', '')) for token in self._tokens[section_num]]
-        self._tokens[section_num] = [yo_replacer(token.replace('+', '')) for token in self._tokens[section_num]]
+        self._tokens[section_num] = replace_e_yo_batch(default_section)
 
-        if self._tokens[section_num] != [token.replace('+', '') for token in default_section]:
+        if any(
+            new_token != token.replace('+', '')
+            for token, new_token in zip(default_section, self._tokens[section_num], strict=True)
+        ):
             self._stressed_tokens[section_num] = [
                 apply_differences([default_section[i], self._tokens[section_num][i]])
                 for i in range(len(default_section))
             ]
 
     @staticmethod
-    def _join_phonemes(transliterated_tokens: list[str], limit: int = 10000) -> list[str]:
+    def _join_phonemes(transliterated_tokens: list[str]) -> list[str]:
         """
         Join transliterated tokens into a list of phonemes.
 
+        Every symbol is the longest one of `PHONEME_SYMBOLS` that starts at the position. A symbol at the very end
+        of the section is kept only if it is in `LAST_SYMBOLS`.
+
         param transliterated_tokens: List of tokens to convert into phonemes.
-        param limit: Maximum allowed iterations to prevent endless loops.
         return: List of phonemes.
         """
-        section_phonemes_list = []
         joined_tokens = '_'.join(transliterated_tokens)
         joined_tokens = joined_tokens.replace('‑', '-')
-        i = 0
-        counter = 0
-        default_len = len(joined_tokens)
-        while i < default_len:
-            if joined_tokens[i] not in ['+', '-']:
-                n = 4
-                if i != default_len - 1:
-                    while (joined_tokens[i : i + n] not in [*epi_symbols, '_', '|', '||', 'γ', 'ʐ']) and (n > 0):
-                        counter += 1
-                        if counter > limit:
-                            raise IndexError('Endless loop')  # noqa: TRY003
-                        n -= 1
-                    section_phonemes_list.append(joined_tokens[i : i + n])
-                elif joined_tokens[i] in [*epi_symbols, '||', 'γ']:
-                    section_phonemes_list.append(joined_tokens[i])
-                i += n
-            else:
-                section_phonemes_list.append(joined_tokens[i])
-                i += 1
-
-        section_phonemes_list = [x for x in section_phonemes_list if x not in ['', 'ʲ']]
+        section_phonemes_list = _phoneme_pattern.findall(joined_tokens)
 
-        n = 0
-        for allophone_index in range(len(section_phonemes_list) - 1):
-            allophone = section_phonemes_list[allophone_index + n]
-            next_allophone = section_phonemes_list[allophone_index + n + 1]
-            if (allophone == 't͡s' and next_allophone == 's') or (allophone == 'd͡ʒ' and next_allophone == 'ʐ'):
-                del section_phonemes_list[allophone_index + n + 1]
-                n -= 1
+        # a one-character symbol at the end of the section
+        if (
+            section_phonemes_list
+            and len(section_phonemes_list[-1]) == 1
+            and section_phonemes_list[-1] not in LAST_SYMBOLS
+        ):
+            section_phonemes_list.pop()
+
+        unknown_symbols = set(section_phonemes_list).difference(PHONEME_SYMBOLS)
+        if unknown_symbols:
+            raise ValueError(f'Unknown symbols {sorted(unknown_symbols)} in {joined_tokens!r}')  # noqa: TRY003
 
-        # print(section_phonemes_list)
-        return section_phonemes_list
+        # [s] after [t͡s] and [ʐ] after [d͡ʒ] are parts of the affricates
+        result = []
+        for phon in section_phonemes_list:
+            if not (result and (result[-1], phon) in {('t͡s', 's'), ('d͡ʒ', 'ʐ')}):
+                result.append(phon)
+
+        return result
 
     @staticmethod
     def add_prestressed_syllable_sign(section: list[str]) -> list[str]:
@@ -222,113 +361,107 @@ class RuTranscript:
         param section: List of phonemes with stress markers ('+').
         return: List of phonemes with prestressed syllable marks added.
         """
-        section_result = section[:]
+        # number of marks after every phoneme
+        marks = [0] * len(section)
         n = 0
+        # the last vowel before the previous phoneme, the last vowel and the last word boundary
+        last_vowel_before = last_vowel = last_space = -1
         for symb_i, symb in enumerate(section):
-            if symb == '+':
-                preavi = [
-                    phon_i
-                    for phon_i, phon in enumerate(section[: symb_i - 1])
-                    if allophones[phon]['phon'] == 'V' and '_' not in section[phon_i + n : symb_i]
-                ]
-                if preavi:
-                    section_result.insert(preavi[-1] + n + 1, '-')
-                    n += 1
+            # the word boundary is looked for starting `n` phonemes after the vowel
+            if symb == '+' and last_vowel_before != -1 and last_vowel_before + n > last_space:
+                marks[last_vowel_before] += 1
+                n += 1
+            elif symb == '_':
+                last_space = symb_i
+
+            last_vowel_before = last_vowel
+            if allophone_records[symb].is_vowel:
+                last_vowel = symb_i
+
+        if not n:
+            return section[:]
+
+        section_result = []
+        for symb, symb_marks in zip(section, marks, strict=True):
+            section_result.append(symb)
+            if symb_marks:
+                section_result.extend('-' * symb_marks)
 
         return section_result
 
-    def _lpt_1(self, section_num: int) -> None:
+    @staticmethod
+    def _lpt_1(token: str, stressed_token: str) -> tuple[str, str]:
         """
         Letter-to-phoneme transformation by B.M. Lobanov. Part 1 - Irregular exceptions.
 
-        param section_num: Index of the section to process.
-        return: None. Updates `_tokens` and `_stressed_tokens` in place.
+        param token: Token without stresses.
+        param stressed_token: The same token with a stress.
+        return: New token and new stressed token.
         """
-        for i, token in enumerate(self._tokens[section_num]):
-            stem = snowball.stem(token)
-            if stem in irregular_exceptions_stems:
-                try:
-                    new_token = irregular_exceptions[token]
-                except KeyError:
-                    ending = token[len(stem) :]
-                    dif = -(len(token) - len(stem))
-                    new_token = irregular_exceptions_stems[stem][:dif] + ending
+        if not _may_have_exception_stem(token):
+            return token, stressed_token
+
+        token_stem = stem(token)
+        if token_stem in irregular_exceptions_stems:
+            try:
+                new_token = irregular_exceptions[token]
+            except KeyError:
+                ending = token[len(token_stem) :]
+                dif = -(len(token) - len(token_stem))
+                new_token = irregular_exceptions_stems[token_stem][:dif] + ending
+
+            accent_index = stressed_token.index('+')
+            return new_token, new_token[:accent_index] + '+' + new_token[accent_index:]
 
-                self._tokens[section_num][i] = new_token
-                accent_index = self._stressed_tokens[section_num][i].index('+')
-                self._stressed_tokens[section_num][i] = new_token[:accent_index] + '+' + new_token[accent_index:]
+        return token, stressed_token
 
-    def _lpt_2(self, section_num: int) -> None:  # noqa: PLR0912
+    @staticmethod
+    def _lpt_2(token: str) -> str:
         """
         Letter-to-phoneme transformation by B.M. Lobanov. Part 2 - Regular exceptions.
 
-        param section_num: Index of the section to process.
-        return: None. Updates `_tokens` and `_stressed_tokens` in place.
-        """
-        for i, token in enumerate(self._stressed_tokens[section_num]):
-            # adjective endings 'ого его'
-            if token != 'ого+' and (  # noqa: S105
-                token.replace('+', '').startswith('какого')
-                or token.replace('+', '').endswith('ого')
-                or token.replace('+', '').endswith('его')
-            ):
-                accent_index = token.index('+')
-                token = token.replace('+', '').replace('ого', 'ово').replace('его', 'ево')  # noqa: PLW2901
-                self._stressed_tokens[section_num][i] = token[:accent_index] + '+' + token[accent_index:]
-
-            # 'что' --> 'што'
-            if 'что' in self._stressed_tokens[section_num][i]:
-                self._stressed_tokens[section_num][i] = token.replace('что', 'што')
-
-            # verb endings 'тся ться'
-            if token not in {'заботься', 'отметься'}:
-                if token[-3:] == 'тся':
-                    self._stressed_tokens[section_num][i] = token[:-3] + 'ца'
-                elif token[-4:] == 'ться':
-                    self._stressed_tokens[section_num][i] = token[:-4] + 'ца'
-
-            # noun endings 'ия ие ию'
-            if (token[-2:] in {'ия', 'ие', 'ию'}) and (token[-3] not in {'ц', 'щ'}):
-                if token[-3] not in {'ж', 'ш'}:
-                    self._stressed_tokens[section_num][i] = token[:-2] + 'ь' + token[-1]
-                else:
-                    self._stressed_tokens[section_num][i] = token[:-2] + 'й' + token[-1]
-
-            # unpronounceable consonants
-            for sub in first_silent + second_silent:
-                if sub in token:
-                    new_sub = sub.translate(str.maketrans('', '', 'ьъ'))
-                    self._stressed_tokens[section_num][i] = token.translate(str.maketrans(sub, new_sub))
-
-            # combinations with hissing consonants
-            stem = snowball.stem(token)
-            if ('зч' in token or 'тч' in token or 'дч' in token) and (stem[-3:] == 'чик' or stem[-3:] == 'чиц'):
-                self._stressed_tokens[section_num][i] = token.replace('зч', 'щ').replace('тч', 'ч').replace('дч', 'ч')
-            for key, value in hissing_rd.items():
-                if key in token:
-                    self._stressed_tokens[section_num][i] = token.replace(key, value)
-
-    def _lpt_3(self, section_num: int) -> None:
+        param token: Stressed token.
+        return: New stressed token.
+        """
+        result = token
+        # adjective endings 'ого его'
+        plain_token = token.replace('+', '')
+        if token != 'ого+' and (plain_token.startswith('какого') or plain_token.endswith(('ого', 'его'))):  # noqa: S105
+            accent_index = token.index('+')
+            token = plain_token.replace('ого', 'ово').replace('его', 'ево')
+            result = token[:accent_index] + '+' + token[accent_index:]
+
+        # the last applied rule gives the result
+        for rule_index in sorted(
+            {_lpt2_trigger_rules[m.lastindex - 1] for m in _lpt2_pattern.finditer(token)}, reverse=True
+        ):
+            new_result = LPT2_RULES[rule_index].rewrite(token, result)
+            if new_result is not None:
+                return new_result
+
+        return result
+
+    def _lpt_3(self, section_num: int, words: dict[tuple[str, str], tuple[str, str, str]]) -> None:
         """
         Letter-to-phoneme transformation by B.M. Lobanov. Part 3 - Transliteration.
 
         param section_num: Index of the section to process.
-        return: None. Updates `_transliterated_tokens` in place.
+        param words: Results of LPT parts 1-3 for pairs (token, stressed token), see `_transcribe_words`.
+        return: None. Updates `_tokens`, `_stressed_tokens` and `_transliterated_tokens` in place.
         """
-        self._transliterated_tokens[section_num] = [
-            epi.transliterate(token).replace('6', '').replace('4', '') for token in self._stressed_tokens[section_num]
+        results = [
+            words[word] for word in zip(self._tokens[section_num], self._stressed_tokens[section_num], strict=True)
         ]
-        for i, token in enumerate(self._transliterated_tokens[section_num]):
-            for key, value in non_ipa_symbols.items():
-                if key in token:
-                    token = token.replace(key, value)  # noqa: PLW2901
-                    self._transliterated_tokens[section_num][i] = token
+        self._tokens[section_num] = [token for token, _, _ in results]
+        self._stressed_tokens[section_num] = [stressed_token for _, stressed_token, _ in results]
+        self._transliterated_tokens[section_num] = [transliteration for _, _, transliteration in results]
 
-    def _lpt_4(self, section_num: int) -> None:
+    def _lpt_4(self, section_num: int, lemmas: list[str]) -> None:
         """
         Letter-to-phoneme transformation by B.M. Lobanov. Part 4 - Common Rules.
 
         param section_num: Index of the section to process.
+        param lemmas: Lemmas of the tokens of the section.
         return: None. Updates `_transliterated_tokens` in place.
         """
         # fricative g
@@ -339,23 +472,18 @@ class RuTranscript:
                 next_token = ' '  # noqa: S105
 
             token_let = self._tokens[section_num][i]
-            nlp_token = nlp(token_let)[0]
-            lemma = nlp_token.lemma_
+            lemma = lemmas[i]
 
             if lemma in {'ага', 'ого', 'угу', 'господь', 'господи', 'бог'}:
                 self._transliterated_tokens[section_num][i] = token.replace('ɡ', 'γ', 1)
-            elif token_let in {'ах', 'эх', 'ох', 'ух'}:
-                next_token_allophone = allophones.get(next_token[0], {})
-                if next_token_allophone.get('voice', '') == 'voiced':
-                    self._transliterated_tokens[section_num][i] = token.replace('x', 'γ', 1)
+            elif token_let in {'ах', 'эх', 'ох', 'ух'} and allophone_records.get(next_token[0], NO_ALLOPHONE).is_voiced:
+                self._transliterated_tokens[section_num][i] = token.replace('x', 'γ', 1)
 
         # ---- Join phonemes ----
-        joined_phonemes = self._join_phonemes(self._transliterated_tokens[section_num], limit=10000)
-        self._phonemes_list.append(joined_phonemes)
+        self._phonemes_list[section_num] = _join_words(self._transliterated_tokens[section_num])
 
         # ---- Join letters ----
-        joined_letters = list('_'.join(self._stressed_tokens[section_num]))
-        self._letters_list.append(joined_letters)
+        self._letters_list[section_num] = list('_'.join(self._stressed_tokens[section_num]))
 
         # ---- Continue LPC-4. Common rules ----
         self._phonemes_list[section_num] = fix_jotised(
@@ -363,50 +491,84 @@ class RuTranscript:
         )
         self._phonemes_list[section_num] = process_shch(self._phonemes_list[section_num])
         long_ge(self._phonemes_list[section_num])
-        assimilative_palatalization(self._tokens[section_num], self._phonemes_list[section_num])
+        assimilative_palatalization(self._tokens[section_num], self._phonemes_list[section_num], lemmas)
         long_consonants(self._phonemes_list[section_num])
-        stunning(self._phonemes_list[section_num])
 
-    def transcribe(self) -> None:
+    def _allophones(self, section_num: int) -> None:
+        """
+        Find allophones of the phonemes of the specified section.
+
+        param section_num: Index of the section to process.
+        return: None. Updates `_allophones_list` and `_phrasal_words` in place.
+        """
+        # ---- Allophones - consonants ----
+        # stunning and the allophones of consonants are applied by `consonant_rules` before, for the whole batch
+        self._allophones_list[section_num] = self._phonemes_list[section_num]
+        # ---- Extract phrasal words ----
+        self._phrasal_words[section_num] = merge_phrasal_words(
+            self._allophones_list[section_num], self._phrasal_words_indexes[section_num]
+        )
+        #  ---- Allophones - vowels ----
+        self._phrasal_words[section_num] = self.add_prestressed_syllable_sign(self._phrasal_words[section_num])
+        vowels(self._phrasal_words[section_num])
+        self._allophones_list[section_num] = self._phrasal_words[section_num]
+        self._allophones_list[section_num] = labia_velar(self._allophones_list[section_num])
+
+    def transcribe(self, batch_size: int = DEFAULT_BATCH_SIZE) -> None:
         """
         Perform full transcription pipeline on all sections.
 
+        :param batch_size: Batch size for the spaCy pipeline.
         return: None. Updates internal token, stressed token, phoneme, and allophone lists in place.
         """
-        for section_num in range(self._sections_len):
-            self._tps(section_num)
-            # ---- Accenting ----
-            self._stressed_tokens[section_num] = put_stresses(
-                tokens_list=self._stressed_tokens[section_num],
-                stress_place=self._stress_place,
-                stress_accuracy_threshold=self._stress_accuracy_threshold,
-            )
-            self._stressed_text[section_num] = self._stressed_tokens[section_num]
-            # ---- Removing dashes ----
-            self._remove_dashes(section_num)
-            # ---- Phrasal words extraction ----
-            dep = syntax_tree.make_dependency_tree(' '.join(self._tokens[section_num]))
-            self._phrasal_words_indexes.append(find_clitics(dep, self._tokens[section_num]))
-            # ---- Letter-phoneme transformation ----
-            self._lpt_1(section_num)
-            self._lpt_2(section_num)
-            self._lpt_3(section_num)
-            self._lpt_4(section_num)
-            # ---- Allophones - consonants ----
-            first_jot(self._phonemes_list[section_num])
-            self._allophones_list[section_num] = self._phonemes_list[section_num]
-            nasal_m_n(self._allophones_list[section_num])
-            silent_r(self._allophones_list[section_num])
-            voiced_ts(self._allophones_list[section_num])
-            # ---- Extract phrasal words ----
-            self._phrasal_words[section_num] = merge_phrasal_words(
-                self._allophones_list[section_num], self._phrasal_words_indexes[section_num]
-            )
-            #  ---- Allophones - vowels ----
-            self._phrasal_words[section_num] = self.add_prestressed_syllable_sign(self._phrasal_words[section_num])
-            vowels(self._phrasal_words[section_num])
-            self._allophones_list[section_num] = self._phrasal_words[section_num]
-            self._allophones_list[section_num] = labia_velar(self._allophones_list[section_num])
+        _transcribe_sections([(self, section_num) for section_num in range(self._sections_len)], batch_size)
+
+    def iter_sections(
+        self, sections_per_step: int = 1, batch_size: int = DEFAULT_BATCH_SIZE
+    ) -> Iterator[SectionTranscription]:
+        """
+        Perform the transcription pipeline section by section, yielding every section as soon as it is transcribed.
+
+        The first sections can be used (for example, synthesized) while the next ones are still being transcribed.
+        When all sections are yielded, the object is in the same state as after `transcribe`.
+
+        :param sections_per_step: Number of sections that go through the pipeline together.
+        :param batch_size: Batch size for the spaCy pipeline.
+        :return: Transcriptions of the sections in the order of the text.
+        """
+        if sections_per_step < 1:
+            raise ValueError('The number of sections per step must be positive.')  # noqa: TRY003
+
+        for start in range(0, self._sections_len, sections_per_step):
+            section_nums = range(start, min(start + sections_per_step, self._sections_len))
+            _transcribe_sections([(self, section_num) for section_num in section_nums], batch_size)
+            for section_num in section_nums:
+                yield self._get_section(section_num)
+
+    def _get_section(self, section_num: int) -> SectionTranscription:
+        """
+        Return the transcription of a transcribed section.
+
+        param section_num: Index of the section.
+        return: Stressed tokens, phonemes and allophones (with stresses and spaces) and the pause after the section.
+        """
+        escape_symbols = self._get_escape_symbols(save_stresses=True, save_spaces=True)
+        phonemes = [x for x in self._phonemes_list[section_num] if x not in escape_symbols]
+        allophones = [x for x in self._allophones_list[section_num] if x not in escape_symbols]
+        stressed_tokens = self._stressed_text[section_num]
+        if self._stress_place == 'before':
+            phonemes = replace_stress_before(phonemes)
+            allophones = replace_stress_before(allophones)
+            stressed_tokens = ''.join(replace_stress_before(' '.join(stressed_tokens))).split(' ')
+
+        return SectionTranscription(
+            index=section_num,
+            stressed_tokens=stressed_tokens,
+            phonemes=phonemes,
+            allophones=allophones,
+            # the i-th punctuation mark follows the i-th section (see `_insert_pauses`)
+            pause=self._pause_dict.get(section_num + 1),
+        )
 
     def _insert_pauses(self, sounds_list: list) -> None:
         """
@@ -575,3 +737,263 @@ class RuTranscript:
             res = res.replace('+', stress_symbol)
 
         return res
+
+
+def _transcribe_sections(sections: list[tuple[RuTranscript, int]], batch_size: int = DEFAULT_BATCH_SIZE) -> None:
+    """
+    Run the transcription pipeline stage by stage over sections of one or many texts.
+
+    Every stage processes all sections before the next one starts, so the heavy models are called once per stage:
+    spaCy through `nlp.pipe`, StressRNN for all tokens without stresses, Epitran for every unique token.
+
+    param sections: Pairs (transcript, section index).
+    param batch_size: Batch size for the spaCy pipeline.
+    return: None. Updates the transcripts in place.
+    """
+    for transcript, section_num in sections:
+        transcript._tps(section_num)
+
+    # ---- Accenting ----
+    stress_groups: dict[tuple[str, float], list[tuple[RuTranscript, int]]] = {}
+    for transcript, section_num in sections:
+        key = (transcript._stress_place, transcript._stress_accuracy_threshold)
+        stress_groups.setdefault(key, []).append((transcript, section_num))
+
+    for (stress_place, stress_accuracy_threshold), group in stress_groups.items():
+        stressed_sections = put_stresses_batch(
+            [transcript._stressed_tokens[section_num] for transcript, section_num in group],
+            stress_place=stress_place,
+            stress_accuracy_threshold=stress_accuracy_threshold,
+        )
+        for (transcript, section_num), stressed_tokens in zip(group, stressed_sections, strict=True):
+            transcript._stressed_tokens[section_num] = stressed_tokens
+            transcript._stressed_text[section_num] = stressed_tokens
+
+    # ---- Removing dashes ----
+    for transcript, section_num in sections:
+        transcript._remove_dashes(section_num)
+
+    # ---- Phrasal words extraction ----
+    # every section is parsed once
+    parsed_sections = [i for i, (transcript, _) in enumerate(sections) if transcript._clitic_mode == 'parser']
+    parses: list[SectionParse | None] = [None] * len(sections)
+    for i, parse in zip(
+        parsed_sections,
+        syntax_tree.parse_sections(
+            [sections[i][0]._tokens[sections[i][1]] for i in parsed_sections], batch_size=batch_size
+        ),
+        strict=True,
+    ):
+        parses[i] = parse
+
+    for (transcript, section_num), parse in zip(sections, parses, strict=True):
+        tokens = transcript._tokens[section_num]
+        if parse is None:
+            transcript._phrasal_words_indexes[section_num] = find_clitics_lexicon(tokens)
+        else:
+            transcript._phrasal_words_indexes[section_num] = find_clitics(parse, tokens)
+
+    # ---- Letter-phoneme transformation ----
+    words = _transcribe_words(
+        {
+            word
+            for transcript, section_num in sections
+            for word in zip(transcript._tokens[section_num], transcript._stressed_tokens[section_num], strict=True)
+        }
+    )
+    for transcript, section_num in sections:
+        transcript._lpt_3(section_num, words)
+
+    # the tokens after LPT-1 (irregular exceptions) are lemmatized in isolation, all at once
+    token_lemmas = get_lemmas(
+        {token for transcript, section_num in sections for token in transcript._tokens[section_num]},
+        batch_size=batch_size,
+    )
+    sections_lemmas = [
+        [token_lemmas[token] for token in transcript._tokens[section_num]] for transcript, section_num in sections
+    ]
+
+    for (transcript, section_num), lemmas in zip(sections, sections_lemmas, strict=True):
+        transcript._lpt_4(section_num, lemmas)
+
+    # stunning (the last common rule of LPT-4) and the allophones of consonants, vectorized over all sections
+    consonant_rules.apply_batch([transcript._phonemes_list[section_num] for transcript, section_num in sections])
+
+    for transcript, section_num in sections:
+        transcript._allophones(section_num)
+
+
+def _transcribe_words(words: Iterable[tuple[str, str]]) -> dict[tuple[str, str], tuple[str, str, str]]:
+    """
+    Run the word-internal stages (LPT parts 1-3) over unique words.
+
+    These stages don't depend on the neighbours of a word, so their results are taken from `word_cache`
+    when possible. Epitran is called once for every new stressed token.
+
+    param words: Pairs (token, stressed token).
+    return: Dictionary {(token, stressed token): (new token, new stressed token, transliterated token)}.
+    """
+    results = {}
+    new_words = {}
+    for word in words:
+        cached = word_cache.get(word)
+        if cached is None:
+            token, stressed_token = RuTranscript._lpt_1(*word)
+            new_words[word] = (token, RuTranscript._lpt_2(stressed_token))
+        else:
+            results[word] = cached
+
+    transliterations = {
+        stressed_token: transliterate(stressed_token) for stressed_token in {s for _, s in new_words.values()}
+    }
+    for word, (token, stressed_token) in new_words.items():
+        results[word] = (token, stressed_token, transliterations[stressed_token])
+        word_cache.put(word, results[word])
+
+    return results
+
+
+def _join_words(transliterated_tokens: list[str]) -> list[str]:
+    """
+    Join transliterated tokens into a list of phonemes, using `phonemes_cache` for every token.
+
+    The phonemes of a token depend only on the token and on whether it's the last one in the section,
+    so the result is the same as `RuTranscript._join_phonemes`.
+
+    param transliterated_tokens: List of tokens to convert into phonemes.
+    return: List of phonemes.
+    """
+    if phonemes_cache.maxsize <= 0:
+        return RuTranscript._join_phonemes(transliterated_tokens)
+
+    section_phonemes_list = []
+    last_index = len(transliterated_tokens) - 1
+    for i, token in enumerate(transliterated_tokens):
+        if i:
+            section_phonemes_list.append('_')
+        is_last = i == last_index
+        section_phonemes_list.extend(
+            phonemes_cache.get_or_compute(
+                (token, is_last),
+                # a token that isn't the last one is followed by '_' which gives no phonemes by itself
+                lambda token=token, is_last=is_last: RuTranscript._join_phonemes([token] if is_last else [token, '']),
+            )
+        )
+
+    # if the last token gives no phonemes, the '_' before it is at the end of the section
+    if section_phonemes_list and section_phonemes_list[-1] == '_':
+        section_phonemes_list.pop()
+
+    return section_phonemes_list
+
+
+def word_cache_info() -> dict[str, CacheInfo]:
+    """
+    Return statistics of the word-level caches.
+
+    :return: Dictionary {'words': statistics of LPT parts 1-3, 'phonemes': statistics of phonemes of tokens,
+        'transliterations': statistics of transliterations of stressed tokens, 'stems': statistics of stems of tokens,
+        'replacements': statistics of the 'е - э' and 'е - ё' replacements}.
+    """
+    return {
+        'words': word_cache.cache_info(),
+        'phonemes': phonemes_cache.cache_info(),
+        'transliterations': transliteration_cache.cache_info(),
+        'stems': stem_cache.cache_info(),
+        'replacements': replacement_cache.cache_info(),
+    }
+
+
+def configure_word_cache(maxsize: int = WORD_CACHE_SIZE) -> None:
+    """
+    Change the size of the word-level caches.
+
+    :param maxsize: Maximum number of words in every cache. With 0 the caches are disabled.
+    """
+    word_cache.resize(maxsize)
+    phonemes_cache.resize(maxsize)
+    transliteration_cache.resize(maxsize)
+    stem_cache.resize(maxsize)
+    replacement_cache.resize(maxsize)
+
+
+def configure_transliterator(name: str | None = None) -> None:
+    """
+    Choose the transliterator of stressed tokens and clear the caches that depend on it.
+
+    The built-in transliterator gives the same result as Epitran and doesn't load it.
+
+    :param name: 'builtin' or 'epitran'. If None, RU_TRANSCRIPT_TRANSLITERATOR or 'builtin' is used.
+    """
+    set_transliterator(name)
+    word_cache.clear()
+    transliteration_cache.clear()
+
+
+def preload_transliterations(path: str | Path) -> int:
+    """
+    Fill the transliteration cache from a frequency list.
+
+    Every line of the file is a stressed token, optionally followed by a tab and its frequency. Lines without
+    a frequency are taken in the order of the file, the most frequent tokens are kept if the list is larger
+    than the cache.
+
+    :param path: Path to the file.
+    :return: Number of cached transliterations.
+    """
+    tokens = {}
+    with Path(path).open(encoding='utf-8') as f:
+        for line_num, line in enumerate(f, start=1):
+            fields = line.rstrip('\n').split('\t')
+            if not fields[0]:
+                continue
+            try:
+                tokens[fields[0]] = float(fields[1]) if len(fields) > 1 else -line_num
+            except ValueError as e:
+                raise ValueError(f'{path}, line {line_num}: invalid frequency {fields[1]!r}') from e  # noqa: TRY003
+
+    most_frequent = sorted(tokens, key=tokens.__getitem__, reverse=True)[: max(transliteration_cache.maxsize, 0)]
+    # the most frequent tokens are cached last and so are evicted last
+    for token in reversed(most_frequent):
+        transliteration_cache.put(token, _transliterate(token))
+
+    return len(most_frequent)
+
+
+def transcribe_batch(
+    texts: Iterable[str],
+    stressed_texts: Iterable[str | None] | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    **kwargs: str | dict | float | None,
+) -> list[RuTranscript]:
+    """
+    Transcribe many texts at once.
+
+    All sections of `batch_size` texts go through every stage of the pipeline together.
+
+    :param texts: Texts to transcribe.
+    :param stressed_texts: The same texts with stresses (or None for the texts without stresses).
+    :param batch_size: Number of texts that are processed together.
+    :param kwargs: Other arguments of `RuTranscript` (stress_place, replacement_dict, stress_accuracy_threshold,
+        clitic_mode).
+    :return: Transcribed `RuTranscript` objects in the input order.
+    """
+    texts = list(texts)
+    stressed_texts = [None] * len(texts) if stressed_texts is None else list(stressed_texts)
+    if len(stressed_texts) != len(texts):
+        raise ValueError('The number of stressed texts must match the number of texts.')  # noqa: TRY003
+
+    transcripts = [
+        RuTranscript(text, stressed_text, **kwargs) for text, stressed_text in zip(texts, stressed_texts, strict=True)
+    ]
+    for start in range(0, len(transcripts), batch_size):
+        _transcribe_sections(
+            [
+                (transcript, section_num)
+                for transcript in transcripts[start : start + batch_size]
+                for section_num in range(transcript._sections_len)
+            ],
+            batch_size=batch_size,
+        )
+
+    return transcripts
@@ -0,0 +1,280 @@
+import argparse
+import os
+import sqlite3
+import threading
+import warnings
+from collections.abc import Iterable, Iterator
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+
+from .lru import CacheInfo, LRUCache
+from .resources import get_cache_dir
+
+STRESS_CACHE_ENV = 'RU_TRANSCRIPT_STRESS_CACHE'
+STRESS_CACHE_NAME = 'stresses.sqlite3'
+MEMORY_CACHE_SIZE = 100_000
+# maximum number of parameters in one sqlite query
+_QUERY_CHUNK = 500
+
+_lock = threading.Lock()
+_stress_cache: 'StressCache | None' = None
+
+
+def get_model_version() -> str:
+    """Return the version of StressRNN, predictions of different versions are cached separately."""
+    try:
+        return f'stressrnn-{version("stressrnn")}'
+    except PackageNotFoundError:
+        return 'stressrnn'
+
+
+def get_stress_cache_path() -> Path | None:
+    """
+    Return the path to the on-disk stress cache.
+
+    return: RU_TRANSCRIPT_STRESS_CACHE or 'stresses.sqlite3' in the resources cache directory.
+        None if RU_TRANSCRIPT_STRESS_CACHE is 'off' (only the in-process cache is used).
+    """
+    path = os.environ.get(STRESS_CACHE_ENV)
+    if path is None:
+        return get_cache_dir() / STRESS_CACHE_NAME
+    if path.lower() in {'', '0', 'off', 'false', 'no'}:
+        return None
+
+    return Path(path).expanduser()
+
+
+def _chunks(items: list, size: int) -> Iterator[list]:
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+class StressCache:
+    """
+    Two-tier cache of predicted stresses.
+
+    The first tier is an in-process LRU cache, the second one is an sqlite database that can be shared by many
+    processes. The key is the token, the accuracy threshold and the version of the model.
+    """
+
+    def __init__(
+        self, path: str | Path | None, maxsize: int = MEMORY_CACHE_SIZE, model_version: str | None = None
+    ) -> None:
+        """
+        Initialize the cache.
+
+        param path: Path to the sqlite database. If None, only the in-process cache is used.
+        param maxsize: Maximum number of tokens in the in-process cache.
+        param model_version: Version of the model (the installed StressRNN by default).
+        """
+        self.path = Path(path) if path is not None else None
+        self.model_version = model_version or get_model_version()
+        self._memory = LRUCache(maxsize)
+        self._lock = threading.Lock()
+        self._connection: sqlite3.Connection | None = None
+        self._pid: int | None = None
+
+    def _connect(self) -> sqlite3.Connection | None:
+        """Return a connection of the current process (a forked process can't use the connection of its parent)."""
+        if self.path is None:
+            return None
+
+        if self._connection is None or self._pid != os.getpid():
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+                connection.execute('PRAGMA journal_mode=WAL')
+                connection.execute(
+                    'CREATE TABLE IF NOT EXISTS stresses (token TEXT NOT NULL, threshold REAL NOT NULL, '
+                    'model TEXT NOT NULL, stressed TEXT NOT NULL, PRIMARY KEY (token, threshold, model))'
+                )
+                connection.commit()
+            except (OSError, sqlite3.Error) as e:
+                self._disable_disk(e)
+                return None
+            self._connection = connection
+            self._pid = os.getpid()
+
+        return self._connection
+
+    def _disable_disk(self, e: Exception) -> None:
+        warnings.warn(
+            f'The stress cache {self.path} is not available, only the in-process cache is used: {e}', stacklevel=3
+        )
+        self.path = None
+        self._connection = None
+
+    def get_many(self, tokens: Iterable[str], threshold: float) -> dict[str, str]:
+        """
+        Return cached stresses of tokens.
+
+        param tokens: Tokens without stresses.
+        param threshold: Accuracy threshold of the predictions.
+        return: Dictionary {token: stressed token} for the cached tokens.
+        """
+        res = {}
+        missing = []
+        for token in dict.fromkeys(tokens):
+            stressed = self._memory.get((token, threshold, self.model_version))
+            if stressed is None:
+                missing.append(token)
+            else:
+                res[token] = stressed
+
+        if missing:
+            found = self._select(missing, threshold)
+            for token, stressed in found.items():
+                self._memory.put((token, threshold, self.model_version), stressed)
+            res.update(found)
+
+        return res
+
+    def _select(self, tokens: list[str], threshold: float) -> dict[str, str]:
+        with self._lock:
+            connection = self._connect()
+            if connection is None:
+                return {}
+
+            found = {}
+            try:
+                for chunk in _chunks(tokens, _QUERY_CHUNK):
+                    rows = connection.execute(
+                        'SELECT token, stressed FROM stresses WHERE threshold = ? AND model = ? '  # noqa: S608
+                        f'AND token IN ({", ".join("?" * len(chunk))})',
+                        (threshold, self.model_version, *chunk),
+                    )
+                    found.update(rows)
+            except sqlite3.Error as e:
+                self._disable_disk(e)
+
+            return found
+
+    def put_many(self, stresses: dict[str, str], threshold: float) -> None:
+        """
+        Cache predicted stresses.
+
+        param stresses: Dictionary {token: stressed token}.
+        param threshold: Accuracy threshold of the predictions.
+        """
+        for token, stressed in stresses.items():
+            self._memory.put((token, threshold, self.model_version), stressed)
+
+        self._insert((token, threshold, self.model_version, stressed) for token, stressed in stresses.items())
+
+    def _insert(self, rows: Iterable[tuple[str, float, str, str]]) -> None:
+        with self._lock:
+            connection = self._connect()
+            if connection is None:
+                return
+
+            try:
+                with connection:
+                    connection.executemany('INSERT OR REPLACE INTO stresses VALUES (?, ?, ?, ?)', rows)
+            except sqlite3.Error as e:
+                self._disable_disk(e)
+
+    def warm(self, path: str | Path, threshold: float) -> int:
+        """
+        Fill the on-disk cache from a file.
+
+        Every line of the file is either a stressed word (it is used for the given threshold and the current model)
+        or a tab-separated record 'token, threshold, model, stressed token' written by `export`.
+
+        param path: Path to the file.
+        param threshold: Accuracy threshold for the lines with only a stressed word.
+        return: Number of records.
+        """
+        rows = []
+        with Path(path).open(encoding='utf-8') as f:
+            for line in f:
+                fields = line.rstrip('\n').split('\t')
+                if len(fields) == 4:  # noqa: PLR2004
+                    token, row_threshold, model, stressed = fields
+                    rows.append((token, float(row_threshold), model, stressed))
+                elif fields[0]:
+                    rows.append((fields[0].replace('+', ''), threshold, self.model_version, fields[0]))
+
+        self._insert(rows)
+
+        return len(rows)
+
+    def export(self, path: str | Path) -> int:
+        """
+        Save all records of the on-disk cache into a tab-separated file.
+
+        param path: Path to the file.
+        return: Number of records.
+        """
+        with self._lock:
+            connection = self._connect()
+            rows = (
+                connection.execute('SELECT token, threshold, model, stressed FROM stresses ORDER BY token').fetchall()
+                if connection is not None
+                else []
+            )
+
+        with Path(path).open('w', encoding='utf-8') as f:
+            f.writelines('\t'.join(map(str, row)) + '\n' for row in rows)
+
+        return len(rows)
+
+    def clear(self) -> None:
+        """Remove all records of both tiers."""
+        self._memory.clear()
+        with self._lock:
+            connection = self._connect()
+            if connection is not None:
+                with connection:
+                    connection.execute('DELETE FROM stresses')
+
+    def __len__(self) -> int:
+        """Return the number of records in the on-disk cache (or in the in-process cache without a database)."""
+        with self._lock:
+            connection = self._connect()
+            if connection is None:
+                return len(self._memory)
+
+            return connection.execute('SELECT COUNT(*) FROM stresses').fetchone()[0]
+
+    def cache_info(self) -> CacheInfo:
+        """Return statistics of the in-process cache."""
+        return self._memory.cache_info()
+
+
+def get_stress_cache() -> StressCache:
+    """Return the shared stress cache of the process."""
+    global _stress_cache  # noqa: PLW0603
+    if _stress_cache is None:
+        with _lock:
+            if _stress_cache is None:
+                _stress_cache = StressCache(get_stress_cache_path())
+
+    return _stress_cache
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Command line interface of the stress cache."""
+    parser = argparse.ArgumentParser(prog='python -m ru_transcript.stress_cache', description='RuTranscript stresses.')
+    parser.add_argument('command', choices=['warm', 'export', 'info', 'clear'])
+    parser.add_argument('file', nargs='?', help='File to read (warm) or to write (export).')
+    parser.add_argument('--cache', default=None, help=f'Path to the cache (default: ${STRESS_CACHE_ENV} or ~/.cache).')
+    parser.add_argument('--threshold', type=float, default=0.86, help='Threshold for the lines with stressed words.')
+    args = parser.parse_args(argv)
+
+    if args.command in {'warm', 'export'} and args.file is None:
+        parser.error(f'the file is required for {args.command}')
+
+    cache = StressCache(args.cache) if args.cache is not None else get_stress_cache()
+    if args.command == 'warm':
+        print(f'{cache.warm(args.file, args.threshold)} records are added to {cache.path}')  # noqa: T201
+    elif args.command == 'export':
+        print(f'{cache.export(args.file)} records are saved to {args.file}')  # noqa: T201
+    elif args.command == 'clear':
+        cache.clear()
+        print(f'{cache.path} is cleared')  # noqa: T201
+    else:
+        print(f'{cache.path}: {len(cache)} records, model {cache.model_version}')  # noqa: T201
+
+
+if __name__ == '__main__':
+    main()
@@ -15,21 +15,31 @@ from .fix_jotised import fix_jotised
 from .main_tools import (
     apply_differences,
     find_clitics,
+    find_clitics_lexicon,
     get_punctuation_dict,
     merge_phrasal_words,
     text_norm_tok,
 )
-from .sounds import allophones, epi_symbols
-from .stress_tools import put_stresses, remove_extra_stresses, replace_stress_before
-from .syntax_tree import SyntaxTree
+from .rule_engine import CONSONANT_RULES, ContextRule, RuleEngine, consonant_rules
+from .sounds import NO_ALLOPHONE, allophone_records, allophones, epi_symbols
+from .stress_tools import put_stresses, put_stresses_batch, remove_extra_stresses, replace_stress_before
+from .syntax_tree import SectionParse, SyntaxTree
 
 __all__ = [
+    'CONSONANT_RULES',
+    'NO_ALLOPHONE',
+    'ContextRule',
+    'RuleEngine',
+    'SectionParse',
     'SyntaxTree',
+    'allophone_records',
     'allophones',
     'apply_differences',
     'assimilative_palatalization',
+    'consonant_rules',
     'epi_symbols',
     'find_clitics',
+    'find_clitics_lexicon',
     'first_jot',
     'fix_jotised',
     'get_punctuation_dict',
@@ -40,6 +50,7 @@ __all__ = [
     'nasal_m_n',
     'process_shch',
     'put_stresses',
+    'put_stresses_batch',
     'remove_extra_stresses',
     'remove_extra_stresses',
     'replace_stress_before',
@@ -1,12 +1,11 @@
-import spacy
+from collections import deque
 
 from ru_transcript.consts import CAN_BE_LONG
-from ru_transcript.data_models import FirstPretonicAllophones, PosttonicAllophones
+from ru_transcript.data_models import Allophone, FirstPretonicAllophones, PosttonicAllophones
 from ru_transcript.enums import Position
+from ru_transcript.models import get_lemma
 
-from .sounds import allophones, ts, zh_sh_ts
-
-nlp = spacy.load('ru_core_news_sm', disable=['tagger', 'morphologizer', 'attribute_ruler'])
+from .sounds import NO_ALLOPHONE, allophone_records, ts, zh_sh_ts
 
 
 def get_phon(segment: list[str], i: int) -> str:
@@ -25,7 +24,7 @@ def get_phon(segment: list[str], i: int) -> str:
     return phon
 
 
-def get_allophone(segment: list[str], i: int) -> (str, dict[str, str | None]):
+def get_allophone(segment: list[str], i: int) -> tuple[str, Allophone]:
     """
     ...
 
@@ -35,7 +34,7 @@ def get_allophone(segment: list[str], i: int) -> (str, dict[str, str | None]):
     """
     phon = get_phon(segment, i)
 
-    return phon, allophones[phon]
+    return phon, allophone_records[phon]
 
 
 def get_allophone_info(allophone: str) -> dict[str, str | None]:
@@ -45,7 +44,7 @@ def get_allophone_info(allophone: str) -> dict[str, str | None]:
     param allophone: Input allophone.
     return: Phonetic information
     """
-    return allophones[allophone]
+    return allophone_records[allophone].to_dict()
 
 
 def process_shch(section: list[str]) -> list[str]:
@@ -64,9 +63,9 @@ def process_shch(section: list[str]) -> list[str]:
 
         if next_phon:
             pair = (current, next_phon)
-            next_allophone = allophones.get(next_phon, {})
+            next_allophone = allophone_records.get(next_phon, NO_ALLOPHONE)
 
-            if (current == 'ʐ' and next_allophone.get('voice') == 'voiceless' and next_phon != 's') or pair in {
+            if (current == 'ʐ' and next_allophone.is_voiceless and next_phon != 's') or pair in {
                 ('s', 't͡ɕ'),
                 ('z', 't͡ɕ'),
                 ('ʐ', 't͡ɕ'),
@@ -87,19 +86,31 @@ def long_ge(section: list[str]) -> None:
 
     param section: List of phonemes in the input segment.
     """
-    for i, current_phon in enumerate(section[:-1]):
-        _, next_allophone = get_allophone(section, i + 1)
-        two_current = (get_phon(section, i), get_phon(section, i + 1))
+    result = []
+    section_len = len(section)
+    # index of the current phoneme, a pair merged into [ʑː] moves it by two
+    j = 0
+    for i in range(section_len - 1):
+        if j >= section_len:
+            break
 
-        if two_current in [('ʐ', 'ʐ'), ('z', 'ʐ')]:
-            section[i] = 'ʑː'
-            del section[i + 1]
-        elif (
-            (current_phon == 'ɕː')
-            and (next_allophone.get('voice', '') == 'voiced')
-            and ('nasal' not in next_allophone.get('manner', ''))
-        ):
-            section[i] = 'ʑː'
+        current_phon = section[j]
+        next_phon = get_phon(section, j + 1)
+        next_allophone = allophone_records[next_phon]
+
+        if (current_phon, next_phon) in {('ʐ', 'ʐ'), ('z', 'ʐ')}:
+            result.append('ʑː')
+            j += 2
+        # voiced [ɕː] is checked at the position it had before the merges
+        elif (section[i] == 'ɕː') and next_allophone.is_voiced and not next_allophone.is_nasal:
+            result.append('ʑː')
+            j += 1
+        else:
+            result.append(current_phon)
+            j += 1
+
+    result.extend(section[j:])
+    section[:] = result
 
 
 def nasal_m_n(section: list[str]) -> None:
@@ -112,9 +123,8 @@ def nasal_m_n(section: list[str]) -> None:
     for i in range(section_len - 1):
         current = section[i]
         next_phon = section[i + 1]
-        next_allophone = allophones.get(next_phon, {})
 
-        if next_allophone.get('place') == 'labial, labiodental':
+        if allophone_records.get(next_phon, NO_ALLOPHONE).is_labiodental:
             if current in {'m', 'n'}:
                 section[i] = 'ɱ'
             elif current in {'mʲ', 'nʲ'}:
@@ -130,7 +140,7 @@ def silent_r(section: list[str]) -> None:
     section_len = len(section)
     for i, current_phon in enumerate(section):
         try:
-            if (i < section_len - 1) and (allophones[section[i + 1]].get('voice', '') != 'voiceless'):
+            if (i < section_len - 1) and not allophone_records[section[i + 1]].is_voiceless:
                 continue
         except IndexError:
             break
@@ -151,9 +161,8 @@ def voiced_ts(section: list[str]) -> None:
     for i in range(section_len - 1):
         current = section[i]
         next_phon = section[i + 1]
-        next_allophone = allophones.get(next_phon, {})
 
-        if next_allophone.get('voice') == 'voiced' and current == 't͡s':
+        if allophone_records.get(next_phon, NO_ALLOPHONE).is_voiced and current == 't͡s':
             section[i] = 'd̻͡z̪'
 
 
@@ -167,19 +176,25 @@ def first_jot(section: list[str]) -> None:
         section[0] = 'ʝ'
 
 
-def assimilative_palatalization(tokens_section: list[str], section: list[str]) -> None:
+def assimilative_palatalization(
+    tokens_section: list[str], section: list[str], lemmas_section: list[str] | None = None
+) -> None:
     """
     Apply palatalization to consonants based on following soft vowel or soft consonant, except for specific exceptions.
 
     param tokens_section: List of word tokens corresponding to the phoneme segment.
     param section: List of phonemes in the current segment.
+    param lemmas_section: Lemmas of the tokens. If None, they are found with the spaCy pipeline.
     """
     exceptions = {'сосиска', 'злить', 'после', 'ёлка', 'день', 'транскрипция', 'джаз', 'неуклюжий', 'шахтёр'}
     # TODO: Вынести исключения в константы
 
+    if lemmas_section is None:
+        lemmas_section = [get_lemma(token) for token in tokens_section]
+
     token_index = 0
     token = tokens_section[token_index]
-    lemma = nlp(token)[0].lemma_
+    lemma = lemmas_section[token_index]
 
     section_len = len(section)
 
@@ -188,47 +203,36 @@ def assimilative_palatalization(tokens_section: list[str], section: list[str]) -
         if current_phon == '_':
             token_index += 1
             token = tokens_section[token_index]
-            lemma = nlp(token)[0].lemma_
+            lemma = lemmas_section[token_index]
 
-        current_allophone = allophones.get(current_phon, {})
+        current_allophone = allophone_records.get(current_phon, NO_ALLOPHONE)
 
         if lemma in exceptions or 'i+zm' in token:
             continue
 
         # Find next non-symbol phoneme
         n = 1
-        while i + n < section_len and allophones.get(section[i + n], {}).get('phon') == 'symb':
+        while i + n < section_len and allophone_records.get(section[i + n], NO_ALLOPHONE).is_symbol:
             n += 1
         next_phon = section[i + n] if i + n < section_len else None
-        next_allophone = allophones.get(next_phon, {})
+        next_allophone = allophone_records.get(next_phon, NO_ALLOPHONE)
 
         # Skip specific cases where palatalization should not occur
         skip_conditions = (
             'l' in (next_phon or '')
-            or (
-                current_allophone.get('place') == 'lingual, dental'
-                and next_allophone.get('place') == 'labial, labiodental'
-            )
+            or (current_allophone.is_dental and next_allophone.is_labiodental)
             or ('r' in current_phon)
             or ('ɡ' in current_phon)
             or ((current_phon[0] in 'tzk') and next_phon in {'rʲ', 'rʲː', 'r̥ʲ'})
-            or (
-                current_allophone.get('place') == 'labial, bilabial'
-                and next_allophone.get('place') == 'labial, bilabial'
-                and lemma != 'лобби'
-            )
-            or (
-                current_allophone.get('place') in {'lingual, dental', 'labial, bilabial'}
-                and next_allophone.get('place') == 'lingual, velar'
-            )
+            or (current_allophone.is_bilabial and next_allophone.is_bilabial and lemma != 'лобби')
+            or ((current_allophone.is_dental or current_allophone.is_bilabial) and next_allophone.is_velar)
         )
         if skip_conditions:
             continue
 
         # Apply palatalization if current consonant is hard and next is soft
-        if (current_allophone.get('phon') == 'C' and 'ʲ' not in current_phon) and (
-            'soft' in next_allophone.get('palatalization', '')
-            and current_allophone.get('palatalization', ' ')[0] != 'a'
+        if (current_allophone.is_consonant and 'ʲ' not in current_phon) and (
+            next_allophone.is_soft and current_allophone.paired_palatalization
         ):
             section[i] = current_phon + 'ʲ'
 
@@ -239,24 +243,29 @@ def long_consonants(section: list[str]) -> None:
 
     param section: List of phonemes for the current segment.
     """
-    n = 0
-    section_iter = section[:]
-    for i, current_phon in enumerate(section_iter):
+    result = []
+    # phonemes that are not in the result yet, a long consonant goes back to the front and can be merged again
+    rest = deque(section)
+    for i, current_phon in enumerate(section):
         add_symb = False
         try:
-            if allophones[section_iter[i + 1]]['phon'] != 'symb':
-                next_phon = section_iter[i + 1]
+            if not allophone_records[section[i + 1]].is_symbol:
+                next_phon = section[i + 1]
             else:
-                next_phon = section_iter[i + 2]
+                next_phon = section[i + 2]
                 add_symb = True
         except IndexError:
             next_phon = ''
 
         if (current_phon[0] in CAN_BE_LONG) and (current_phon == next_phon):
-            del section[i + n]
-            del section[i + n + add_symb]
-            section.insert(i + n, current_phon + 'ː')
-            n -= 1
+            rest.popleft()
+            del rest[add_symb]
+            rest.appendleft(current_phon + 'ː')
+        else:
+            result.append(rest.popleft())
+
+    result.extend(rest)
+    section[:] = result
 
 
 def stunning(segment: list[str]) -> None:
@@ -274,21 +283,20 @@ def stunning(segment: list[str]) -> None:
             break
         try:
             if (i < section_len - 1) and (
-                (allophones[segment[i + 2]].get('voice', '') == 'voiced') or (allophones[segment[i + 2]]['phon'] == 'V')
+                allophone_records[segment[i + 2]].is_voiced or allophone_records[segment[i + 2]].is_vowel
             ):
                 continue
         except IndexError:
             break
 
-        allophone_info = allophones[current_phon]
-        pair = allophone_info.get('pair', None)
-        if (allophone_info.get('voice', '') == 'voiced') and (pair is not None):
-            segment[i] = pair
+        allophone_info = allophone_records[current_phon]
+        if allophone_info.is_voiced and (allophone_info.pair is not None):
+            segment[i] = allophone_info.pair
 
 
 def process_posttonic_vowels(
     previous_phon: str,
-    previous_allophone: dict[str, str | None],
+    previous_allophone: Allophone,
     posttonic_allophones: PosttonicAllophones,
 ) -> str:
     """
@@ -300,9 +308,9 @@ def process_posttonic_vowels(
 
     :return:
     """
-    if (previous_allophone.get('hissing', '') == 'hissing') or (previous_phon in ts):
+    if previous_allophone.is_hissing or (previous_phon in ts):
         result_phon = posttonic_allophones.after_hissing
-    elif 'hard' in previous_allophone.get('palatalization', ''):
+    elif previous_allophone.is_hard:
         result_phon = posttonic_allophones.after_hard
     else:
         result_phon = posttonic_allophones.after_others
@@ -312,7 +320,7 @@ def process_posttonic_vowels(
 
 def process_first_pretonic_vowels(
     previous_phon: str,
-    previous_allophone: dict[str, str | None],
+    previous_allophone: Allophone,
     first_pretonic_allophones: FirstPretonicAllophones,
 ) -> str:
     """
@@ -326,11 +334,11 @@ def process_first_pretonic_vowels(
     """
     if (first_pretonic_allophones.after_zh_sh_ts is not None) and (previous_phon in zh_sh_ts):
         result_phon = first_pretonic_allophones.after_zh_sh_ts
-    elif (
-        (first_pretonic_allophones.after_hissing is not None) and (previous_allophone.get('hissing', '') == 'hissing')
-    ) or (previous_phon in ts):
+    elif ((first_pretonic_allophones.after_hissing is not None) and previous_allophone.is_hissing) or (
+        previous_phon in ts
+    ):
         result_phon = first_pretonic_allophones.after_hissing
-    elif (previous_allophone['phon'] == 'C') and ('hard' in previous_allophone['palatalization']):
+    elif previous_allophone.is_consonant and previous_allophone.is_hard:
         result_phon = first_pretonic_allophones.after_hard
     else:
         result_phon = first_pretonic_allophones.after_others
@@ -341,7 +349,7 @@ def process_first_pretonic_vowels(
 def process_a(
     next_phon: str,
     previous_phon: str,
-    previous_allophone: dict[str, str | None],
+    previous_allophone: Allophone,
     after_next_phon: str,
     position: Position,
 ) -> str | None:
@@ -363,9 +371,9 @@ def process_a(
         if next_phon == '+':  # ударный stressed (not last, not first)
             if previous_phon in zh_sh_ts:
                 result_phon = 'ɐ.'
-            elif ('hard' in previous_allophone.get('palatalization', '')) and (after_next_phon == 'l'):
+            elif previous_allophone.is_hard and (after_next_phon == 'l'):
                 result_phon = 'ɑ'
-            elif 'hard' in previous_allophone.get('palatalization', ''):
+            elif previous_allophone.is_hard:
                 result_phon = 'a'
             else:
                 result_phon = 'æ'
@@ -378,10 +386,8 @@ def process_a(
             )
 
         elif (
-            (previous_allophone.get('hissing', '')) == 'hissing'
-            or (previous_phon in ts)
-            or ('hard' in previous_allophone.get('palatalization', ''))
-        ) or (previous_allophone['phon'] == 'V'):
+            previous_allophone.is_hissing or (previous_phon in ts) or previous_allophone.is_hard
+        ) or previous_allophone.is_vowel:
             result_phon = 'ə'
         else:
             result_phon = 'ɪ.'
@@ -404,7 +410,7 @@ def process_a(
 def process_o(
     next_phon: str,
     previous_phon: str,
-    previous_allophone: dict[str, str | None],
+    previous_allophone: Allophone,
     position: Position,
 ) -> str | None:
     """
@@ -424,7 +430,7 @@ def process_o(
         if next_phon == '+':  # ударный stressed (not last, not first)
             if previous_phon in zh_sh_ts:
                 result_phon = 'ɐ.'
-            elif ('soft' in previous_allophone.get('palatalization', '')) or (previous_allophone['phon'] == 'V'):
+            elif previous_allophone.is_soft or previous_allophone.is_vowel:
                 result_phon = 'ɵ'
 
         elif next_phon == '-':  # первый предударный first pretonic (not last, not first)
@@ -435,10 +441,8 @@ def process_o(
             )
 
         elif (
-            (previous_allophone.get('hissing', '') == 'hissing')
-            or (previous_phon in ts)
-            or ('hard' in previous_allophone.get('palatalization', ''))
-        ) or (previous_allophone['phon'] == 'V'):
+            previous_allophone.is_hissing or (previous_phon in ts) or previous_allophone.is_hard
+        ) or previous_allophone.is_vowel:
             result_phon = 'ə'
         else:
             result_phon = 'ɪ.'
@@ -460,7 +464,7 @@ def process_o(
 def process_e(
     next_phon: str,
     previous_phon: str,
-    previous_allophone: dict[str, str | None],
+    previous_allophone: Allophone,
     position: Position,
 ) -> str | None:
     """
@@ -480,7 +484,7 @@ def process_e(
         if next_phon == '+':  # ударный stressed (not last, not first)
             if previous_phon in zh_sh_ts:
                 result_phon = 'ᵻ'
-            elif 'hard' in previous_allophone.get('palatalization', ''):
+            elif previous_allophone.is_hard:
                 result_phon = 'ɛ'
 
         elif next_phon == '-':  # первый предударный first pretonic (not last, not first)
@@ -490,9 +494,9 @@ def process_e(
                 FirstPretonicAllophones(after_hissing='ə', after_hard='ᵻ', after_others='ɪ'),
             )
 
-        elif (previous_allophone.get('hissing', '') == 'hissing') or (previous_phon in ts):
+        elif previous_allophone.is_hissing or (previous_phon in ts):
             result_phon = 'ə'
-        elif 'hard' in previous_allophone.get('palatalization', ''):
+        elif previous_allophone.is_hard:
             result_phon = 'ᵻ'
         else:
             result_phon = 'ɪ.'
@@ -515,7 +519,7 @@ def process_e(
 
 def process_u(
     next_phon: str,
-    previous_allophone: dict[str, str | None],
+    previous_allophone: Allophone,
     position: Position,
 ) -> str | None:
     """
@@ -531,15 +535,15 @@ def process_u(
 
     if (position != Position.LAST) and (next_phon != '_'):  # not last
         if next_phon == '+':  # ударный stressed (not last)
-            if 'soft' in previous_allophone.get('palatalization', ''):
+            if previous_allophone.is_soft:
                 result_phon = 'ʉ'
 
-        elif 'hard' in previous_allophone.get('palatalization', ''):
+        elif previous_allophone.is_hard:
             result_phon = 'ʊ'
         else:
             result_phon = 'ᵿ'
 
-    elif 'hard' in previous_allophone.get('palatalization', ''):
+    elif previous_allophone.is_hard:
         result_phon = 'ʊ'
     else:
         result_phon = 'ᵿ'
@@ -550,7 +554,7 @@ def process_u(
 def process_i(
     next_phon: str,
     previous_phon: str,
-    previous_allophone: dict[str, str | None],
+    previous_allophone: Allophone,
 ) -> str | None:
     """
     ...
@@ -563,7 +567,7 @@ def process_i(
     """
     result_phon = None
 
-    if previous_allophone['phon'] == 'C':
+    if previous_allophone.is_consonant:
         if previous_phon in zh_sh_ts:  # после ж, ш, ц
             result_phon = 'ɨ'
         elif next_phon != '+':  # безударный unstressed
@@ -577,8 +581,8 @@ def process_ii(  # noqa: PLR0913
     i: int,
     next_phon: str,
     previous_phon: str,
-    previous_allophone: dict[str, str | None],
-    after_next_allophone: dict[str, str | None],
+    previous_allophone: Allophone,
+    after_next_allophone: Allophone,
 ) -> str | None:
     """
     ...
@@ -600,25 +604,21 @@ def process_ii(  # noqa: PLR0913
             if (
                 (previous_phon == 'l')
                 and (section_len > 4)  # noqa: PLR2004
-                and ('lab' in after_previous_allophone.get('place', ''))
+                and after_previous_allophone.is_labial
             ):
                 result_phon = 'ɯ̟ɨ̟'
-            elif (
-                previous_allophone.get('place', '') == 'lingual, dental'
-                and after_next_allophone.get('place', '') == 'lingual, velar'
-            ) or (
-                previous_allophone.get('place', '') == 'lingual, palatinоdental'
-                and after_next_allophone.get('place', '') == 'lingual, velar'
+            elif (previous_allophone.is_dental and after_next_allophone.is_velar) or (
+                previous_allophone.is_palatinodental and after_next_allophone.is_velar
             ):
                 result_phon = 'ɨ̟'
 
         # предударный pretonic / заударный posttonic (not last)
-        elif (previous_allophone.get('hissing', '') == 'hissing') or (previous_phon in ts):
+        elif previous_allophone.is_hissing or (previous_phon in ts):
             result_phon = 'ə'
         else:
             result_phon = 'ᵻ'
 
-    elif (previous_allophone.get('hissing', '') == 'hissing') or (previous_phon in ts):  # заударный (last)
+    elif previous_allophone.is_hissing or (previous_phon in ts):  # заударный (last)
         result_phon = 'ə'
     else:
         result_phon = 'ᵻ'
@@ -677,51 +677,42 @@ def labia_velar(segment: list[str]) -> list[str]:
     for i, current_phon in enumerate(segment):
         previous_phon = segment[i - 1] if i != 0 else ''
 
-        current_allophone = allophones[current_phon]
-        previous_allophone = allophones[previous_phon]
+        current_allophone = allophone_records[current_phon]
+        previous_allophone = allophone_records[previous_phon]
         if (
             (i != 0)
-            and (current_allophone.get('round', '') == 'round')
+            and current_allophone.is_round
             and (previous_phon != '_')
-            and (previous_allophone['phon'] == 'C')
+            and previous_allophone.is_consonant
             and ('ʷ' not in previous_phon)
             and ('ᶣ' not in previous_phon)
         ):
             if 'ʲ' in previous_phon:
                 new = previous_phon.replace('ʲ', '') + 'ᶣ'
-                if new in allophones:
-                    del result_segment[-1]
-                    result_segment.append(new)
-                    result_segment.append(current_phon)
-            elif previous_allophone.get('palatalization', '') == 'asoft':
+            elif previous_allophone.always_soft:
                 new = previous_phon + 'ᶣ'
-                if new in allophones:
-                    del result_segment[-1]
-                    result_segment.append(new)
-                    result_segment.append(current_phon)
             else:
                 new = previous_phon + 'ʷ'
-                if new in allophones:
-                    del result_segment[-1]
-                    result_segment.append(new)
-                    result_segment.append(current_phon)
 
         elif (
             (i != 0)
-            and (current_allophone.get('round', '') == 'velarize')
+            and current_allophone.is_velarized
             and (previous_phon != '_')
-            and (previous_allophone['phon'] == 'C')
+            and previous_allophone.is_consonant
             and ('ˠ' not in previous_phon)
-            and ('soft' not in previous_allophone.get('palatalization', ''))
+            and not previous_allophone.is_soft
         ):
             # в русском нет слов, начинающихся с ы
             new = previous_phon + 'ˠ'
-            if new in allophones:
-                del result_segment[-1]
-                result_segment.append(new)
-                result_segment.append(current_phon)
 
         else:
             result_segment.append(current_phon)
+            continue
+
+        # the previous consonant is the last one in the result,
+        # the vowel is dropped if there is no such labialized or velarized consonant
+        if new in allophone_records:
+            result_segment[-1] = new
+            result_segment.append(current_phon)
 
     return result_segment
@@ -1,4 +1,4 @@
-from .sounds import allophones, ru_vowel_symbols
+from .sounds import allophone_records, ru_vowel_symbols
 
 # def is_jotised_vowel(symbol: str) -> bool:
 #     """
@@ -102,14 +102,13 @@ def fix_jotised(phonemes_list_section: list[str], letters_list_section: list[str
     n = 0
     for i, current_phon in enumerate(phonemes_list_to_iterate):
         sub_symb = False
-        current_allophone = allophones[current_phon]
-        if current_allophone['phon'] == 'symb':
+        if allophone_records[current_phon].is_symbol:
             continue
         if current_phon == 'j' and letters_list_to_iterate[i] != 'й':
             letters_list_to_iterate.insert(i, 'й')
         current_let = letters_list_to_iterate[i]
         try:
-            if allophones[phonemes_list_to_iterate[i - 1]]['phon'] != 'symb':
+            if not allophone_records[phonemes_list_to_iterate[i - 1]].is_symbol:
                 previous_let = letters_list_to_iterate[i - 1]
                 previous_phon = phonemes_list_to_iterate[i - 1]
             else:
@@ -128,7 +127,7 @@ def fix_jotised(phonemes_list_section: list[str], letters_list_section: list[str
         except IndexError:
             after_next_let = ''
 
-        previous_allophone = allophones[previous_phon]
+        previous_allophone = allophone_records[previous_phon]
         if (current_let == 'о') and (previous_let[-1] == 'ь') and (next_let == '+'):
             phonemes_list_section_copy.insert(i + n, 'j')
             n += 1
@@ -136,9 +135,9 @@ def fix_jotised(phonemes_list_section: list[str], letters_list_section: list[str
         elif current_let in ['ё', 'е', 'я', 'ю']:
             if previous_let[-1] in ['ь', 'ъ']:
                 if (
-                    (previous_allophone['phon'] == 'C')
+                    previous_allophone.is_consonant
                     and ('ʲ' not in previous_phon)
-                    and (previous_allophone['palatalization'][0] != 'a')
+                    and previous_allophone.paired_palatalization
                 ):
                     phonemes_list_section_copy[i + n - 1 - sub_symb] = previous_phon + 'ʲ'
                 phonemes_list_section_copy.insert(i + n, 'j')
@@ -150,9 +149,9 @@ def fix_jotised(phonemes_list_section: list[str], letters_list_section: list[str
 
             elif (
                 (current_let != 'э')
-                and (previous_allophone['phon'] == 'C')
+                and previous_allophone.is_consonant
                 and ('ʲ' not in previous_phon)
-                and ('a' not in previous_allophone['palatalization'][0])
+                and previous_allophone.paired_palatalization
             ):
                 phonemes_list_section_copy[i + n - 1 - sub_symb] = previous_phon + 'ʲ'
 
@@ -161,7 +160,7 @@ def fix_jotised(phonemes_list_section: list[str], letters_list_section: list[str
                 n += 1
 
         elif current_let == 'и':
-            if sub_symb and (phonemes_list_to_iterate[i - 1] == '_') and (previous_allophone['phon'] == 'C'):
+            if sub_symb and (phonemes_list_to_iterate[i - 1] == '_') and previous_allophone.is_consonant:
                 phonemes_list_section_copy[i + n] = 'ɨ'
 
             elif previous_let[-1] in {'ь', 'ъ'}:
@@ -169,9 +168,9 @@ def fix_jotised(phonemes_list_section: list[str], letters_list_section: list[str
                 n += 1
 
             elif (
-                (previous_allophone['phon'] == 'C')
+                previous_allophone.is_consonant
                 and ('ʲ' not in previous_phon)
-                and (previous_allophone['palatalization'][0] != 'a')
+                and previous_allophone.paired_palatalization
             ):
                 phonemes_list_section_copy[i + n - 1 - sub_symb] = previous_phon + 'ʲ'
 
@@ -1,10 +1,15 @@
 import re
+from typing import TYPE_CHECKING
 
-import nltk
 from num2t4ru import num2text
 
 from ru_transcript.consts import JOTISED_LETTERS
 
+from .sounds import function_words
+
+if TYPE_CHECKING:
+    from .syntax_tree import SectionParse
+
 # nltk.download('punkt')
 # nltk.download('averaged_perceptron_tagger_ru')
 
@@ -105,120 +110,170 @@ def text_norm_tok(text: str) -> list[list[str]]:
 adverb_adp = {'после', 'кругом', 'мимо', 'около', 'вокруг', 'напротив', 'поперёк'}
 
 
-def find_clitics(
-    dep: 'nltk.tree.Tree', text: list[str], indexes: set[tuple[int, int]] | None = None
-) -> set[tuple[int, int]]:
+def _in_span(index: int, span: tuple[int | None, int | None] | None) -> bool:
+    if span is None or span[0] is None or span[1] is None:
+        return False
+
+    return span[0] <= index <= span[1]
+
+
+def find_clitics(parse: 'SectionParse', text: list[str]) -> set[tuple[int, int]]:
     """
-    Find proclitics and enclitics in a text using a dependency tree.
+    Find proclitics and enclitics in a text using its dependency parse.
+
+    A functor (a conjunction, a particle or a preposition without dependents) is attached to a neighbouring word
+    if the word belongs to the subtree of the functor's head.
 
-    param dep: An NLTK dependency tree node.
+    param parse: Parse of the text (see `SyntaxTree.parse_sections`).
     param text: List of tokens in the text.
-    param indexes: A set to store tuples of (main_word_index, clitic_index).
-                    If None, a new set is created.
-    return: Set of tuples representing clitic relationships.
+    return: Set of tuples (main_word_index, clitic_index) representing clitic relationships.
     """
-    if indexes is None:
-        indexes = set()
-
+    indexes = set()
     functors_pos = {'CCONJ', 'PART', 'ADP'}
-    str_dep = str(dep)
-
-    # Only process nodes with more than one token
-    if len(str_dep.split()) > 1:
-        for token in dep:
-            if isinstance(token, nltk.tree.Tree):
-                # Recurse into subtrees
-                indexes = find_clitics(token, text, indexes)
-            elif token.pos_ in functors_pos and token.text not in adverb_adp:
-                clitic_index = token.i
-                main_word_index = None
-
-                # Proclitic: functor before main word (excluding some vowels)
-                if (
-                    token.i < len(text) - 1
-                    and text[token.i + 1] in str_dep
-                    and text[token.i + 1][0] not in JOTISED_LETTERS
-                ):
-                    main_word_index = token.i + 1
-                # Enclitic: functor after main word
-                elif token.i > 0 and text[token.i - 1] in str_dep:
-                    main_word_index = token.i - 1
-
-                if main_word_index is not None:
-                    indexes.add((main_word_index, clitic_index))
+
+    for clitic_index, (pos, head, span) in enumerate(zip(parse.pos, parse.heads, parse.spans, strict=True)):
+        # only functors without dependents of their own, the root of a sentence has no head
+        if (
+            pos not in functors_pos
+            or text[clitic_index] in adverb_adp
+            or span != (clitic_index, clitic_index)
+            or head is None
+            or head == clitic_index
+        ):
+            continue
+
+        head_span = parse.spans[head]
+        # Proclitic: functor before main word (excluding some vowels)
+        if (
+            clitic_index < len(text) - 1
+            and _in_span(clitic_index + 1, head_span)
+            and text[clitic_index + 1][:1] not in JOTISED_LETTERS
+        ):
+            indexes.add((clitic_index + 1, clitic_index))
+        # Enclitic: functor after main word
+        elif clitic_index > 0 and _in_span(clitic_index - 1, head_span):
+            indexes.add((clitic_index - 1, clitic_index))
 
     return indexes
 
 
-def merge_phrasal_words(phonemes: list[str], indexes: set[tuple[int, int]]) -> list[str]:
+functors = function_words['ADP'] | function_words['CCONJ'] | function_words['PART']
+
+
+def find_clitics_lexicon(text: list[str]) -> set[tuple[int, int]]:
     """
-    Merge clitics with their main words in a phoneme list.
+    Find proclitics and enclitics in a text using the tables of function words, without a parser.
 
-    param phonemes: List of phonemes with '_' representing spaces.
-    param indexes: Set of tuples (main_word_index, clitic_index) indicating clitic relationships.
-    return: A new phoneme list where clitics are joined with their main words.
+    Prepositions, conjunctions and most particles depend on the next word, so they are attached to it
+    (except for the words that start with a jotised vowel, like in `find_clitics`).
+    Enclitics ('же', 'ли', 'бы', ...) are attached to the previous word.
+
+    param text: List of tokens in the text.
+    return: Set of tuples (main_word_index, clitic_index).
     """
-    tokens_list = []
-    start_token_index = 0
+    indexes = set()
+    for clitic_index, token in enumerate(text):
+        if token not in functors or token in adverb_adp:
+            continue
 
-    for i, current_phon in enumerate(phonemes):
-        if current_phon == '_':
-            tokens_list.append(phonemes[start_token_index:i])
-            start_token_index = i + 1
+        if token in function_words['enclitics']:
+            if clitic_index > 0:
+                indexes.add((clitic_index - 1, clitic_index))
+        elif clitic_index < len(text) - 1 and text[clitic_index + 1][:1] not in JOTISED_LETTERS:
+            indexes.add((clitic_index + 1, clitic_index))
+
+    return indexes
 
-    tokens_list.append(phonemes[start_token_index:])
 
-    phrasal_words = tokens_list[:]
+def _merge_in_order(words: list[list[str]], indexes: set[tuple[int, int]]) -> list[tuple[tuple[int, bool], ...]]:
+    """
+    Merge clitics pair by pair in the order of the set, the way the list-based version of `merge_phrasal_words` did.
+
+    The list of phrasal words, the running counters and the positions of inserts are the same as in that version,
+    but the words are identified by their indexes instead of being compared by value. A pair that can't be applied
+    stops where it fails (the words it has already taken out stay out).
+
+    param words: Phonemes of the words.
+    param indexes: Set of tuples (main_word_index, clitic_index).
+    return: Phrasal words as tuples of parts (word index, whether the part is a clitic).
+    """
+    word_indexes = range(len(words))
+    phrasal_words = [((i, False),) for i in word_indexes]
     n = 0
     main_word_cache = []
     enclitic_cache = []
 
-    for tuple_indexes in indexes:
+    for main_word_index, clitic_index in indexes:
         try:
-            main_word_index = tuple_indexes[0]
-
-            if tuple_indexes[1] > main_word_index:  # проклитика
+            if clitic_index > main_word_index:
                 main_word = (
                     phrasal_words[main_word_index + n]
                     if main_word_index in main_word_cache
-                    else tokens_list[main_word_index]
+                    else ((word_indexes[main_word_index], False),)
                 )
                 main_word_cache.append(main_word_index)
-                proclitic_index = tuple_indexes[1]
-
-                proclitic = [x for x in tokens_list[proclitic_index] if x != '+']
-                phrasal_words.remove(tokens_list[proclitic_index])
+                clitic = ((word_indexes[clitic_index], True),)
+                phrasal_words.remove(((word_indexes[clitic_index], False),))
                 phrasal_words.remove(main_word)
-                if proclitic_index == 1:
-                    phrasal_words.insert(0, main_word + proclitic)
-                else:
-                    phrasal_words.insert(
-                        proclitic_index - main_word_cache.count(main_word_index), main_word + proclitic
-                    )
-                n -= 1
-
-            else:  # энклитика
+                position = 0 if clitic_index == 1 else clitic_index - main_word_cache.count(main_word_index)
+                phrasal_words.insert(position, main_word + clitic)
+            else:
                 main_word = (
                     phrasal_words[main_word_index - enclitic_cache.count(main_word_index)]
                     if main_word_index in enclitic_cache
-                    else tokens_list[main_word_index]
+                    else ((word_indexes[main_word_index], False),)
                 )
                 main_word_cache.append(main_word_index)
-                enclitic_index = tuple_indexes[1]
-                enclitic_cache.append(enclitic_index)
-
-                enclitic = [x for x in tokens_list[enclitic_index] if x != '+']
-                phrasal_words.remove(tokens_list[enclitic_index])
+                enclitic_cache.append(clitic_index)
+                clitic = ((word_indexes[clitic_index], True),)
+                phrasal_words.remove(((word_indexes[clitic_index], False),))
                 phrasal_words.remove(main_word)
-                phrasal_words.insert(enclitic_index + n + enclitic_cache.count(main_word_index), enclitic + main_word)
-                n -= 1
-
-        except Exception:  # noqa: PERF203, S112
+                position = clitic_index + n + enclitic_cache.count(main_word_index)
+                phrasal_words.insert(position, clitic + main_word)
+            n -= 1
+        except (IndexError, ValueError):  # noqa: PERF203
             continue
 
+    return phrasal_words
+
+
+def merge_phrasal_words(phonemes: list[str], indexes: set[tuple[int, int]]) -> list[str]:
+    """
+    Merge clitics with their main words in a phoneme list.
+
+    A section with one clitic is merged in one pass. With several clitics the pairs are merged one by one
+    in the order of the set (see `_merge_in_order`), so a chain of clitics like 'и в дома' gives 'iv_dom+a'.
+
+    param phonemes: List of phonemes with '_' representing spaces.
+    param indexes: Set of tuples (main_word_index, clitic_index) indicating clitic relationships.
+    return: A new phoneme list where clitics are joined with their main words.
+    """
+    words = [[]]
+    for current_phon in phonemes:
+        if current_phon == '_':
+            words.append([])
+        else:
+            words[-1].append(current_phon)
+
+    if len(indexes) > 1 or any(
+        abs(main_word_index - clitic_index) != 1 or not 0 <= min(main_word_index, clitic_index) < len(words) - 1
+        for main_word_index, clitic_index in indexes
+    ):
+        phrasal_words = _merge_in_order(words, indexes)
+    else:
+        phrasal_words = [((i, False),) for i in range(len(words))]
+        for main_word_index, clitic_index in indexes:
+            first = min(main_word_index, clitic_index)
+            phrasal_words[first : first + 2] = [
+                ((main_word_index, False), (clitic_index, True))
+                if clitic_index > main_word_index
+                else ((clitic_index, True), (main_word_index, False))
+            ]
+
     phrasal_words_result = []
-    for token in phrasal_words:
-        phrasal_words_result.extend([*token, '_'])
-    del phrasal_words_result[-1]
+    for phrasal_word in phrasal_words:
+        for i, is_clitic in phrasal_word:
+            phrasal_words_result.extend([x for x in words[i] if x != '+'] if is_clitic else words[i])
+        phrasal_words_result.append('_')
 
-    return phrasal_words_result
+    return phrasal_words_result[:-1]
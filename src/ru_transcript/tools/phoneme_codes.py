@@ -0,0 +1,112 @@
+from itertools import chain
+
+import numpy as np
+
+from .sounds import allophones
+
+# all symbols of the table of allophones and their voiceless pairs (some of them aren't in the table)
+symbols: tuple[str, ...] = tuple(
+    dict.fromkeys([*allophones, *(info['pair'] for info in allophones.values() if info.get('pair') is not None)])
+)
+# code of symbols that aren't in the table, it has no features
+UNKNOWN = len(symbols)
+
+
+class _Codes(dict):
+    def __missing__(self, key: str) -> int:
+        return UNKNOWN
+
+
+codes: dict[str, int] = _Codes((symbol, code) for code, symbol in enumerate(symbols))
+
+# one column for every pair (feature, value) of the table of allophones
+feature_columns: dict[tuple[str, str], int] = {
+    key: column
+    for column, key in enumerate(
+        sorted(
+            {
+                (feature, value)
+                for info in allophones.values()
+                for feature, value in info.items()
+                if feature != 'pair' and value is not None
+            }
+        )
+    )
+}
+# feature_matrix[code, feature_columns[(feature, value)]] - whether the symbol has the feature
+feature_matrix = np.zeros((UNKNOWN + 1, len(feature_columns)), dtype=bool)
+for _symbol, _info in allophones.items():
+    for _feature, _value in _info.items():
+        if (_feature, _value) in feature_columns:
+            feature_matrix[codes[_symbol], feature_columns[(_feature, _value)]] = True
+feature_matrix.setflags(write=False)
+
+# code of the voiceless pair of every symbol (-1 if there isn't one)
+pairs = np.full(UNKNOWN + 1, -1, dtype=np.int32)
+for _symbol, _info in allophones.items():
+    if _info.get('pair') is not None:
+        pairs[codes[_symbol]] = codes[_info['pair']]
+pairs.setflags(write=False)
+
+
+def has_feature(feature: str, value: str) -> np.ndarray:
+    """
+    Return a mask of the symbols with a feature.
+
+    param feature: Name of the feature (phon, place, manner, palatalization, voice, hissing, class, round).
+    param value: Value of the feature.
+    return: Boolean array indexed by codes.
+    """
+    column = feature_columns.get((feature, value))
+    if column is None:
+        return np.zeros(UNKNOWN + 1, dtype=bool)
+
+    return feature_matrix[:, column]
+
+
+def symbols_mask(selected: frozenset[str] | set[str]) -> np.ndarray:
+    """
+    Return a mask of the given symbols.
+
+    param selected: Symbols.
+    return: Boolean array indexed by codes.
+    """
+    mask = np.zeros(UNKNOWN + 1, dtype=bool)
+    mask[[codes[symbol] for symbol in selected if symbol in codes]] = True
+
+    return mask
+
+
+def encode(section: list[str]) -> np.ndarray:
+    """
+    Convert a section into an array of codes.
+
+    param section: List of phonemes.
+    return: Array of codes.
+    """
+    return np.fromiter(map(codes.__getitem__, section), dtype=np.int32, count=len(section))
+
+
+def encode_sections(sections: list[list[str]]) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Convert many sections into one array of codes.
+
+    param sections: Lists of phonemes.
+    return: Array of codes of all sections and offsets of the sections
+        (the section `i` is `flat[offsets[i] : offsets[i + 1]]`).
+    """
+    offsets = np.zeros(len(sections) + 1, dtype=np.int64)
+    np.cumsum([len(section) for section in sections], out=offsets[1:])
+    flat = np.fromiter(map(codes.__getitem__, chain.from_iterable(sections)), dtype=np.int32, count=int(offsets[-1]))
+
+    return flat, offsets
+
+
+def decode(section_codes: np.ndarray) -> list[str]:
+    """
+    Convert an array of codes into a list of phonemes.
+
+    param section_codes: Array of codes (without UNKNOWN).
+    return: List of phonemes.
+    """
+    return [symbols[code] for code in section_codes.tolist()]
@@ -0,0 +1,229 @@
+from functools import cached_property
+from typing import TYPE_CHECKING, NamedTuple
+
+from .sounds import allophones
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# minimum number of phonemes in a batch for vectorized rules, smaller batches are processed section by section
+VECTORIZE_MIN_SIZE = 500
+
+
+class ContextRule(NamedTuple):
+    """
+    Context-dependent replacement of one phoneme: (left context, target, right context) → replacement.
+
+    The right context is given by the sets of phonemes that may follow the target. A rule with `next_phons=None`
+    doesn't look at the next phoneme. The left context is only the start of the section (`only_first`).
+    """
+
+    name: str
+    # target → replacement
+    replacements: dict[str, str]
+    # phonemes allowed right after the target (None - any)
+    next_phons: frozenset[str] | None = None
+    # phonemes allowed after the next one (None - any, otherwise the phoneme must exist)
+    after_next_phons: frozenset[str] | None = None
+    # whether the rule is applied to the last phoneme of the section
+    at_end: bool = False
+    # whether the rule is applied only to the first phoneme of the section
+    only_first: bool = False
+
+    def matches(self, i: int, next_phon: str | None, after_next_phon: str | None) -> bool:
+        """
+        Check the context of a target.
+
+        param i: Index of the target.
+        param next_phon: Next phoneme (None at the end of the section).
+        param after_next_phon: Phoneme after the next one (None if there isn't one).
+        return: True if the rule is applied.
+        """
+        if self.only_first and i != 0:
+            return False
+        if next_phon is None:
+            return self.at_end
+        if self.next_phons is not None and next_phon not in self.next_phons:
+            return False
+
+        return self.after_next_phons is None or (
+            after_next_phon is not None and after_next_phon in self.after_next_phons
+        )
+
+
+def _select(feature: str, value: str) -> frozenset[str]:
+    return frozenset(phon for phon, info in allophones.items() if info.get(feature, '') == value)
+
+
+VOICED = _select('voice', 'voiced')
+VOICELESS = _select('voice', 'voiceless')
+LABIODENTAL = _select('place', 'labial, labiodental')
+# neither voiced consonants nor vowels
+NOT_VOICED = frozenset(
+    phon for phon, info in allophones.items() if info.get('voice', '') != 'voiced' and info['phon'] != 'V'
+)
+
+# the rules of `stunning`, `first_jot`, `nasal_m_n`, `silent_r` and `voiced_ts` in the order of the pipeline
+CONSONANT_RULES = (
+    # devoicing at the end of a word that isn't followed by a voiced consonant or a vowel, or of the section
+    ContextRule(
+        'stunning',
+        {
+            phon: info['pair']
+            for phon, info in allophones.items()
+            if info.get('voice', '') == 'voiced' and info.get('pair') is not None
+        },
+        next_phons=frozenset({'_'}),
+        after_next_phons=NOT_VOICED,
+        at_end=True,
+    ),
+    ContextRule('first_jot', {'j': 'ʝ'}, at_end=True, only_first=True),
+    ContextRule('nasal_m_n', {'m': 'ɱ', 'n': 'ɱ', 'mʲ': 'ɱʲ', 'nʲ': 'ɱʲ'}, next_phons=LABIODENTAL),
+    ContextRule('silent_r', {'r': 'r̥', 'rʲ': 'r̥ʲ'}, next_phons=VOICELESS, at_end=True),
+    ContextRule('voiced_ts', {'t͡s': 'd̻͡z̪'}, next_phons=VOICED),
+)
+
+
+class _CompiledRule(NamedTuple):
+    # code of the replacement of every code (-1 if the symbol isn't a target)
+    replacements: 'np.ndarray'
+    next_mask: 'np.ndarray | None'
+    after_next_mask: 'np.ndarray | None'
+    at_end: bool
+    only_first: bool
+
+
+class RuleEngine:
+    """Apply a sequence of context rules to a section in one pass or to a batch of sections with NumPy."""
+
+    def __init__(self, rules: tuple[ContextRule, ...]) -> None:
+        """
+        Compile the rules.
+
+        param rules: Rules in the order in which they would be applied by separate passes.
+        """
+        self.rules = rules
+        self._targets = frozenset(target for rule in rules for target in rule.replacements)
+
+    def apply(self, section: list[str]) -> None:
+        """
+        Apply the rules to a section in place.
+
+        Separate left-to-right passes would show every rule the right context as it was after the previous rules.
+        The section is walked from right to left instead, and the phonemes after the current one are kept
+        at every stage, so the result is the same as the result of the separate passes.
+
+        param section: List of phonemes.
+        """
+        # stages of the next phoneme and of the phoneme after it (a list of the phoneme before every rule and after
+        # the last one), a string if the phoneme isn't changed by the rules
+        next_stages: str | list[str] | None = None
+        after_next_stages: str | list[str] | None = None
+
+        for i in range(len(section) - 1, -1, -1):
+            phon = stages = section[i]
+            if phon in self._targets:
+                for k, rule in enumerate(self.rules):
+                    replacement = rule.replacements.get(phon)
+                    if replacement is not None and rule.matches(
+                        i,
+                        next_stages if next_stages.__class__ is not list else next_stages[k],
+                        after_next_stages if after_next_stages.__class__ is not list else after_next_stages[k],
+                    ):
+                        if stages.__class__ is not list:
+                            stages = [phon] * (k + 1)
+                        phon = replacement
+                    if stages.__class__ is list:
+                        stages.append(phon)
+                section[i] = phon
+
+            after_next_stages, next_stages = next_stages, stages
+
+    @cached_property
+    def _compiled(self) -> list[_CompiledRule]:
+        import numpy as np  # noqa: PLC0415
+
+        from .phoneme_codes import UNKNOWN, codes, symbols_mask  # noqa: PLC0415
+
+        compiled = []
+        for rule in self.rules:
+            replacements = np.full(UNKNOWN + 1, -1, dtype=np.int32)
+            for target, replacement in rule.replacements.items():
+                if codes[replacement] == UNKNOWN:
+                    raise ValueError(f'Replacement {replacement!r} of the rule {rule.name} is an unknown symbol')  # noqa: TRY003
+                replacements[codes[target]] = codes[replacement]
+            compiled.append(
+                _CompiledRule(
+                    replacements=replacements,
+                    next_mask=symbols_mask(rule.next_phons) if rule.next_phons is not None else None,
+                    after_next_mask=symbols_mask(rule.after_next_phons) if rule.after_next_phons is not None else None,
+                    at_end=rule.at_end,
+                    only_first=rule.only_first,
+                )
+            )
+
+        return compiled
+
+    def apply_batch(self, sections: list[list[str]]) -> None:
+        """
+        Apply the rules to many sections in place.
+
+        All sections are coded as one integer array (see `phoneme_codes`) and every rule is evaluated for the whole
+        batch with shifts and masks. Rules see the right context as it was after the previous rules, like separate
+        left-to-right passes do. Small batches are processed by `apply`.
+
+        param sections: Lists of phonemes.
+        """
+        if sum(map(len, sections)) < VECTORIZE_MIN_SIZE:
+            for section in sections:
+                self.apply(section)
+            return
+
+        import numpy as np  # noqa: PLC0415
+
+        from .phoneme_codes import UNKNOWN, encode_sections, symbols  # noqa: PLC0415
+
+        flat, offsets = encode_sections(sections)
+        starts, ends = offsets[:-1], offsets[1:]
+        not_empty = ends > starts
+        is_first = np.zeros(len(flat), dtype=bool)
+        is_first[starts[not_empty]] = True
+        is_last = np.zeros(len(flat) + 1, dtype=bool)
+        is_last[ends[not_empty] - 1] = True
+        # the phoneme after the next one is in the same section
+        has_after_next = ~is_last[:-1] & ~is_last[1:]
+        is_last = is_last[:-1]
+
+        state = flat
+        next_codes = np.full(len(flat), UNKNOWN, dtype=np.int32)
+        after_next_codes = np.full(len(flat), UNKNOWN, dtype=np.int32)
+        for rule in self._compiled:
+            replacements = rule.replacements[state]
+            applied = replacements >= 0
+            if not applied.any():
+                continue
+
+            if rule.next_mask is not None or rule.after_next_mask is not None:
+                next_codes[:-1] = state[1:]
+                after_next_codes[:-2] = state[2:]
+            context = np.ones(len(flat), dtype=bool)
+            if rule.next_mask is not None:
+                context &= rule.next_mask[next_codes]
+            if rule.after_next_mask is not None:
+                context &= has_after_next & rule.after_next_mask[after_next_codes]
+            context = np.where(is_last, rule.at_end, context)
+            if rule.only_first:
+                context &= is_first
+
+            state = np.where(applied & context, replacements, state)
+
+        changed = np.flatnonzero(state != flat)
+        section_indexes = np.searchsorted(offsets, changed, side='right') - 1
+        offsets = offsets.tolist()
+        for i, section_index, code in zip(
+            changed.tolist(), section_indexes.tolist(), state[changed].tolist(), strict=True
+        ):
+            sections[section_index][i - offsets[section_index]] = symbols[code]
+
+
+consonant_rules = RuleEngine(CONSONANT_RULES)
@@ -1,29 +1,20 @@
-from pathlib import Path
+from collections.abc import Iterable
 
-from stressrnn import StressRNN
+from ru_transcript.data_bundle import load_tables
+from ru_transcript.models import get_stress_rnn
+from ru_transcript.stress_cache import get_stress_cache
 
 from .sounds import ru_vowel_symbols
 
-ROOT_DIR = Path(__file__).resolve().parent
+stress_default_dict: dict[str, str] = load_tables()['stress_default_dict']
 
-error_words_path = ROOT_DIR / '../data/error_words_stresses_default.txt'
-with error_words_path.open(encoding='utf-8') as file:
-    error_words_stresses = file.readlines()
 
-stress_default_dict = {}
-for word in error_words_stresses:
-    stress_default_dict[word.replace('+', '').replace('\n', '')] = word.replace('\n', '')
-
-stress_rnn = StressRNN()
-
-
-def place_stress(token: str, stress_accuracy_threshold: float) -> str:
+def _place_stress_by_rules(token: str) -> str | None:
     """
-    Place an accent (stress) in a Russian word.
+    Place an accent in a word if it doesn't need the StressRNN model.
 
     param token: Token without an accent.
-    param stress_accuracy_threshold: Threshold for stress prediction accuracy.
-    return: Word with an accent placed.
+    return: Word with an accent placed or None if the stress has to be predicted.
     """
     if token in stress_default_dict:
         return stress_default_dict[token]
@@ -52,7 +43,56 @@ def place_stress(token: str, stress_accuracy_threshold: float) -> str:
 
     # raise ValueError("Unfortunately, the automatic stress placement function is not yet available. "
     # f"Add stresses yourselves.\nThere is no stress for the word {token}")
-    return stress_rnn.put_stress(token, accuracy_threshold=stress_accuracy_threshold)
+    return None
+
+
+def _run_stress_rnn(tokens: list[str], stress_accuracy_threshold: float) -> dict[str, str]:
+    """
+    Predict stresses of unique tokens with StressRNN.
+
+    Every token is given to StressRNN alone: the model takes the neighbouring words of a text into account,
+    so tokens joined into one text could get other stresses.
+
+    param tokens: Unique tokens without accents.
+    param stress_accuracy_threshold: Threshold for stress prediction accuracy.
+    return: Dictionary {token: token with an accent}.
+    """
+    stress_rnn = get_stress_rnn()
+    return {token: stress_rnn.put_stress(token, accuracy_threshold=stress_accuracy_threshold) for token in tokens}
+
+
+def predict_stresses(tokens: Iterable[str], stress_accuracy_threshold: float) -> dict[str, str]:
+    """
+    Predict stresses with StressRNN, using the stress cache.
+
+    param tokens: Tokens without accents.
+    param stress_accuracy_threshold: Threshold for stress prediction accuracy.
+    return: Dictionary {token: token with an accent}.
+    """
+    stress_cache = get_stress_cache()
+    tokens = list(dict.fromkeys(tokens))
+    res = stress_cache.get_many(tokens, stress_accuracy_threshold)
+
+    predicted = _run_stress_rnn([token for token in tokens if token not in res], stress_accuracy_threshold)
+    if predicted:
+        stress_cache.put_many(predicted, stress_accuracy_threshold)
+
+    return res | predicted
+
+
+def place_stress(token: str, stress_accuracy_threshold: float) -> str:
+    """
+    Place an accent (stress) in a Russian word.
+
+    param token: Token without an accent.
+    param stress_accuracy_threshold: Threshold for stress prediction accuracy.
+    return: Word with an accent placed.
+    """
+    stressed_token = _place_stress_by_rules(token)
+    if stressed_token is None:
+        stressed_token = predict_stresses([token], stress_accuracy_threshold)[token]
+
+    return stressed_token
 
 
 def replace_stress(token: str) -> str:
@@ -112,14 +152,50 @@ def put_stresses(
     return: List of tokens with stress symbols applied or adjusted.
     """
     res = []
+    to_predict = []
     for token in tokens_list:
         if ('+' in token) and (stress_place == 'before'):  # need to replace stress position
             res.append(replace_stress(token))
-        elif '+' not in token:  # use StressRNN to place stress
-            res.append(place_stress(token, stress_accuracy_threshold))
+        elif '+' not in token:  # use the rules or StressRNN to place stress
+            res.append(_place_stress_by_rules(token))
+            if res[-1] is None:
+                to_predict.append(token)
         else:
             res.append(token)  # stress is already correctly placed
 
+    if to_predict:
+        predicted = predict_stresses(to_predict, stress_accuracy_threshold)
+        res = [
+            predicted[token] if stressed is None else stressed for token, stressed in zip(tokens_list, res, strict=True)
+        ]
+
+    return res
+
+
+def put_stresses_batch(
+    sections: list[list[str]], stress_place: str = 'after', stress_accuracy_threshold: float = 0.86
+) -> list[list[str]]:
+    """
+    Put or replace stresses in tokens of many sections at once.
+
+    param sections: List of sections (lists of tokens).
+    param stress_place: 'after' - to place the stress symbol after the stressed vowel,
+        'before' - to place the stress symbol before the stressed vowel.
+    param stress_accuracy_threshold: Threshold for StressRNN accuracy when placing stress automatically.
+    return: Sections with stress symbols applied or adjusted.
+    """
+    stressed_tokens = put_stresses(
+        [token for section in sections for token in section],
+        stress_place=stress_place,
+        stress_accuracy_threshold=stress_accuracy_threshold,
+    )
+
+    res = []
+    start = 0
+    for section in sections:
+        res.append(stressed_tokens[start : start + len(section)])
+        start += len(section)
+
     return res
 
 
@@ -1,37 +1,75 @@
-import spacy
-from nltk import Tree
-from spacy.tokens import Token
+from typing import TYPE_CHECKING, NamedTuple
 
+from ru_transcript.models import PARSE_DISABLED_PIPES, get_nlp
 
-class SyntaxTree:
-    """SyntaxTree with an NLP model and empty dependency tree."""
+if TYPE_CHECKING:
+    from spacy.language import Language
+    from spacy.tokens import Doc, Token
 
-    def __init__(self) -> None:
-        """Initialize SyntaxTree."""
-        self.dependency_tree = None
-        self.nlp = spacy.load('ru_core_news_sm')
 
-    def to_nltk_tree(self, node: Token) -> Tree | Token:
-        """
-        Convert a spaCy dependency node into an NLTK Tree recursively.
+class SectionParse(NamedTuple):
+    """Linguistic information about the tokens of a section, taken from one spaCy parse."""
 
-        param node: spaCy token node.
-        return: NLTK Tree or spaCy token if it is a leaf.
-        """
-        if node.n_lefts + node.n_rights > 0:
-            return Tree(node, [self.to_nltk_tree(child) for child in node.children])
+    # POS tags, indexes of heads and subtree spans (first and last index) of the tokens
+    # (None for tokens that spaCy split differently)
+    pos: list[str | None]
+    heads: list[int | None]
+    spans: list[tuple[int | None, int | None] | None]
+
+
+def align_tokens(doc: 'Doc', tokens: list[str]) -> list['Token | None']:
+    """
+    Find spaCy tokens that match tokens of a section joined with spaces.
+
+    param doc: Parsed section.
+    param tokens: Tokens of the section.
+    return: spaCy token for every token of the section or None if spaCy split the token differently.
+    """
+    doc_tokens = {doc_token.idx: doc_token for doc_token in doc}
+    aligned = []
+    start = 0
+    for token in tokens:
+        doc_token = doc_tokens.get(start)
+        aligned.append(doc_token if doc_token is not None and len(doc_token) == len(token) else None)
+        start += len(token) + 1
+
+    return aligned
+
+
+class SyntaxTree:
+    """Syntax parser of sections with a shared NLP model."""
 
-        return node
+    @property
+    def nlp(self) -> 'Language':
+        """Shared spaCy pipeline, loaded on first use."""
+        return get_nlp()
 
-    def make_dependency_tree(self, text: str) -> Tree:
+    def parse_sections(self, sections: list[list[str]], batch_size: int = 64) -> list[SectionParse]:
         """
-        Make a dependency tree for the input text.
+        Parse every section once and collect all information that the pipeline needs.
 
-        param text: Original text.
-        return: NLTK Tree representing the dependency tree.
+        param sections: Tokens of the sections.
+        param batch_size: Batch size for the spaCy pipeline.
+        return: `SectionParse` for every section.
         """
-        doc = self.nlp(text)
-        for sent in doc.sents:
-            self.dependency_tree = self.to_nltk_tree(sent.root)
+        parses = []
+        docs = self.nlp.pipe(
+            [' '.join(tokens) for tokens in sections], batch_size=batch_size, disable=PARSE_DISABLED_PIPES
+        )
+        for tokens, doc in zip(sections, docs, strict=True):
+            aligned = align_tokens(doc, tokens)
+            indexes = {doc_token.i: i for i, doc_token in enumerate(aligned) if doc_token is not None}
+            parses.append(
+                SectionParse(
+                    pos=[doc_token.pos_ if doc_token is not None else None for doc_token in aligned],
+                    heads=[indexes.get(doc_token.head.i) if doc_token is not None else None for doc_token in aligned],
+                    spans=[
+                        (indexes.get(doc_token.left_edge.i), indexes.get(doc_token.right_edge.i))
+                        if doc_token is not None
+                        else None
+                        for doc_token in aligned
+                    ],
+                )
+            )
 
-        return self.dependency_tree
+        return parses
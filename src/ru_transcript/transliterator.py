@@ -0,0 +1,151 @@
+import re
+import unicodedata
+from typing import TYPE_CHECKING, Protocol
+
+if TYPE_CHECKING:
+    from epitran import Epitran
+
+# symbols of Epitran that are replaced by the symbols of the framework
+non_ipa_symbols = {'t͡ɕʲ': 't͡ɕ', 'ʂʲː': 'ʂ', 'ɕːʲ': 'ɕː', 'ʒ': 'ʐ', 'd͡ʐ': 'd͡ʒ'}
+
+# the preprocessor of Epitran for rus-Cyrl, the rules are applied in this order
+_IOTATED = {'а': 'я', 'о': 'ё', 'у': 'ю', 'э': 'е'}
+_SOFT_SIGN_RULES = (('ьйэ', 'ъе'), ('ьйа', 'ъя'))
+# the rule for 'йо' is never applied by Epitran: the comment at the end of its line is read as the right context
+_IOTATION_PATTERN = re.compile('(^|ь)й([уэа])')
+_SOFT_SIGN_VOWEL_RULES = tuple(('ь' + vowel, iotated) for vowel, iotated in _IOTATED.items())
+_HUSHING_E_PATTERN = re.compile('(?<=[жшчщц])э')
+# 'й' is included, because Epitran matches the contexts in NFD where 'й' starts with 'и'
+_SOFT_SIGN_DROP_PATTERN = re.compile('ь(?=[jеёийюя])')
+_HARD_SIGN_PATTERN = re.compile('ъ(?=[еёюя])')
+_PALATALIZATION_PATTERN = re.compile('(?<=[бвдзклмпрстфх])(?=[jеёийюя])')
+# letters that take part in the rules before the palatalization
+_RULE_LETTERS = frozenset('ьйъэ')
+
+# graphemes → symbols of the framework (the postprocessor of Epitran and `non_ipa_symbols` are already applied),
+# graphemes of several letters are replaced first, longest first
+GRAPHEMES = {
+    'джь': 'd͡ʒ',
+    'дж': 'd͡ʒ',
+    'жь': 'ʐ',
+    'чь': 't͡ɕ',
+    'шь': 'ʂ',
+    'щь': 'ɕː',
+    'а': 'a',
+    'б': 'b',
+    'в': 'v',
+    'г': 'ɡ',
+    'д': 'd',
+    'е': 'e',
+    'ё': 'o',
+    'ж': 'ʐ',
+    'з': 'z',
+    'и': 'i',
+    'й': 'j',
+    'к': 'k',
+    'л': 'l',
+    'м': 'm',
+    'н': 'n',
+    'о': 'o',
+    'п': 'p',
+    'р': 'r',
+    'с': 's',
+    'т': 't',
+    'у': 'u',
+    'ф': 'f',
+    'х': 'x',
+    'ц': 't͡s',
+    'ч': 't͡ɕ',
+    'ш': 'ʂ',
+    'щ': 'ɕː',
+    'ъ': '',
+    'ы': 'ɨ',
+    'ь': 'ʲ',
+    'э': 'e',
+    'ю': 'u',
+    'я': 'a',
+}
+_MULTI_GRAPHEMES = tuple(
+    (grapheme, symbol) for grapheme, symbol in sorted(GRAPHEMES.items(), key=lambda x: -len(x[0])) if len(grapheme) > 1
+)
+_TRANSLATION = str.maketrans({grapheme: symbol for grapheme, symbol in GRAPHEMES.items() if len(grapheme) == 1})
+_MULTI_FIRST_LETTERS = frozenset(grapheme[0] for grapheme, _ in _MULTI_GRAPHEMES)
+_HARD_SIGN_SOFT_SIGN_PATTERN = re.compile('ъ+(?=ь)')
+
+
+class Transliterator(Protocol):
+    """Transliterator of stressed tokens into symbols of the framework."""
+
+    def transliterate(self, token: str) -> str:
+        """
+        Transliterate a stressed token.
+
+        param token: Stressed token.
+        return: Transliterated token.
+        """
+
+
+class RusCyrlTransliterator:
+    """
+    Table-driven transliterator for russian.
+
+    It gives the same result as Epitran 'rus-Cyrl' with the replacement of `non_ipa_symbols` for tokens of russian
+    letters with stress marks and hyphens. The rules of the preprocessor of Epitran are compiled into regular
+    expressions over NFC text, the graphemes are replaced by the longest match with the final symbols,
+    so there is no postprocessing.
+    """
+
+    def transliterate(self, token: str) -> str:
+        """
+        Transliterate a stressed token.
+
+        param token: Stressed token.
+        return: Transliterated token.
+        """
+        token = unicodedata.normalize('NFC', token.lower())
+        if not _RULE_LETTERS.isdisjoint(token):
+            for grapheme, replacement in _SOFT_SIGN_RULES:
+                token = token.replace(grapheme, replacement)
+            token = _IOTATION_PATTERN.sub(lambda m: m[1] + _IOTATED[m[2]], token)
+            for grapheme, replacement in _SOFT_SIGN_VOWEL_RULES:
+                token = token.replace(grapheme, replacement)
+            token = _HUSHING_E_PATTERN.sub('е', token)
+            token = _SOFT_SIGN_DROP_PATTERN.sub('', token)
+            token = _HARD_SIGN_PATTERN.sub('й', token)
+        if token[:1] in {'е', 'ё', 'ю', 'я'}:
+            token = 'й' + token
+        token = _PALATALIZATION_PATTERN.sub('ь', token)
+
+        if not _MULTI_FIRST_LETTERS.isdisjoint(token):
+            # 'ъ' gives no symbol, so the soft sign after it is joined with the consonant before it
+            token = _HARD_SIGN_SOFT_SIGN_PATTERN.sub('', token)
+            for grapheme, symbol in _MULTI_GRAPHEMES:
+                token = token.replace(grapheme, symbol)
+
+        return unicodedata.normalize('NFC', token.translate(_TRANSLATION))
+
+
+class EpitranTransliterator:
+    """Transliterator that uses Epitran 'rus-Cyrl'."""
+
+    def __init__(self, epi: 'Epitran') -> None:
+        """
+        Initialize the transliterator.
+
+        param epi: Epitran for 'rus-Cyrl'.
+        """
+        self.epi = epi
+
+    def transliterate(self, token: str) -> str:
+        """
+        Transliterate a stressed token.
+
+        param token: Stressed token.
+        return: Transliterated token.
+        """
+        token = self.epi.transliterate(token).replace('6', '').replace('4', '')
+        for key, value in non_ipa_symbols.items():
+            if key in token:
+                token = token.replace(key, value)
+
+        return token
@@ -0,0 +1,94 @@
+import random
+import unittest
+
+from ru_transcript import RuTranscript
+from ru_transcript.ru_transcript import LPT2_RULES, first_silent, hissing_rd, second_silent, snowball
+
+
+def lpt_2_by_rules(token):
+    # the previous implementation of `RuTranscript._lpt_2`, every rule is checked separately
+    result = token
+    if token != 'ого+' and (
+        token.replace('+', '').startswith('какого')
+        or token.replace('+', '').endswith('ого')
+        or token.replace('+', '').endswith('его')
+    ):
+        accent_index = token.index('+')
+        token = token.replace('+', '').replace('ого', 'ово').replace('его', 'ево')
+        result = token[:accent_index] + '+' + token[accent_index:]
+
+    if 'что' in result:
+        result = token.replace('что', 'што')
+
+    if token not in {'заботься', 'отметься'}:
+        if token[-3:] == 'тся':
+            result = token[:-3] + 'ца'
+        elif token[-4:] == 'ться':
+            result = token[:-4] + 'ца'
+
+    if (token[-2:] in {'ия', 'ие', 'ию'}) and (token[-3] not in {'ц', 'щ'}):
+        result = token[:-2] + ('ь' if token[-3] not in {'ж', 'ш'} else 'й') + token[-1]
+
+    for sub in first_silent + second_silent:
+        if sub in token:
+            new_sub = sub.translate(str.maketrans('', '', 'ьъ'))
+            result = token.translate(str.maketrans(sub, new_sub))
+
+    stem = snowball.stem(token)
+    if ('зч' in token or 'тч' in token or 'дч' in token) and (stem[-3:] == 'чик' or stem[-3:] == 'чиц'):
+        result = token.replace('зч', 'щ').replace('тч', 'ч').replace('дч', 'ч')
+    for key, value in hissing_rd.items():
+        if key in token:
+            result = token.replace(key, value)
+
+    return result
+
+
+def run(function, token):
+    try:
+        return function(token)
+    except (IndexError, ValueError) as e:
+        return type(e).__name__
+
+
+class TestLpt2(unittest.TestCase):
+
+    def test_lpt2_rules(self):
+        testing_tokens = {
+            'what': 'что+бы',
+            'verb_ending': 'учи+тся',
+            'verb_soft_ending': 'учи+ться',
+            'noun_ending': 'ста+ния',
+            'silent': 'че+стного',
+            'hissing_suffix': 'перево+дчик',
+            'hissing_сш': 'бесшу+мный',
+            'hissing_зш': 'безшу+мный',
+            'hissing_сж': 'сжа+ть',
+            'hissing_сч': 'сча+стье',
+        }
+        self.assertEqual([rule.name for rule in LPT2_RULES], list(testing_tokens))
+        res = {name: RuTranscript._lpt_2(token) for name, token in testing_tokens.items()}
+        print(testing_tokens, res)
+        for name, token in testing_tokens.items():
+            self.assertEqual(lpt_2_by_rules(token), res[name], name)
+            self.assertNotEqual(token, res[name], name)
+
+    def test_lpt2_equivalence(self):
+        rng = random.Random(0)
+        parts = [
+            'что', 'тся', 'ться', 'ия', 'ие', 'ию', 'ого', 'его', 'какого', 'чик', 'чиц', 'заботься', 'отметься',
+            *first_silent, *second_silent, *hissing_rd, 'зч', 'тч', 'дч', 'ц', 'щ', 'ж', 'ш', 'а', 'о', 'е', 'и', 'н',
+        ]
+        testing_tokens = ['ого+', 'како+го', 'заботься', 'отметься', 'ничто+го']
+        for _ in range(40000):
+            token = ''.join(rng.choice(parts) for _ in range(rng.randint(1, 4)))
+            stressed_index = rng.randint(0, len(token))
+            testing_tokens.append(token[:stressed_index] + '+' + token[stressed_index:])
+
+        res = [token for token in testing_tokens if run(RuTranscript._lpt_2, token) != run(lpt_2_by_rules, token)]
+        print('checked tokens:', len(testing_tokens), 'different:', res[:10])
+        self.assertEqual([], res)
+
+
+if __name__ == '__main__':
+    unittest.main()
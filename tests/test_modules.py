@@ -1,6 +1,37 @@
+import io
+import json
+import tempfile
 import unittest
+import unittest.mock
 
-from ru_transcript import RuTranscript, text_norm_tok
+from tps.modules import Replacer
+
+from ru_transcript import RuTranscript, get_allophone_info, text_norm_tok, transcribe_batch
+from ru_transcript.cli import main
+from ru_transcript.models import get_lemmas, get_stress_rnn
+from ru_transcript.replacer import DictReplacer, load_plane_dict
+from ru_transcript.resources import ResourceUnavailableError, resource_path
+from ru_transcript.ru_transcript import (
+    _join_words,
+    configure_word_cache,
+    preload_transliterations,
+    replace_e_yo_batch,
+    stem,
+    stem_cache,
+    transliterate,
+    word_cache_info,
+)
+from ru_transcript.stress_cache import StressCache
+from ru_transcript.tools import (
+    SectionParse,
+    allophone_records,
+    find_clitics,
+    find_clitics_lexicon,
+    long_consonants,
+    long_ge,
+    merge_phrasal_words,
+    put_stresses,
+)
 
 
 class TestModules(unittest.TestCase):
@@ -47,6 +78,40 @@ class TestModules(unittest.TestCase):
         print(testing_text, ru_transcript._tokens)
         self.assertEqual([['синтэз', 'речи'], ['это', 'увлекательно']], ru_transcript._tokens)
 
+    def test_dict_replacer(self):
+        testing_text = ['елка', 'дом', 'елка-палка']
+        fallback_tokens = []
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with open(f'{tmp_dir}/yo.dict', 'w', encoding='utf-8') as f:
+                f.write('елка|ёлка\nпалка|палка\n')
+            replacer = DictReplacer(load_plane_dict(f'{tmp_dir}/yo.dict'), lambda: fallback_tokens.append)
+        res = [replacer(token) for token in testing_text[:2]]
+        replacer(testing_text[2])
+        print(testing_text, res, fallback_tokens)
+        self.assertEqual(['ёлка', 'дом'], res)
+        self.assertEqual(['елка-палка'], fallback_tokens)
+
+    def test_dict_replacer_equivalence(self):
+        testing_text = ['дом', 'синтез', 'елка-палка', 'ёлка', 'tts', 'Елка', 'е', '']
+        res = {}
+        for dict_name in ['e.dict', 'yo.dict']:
+            try:
+                path = resource_path(dict_name)
+            except ResourceUnavailableError as e:
+                self.skipTest(str(e))
+            tps_replacer = Replacer([str(path), 'plane'])
+            replacer = DictReplacer(load_plane_dict(path), lambda tps_replacer=tps_replacer: tps_replacer)
+            tokens = [*replacer.table, *testing_text]
+            res[dict_name] = [token for token in tokens if replacer(token) != tps_replacer(token)]
+        print(testing_text, res)
+        self.assertEqual({'e.dict': [], 'yo.dict': []}, res)
+
+    def test_replace_e_yo_batch(self):
+        testing_text = ['синтез', 'елка', 'синтез', 'дом']
+        res = replace_e_yo_batch(testing_text)
+        print(testing_text, res)
+        self.assertEqual(['синтэз', 'ёлка', 'синтэз', 'дом'], res)
+
     def test_dirty_text(self):
         testing_text = 'синтез речи - это#$ «увлекательно»'
         res = text_norm_tok(testing_text)
@@ -60,6 +125,244 @@ class TestModules(unittest.TestCase):
         print(testing_text, ru_transcript.get_stressed_text())
         self.assertEqual('литературнохудо+жественный', ru_transcript.get_stressed_text())
 
+    def test_transcribe_batch(self):
+        testing_texts = ['Как получить транскрипцию?', 'Мышка, кошка и собака', 'Неуклюжие эпиграммы.']
+        testing_a_texts = ['Ка+к получи+ть транскри+пцию?', 'Мы+шка, ко+шка и+ соба+ка', 'Неуклю+жие эпигра+ммы.']
+        # the expected allophones of every text transcribed alone (see test_phrases.py)
+        expected = [
+            ['k', 'a', 'k', 'p', 'ə', 'lʷ', 'ʊ', 't͡ɕ', 'i', 'tʲ', 't', 'r', 'ɐ', 'n', 's', 'k', 'rʲ', 'i', 'p', 't͡sˠ',
+             'ɨ', 'jᶣ', 'ᵿ'],
+            ['mˠ', 'ɨ', 'ʂ', 'k', 'ʌ', 'kʷ', 'o', 'ʂ', 'k', 'ʌ', 'i', 's', 'ɐ', 'b', 'a', 'k', 'ʌ'],
+            ['nʲ', 'ɪ.', 'ᵿ', 'k', 'lᶣ', 'ʉ', 'ʐ', 'j', 'æ.', 'ɪ.', 'pʲ', 'ɪ', 'ɡ', 'r', 'a', 'mːˠ', 'ᵻ'],
+        ]
+        res = [r.get_allophones() for r in transcribe_batch(testing_texts, testing_a_texts, batch_size=2)]
+        print(testing_texts, res)
+        self.assertEqual(expected, res)
+
+    def test_lemmas_of_irregular_exceptions(self):
+        testing_text = 'Сегодня одиннадцать'
+        testing_a_text = 'Сего+дня оди+ннадцать'
+        with unittest.mock.patch('ru_transcript.ru_transcript.get_lemmas', wraps=get_lemmas) as lemmatize:
+            ru_transcript = RuTranscript(testing_text, testing_a_text)
+            ru_transcript.transcribe()
+        res = set().union(*(call.args[0] for call in lemmatize.call_args_list))
+        print(testing_text, ru_transcript._tokens, res)
+        # all tokens are lemmatized in isolation after LPT-1
+        self.assertEqual([['севодня', 'одинацать']], ru_transcript._tokens)
+        self.assertEqual({'севодня', 'одинацать'}, res)
+
+    def test_iter_sections(self):
+        testing_text = 'Мороз и солнце, день чудесный! Ещё ты дремлешь, друг прелестный.'
+        ru_transcript = RuTranscript(testing_text)
+        ru_transcript.transcribe()
+        res = list(RuTranscript(testing_text).iter_sections())
+        print(testing_text, res)
+        self.assertEqual(
+            ru_transcript.get_allophones(save_stresses=True, save_spaces=True),
+            [allophone for section in res for allophone in section.allophones],
+        )
+        self.assertEqual(
+            ru_transcript.get_phonemes(save_stresses=True, save_spaces=True),
+            [phoneme for section in res for phoneme in section.phonemes],
+        )
+        self.assertEqual(ru_transcript.get_stressed_text(), ' '.join(' '.join(s.stressed_tokens) for s in res))
+        self.assertEqual(['|', '||', '|', '||'], [section.pause for section in res])
+
+    def test_cli_jsonl(self):
+        testing_text = 'Как получить транскрипцию?'
+        records = [{'id': 1, 'text': testing_text}, {'id': 2}]
+        input_stream = io.StringIO('\n'.join(json.dumps(record, ensure_ascii=False) for record in records))
+        output_stream = io.StringIO()
+        with unittest.mock.patch('sys.stdin', input_stream), unittest.mock.patch('sys.stdout', output_stream):
+            main(['--input-format', 'jsonl', '--format', 'stressed'])
+        res = [json.loads(line) for line in output_stream.getvalue().splitlines()]
+        print(testing_text, res)
+        self.assertEqual('ка+к получи+ть транскри+пцию', res[0]['stressed'])
+        self.assertEqual(2, res[1]['id'])
+        self.assertIn('error', res[1])
+
+    def test_cli_invalid_records(self):
+        testing_text = 'Как получить транскрипцию?'
+        lines = [
+            '{"id": 1, "text": "Как получить транскрипцию?"}',
+            '{"id": 2, "text": ',
+            '[1]',
+            '"x"',
+            '{"id": 5, "text": "Как получить транскрипцию?", "stressed": 5}',
+            '{"id": 6, "text": "Как получить транскрипцию?", "stressed": "Ка+к получи+ть транскри+пцию?"}',
+            '{"id": 7, "text": "Как получить транскрипцию?", "error": null}',
+            '{"id": 8}',
+            '{"id": 9, "text": "Как получить транскрипцию?"}',
+        ]
+        input_stream = io.StringIO('\n'.join(lines))
+        output_stream = io.StringIO()
+        with unittest.mock.patch('sys.stdin', input_stream), unittest.mock.patch('sys.stdout', output_stream):
+            main(['--input-format', 'jsonl', '--stressed-field', 'stressed', '--format', 'stressed'])
+        res = [json.loads(line) for line in output_stream.getvalue().splitlines()]
+        print(testing_text, res)
+        self.assertEqual(
+            [
+                {'id': 1, 'text': testing_text, 'stressed': 'ка+к получи+ть транскри+пцию'},
+                {'error': 'Line 2: invalid JSON (Expecting value).'},
+                {'error': 'Line 3: a JSON object is expected, got list.'},
+                {'error': 'Line 4: a JSON object is expected, got str.'},
+                {'id': 5, 'text': testing_text, 'stressed': 5, 'error': "The field 'stressed' is not a string."},
+                {'id': 6, 'text': testing_text, 'stressed': 'ка+к получи+ть транскри+пцию'},
+                {'id': 7, 'text': testing_text, 'error': None, 'stressed': 'ка+к получи+ть транскри+пцию'},
+                {'id': 8, 'error': "No text in the field 'text'."},
+                {'id': 9, 'text': testing_text, 'stressed': 'ка+к получи+ть транскри+пцию'},
+            ],
+            res,
+        )
+
+    def test_word_cache(self):
+        testing_text = 'Мороз и солнце день чудесный, ещё ты дремлешь друг прелестный. Мороз и солнце!'
+        res = []
+        for maxsize in [0, 1000, 1000]:
+            configure_word_cache(maxsize)
+            ru_transcript = RuTranscript(testing_text)
+            ru_transcript.transcribe()
+            res.append(ru_transcript.get_allophones(save_stresses=True, save_spaces=True))
+        print(testing_text, word_cache_info())
+        self.assertEqual([res[0]] * 3, res)
+        self.assertGreater(word_cache_info()['words'].hits, 0)
+
+    def test_transliteration_cache(self):
+        testing_tokens = ['мо+локо', 'до+м', 'ко+т']
+        configure_word_cache(2)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with open(f'{tmp_dir}/words.tsv', 'w', encoding='utf-8') as f:
+                f.write('мо+локо\t10\nдо+м\t30\nко+т\t20\n')
+            res = preload_transliterations(f'{tmp_dir}/words.tsv')
+        hits = word_cache_info()['transliterations'].hits
+        print(testing_tokens, res, word_cache_info()['transliterations'])
+        self.assertEqual(2, res)
+        self.assertEqual(['ko+t', 'do+m'], [transliterate(token) for token in testing_tokens[:0:-1]])
+        self.assertEqual(hits + 2, word_cache_info()['transliterations'].hits)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with open(f'{tmp_dir}/words.tsv', 'w', encoding='utf-8') as f:
+                f.write('мо+локо\t10\nдо+м\tmany\n')
+            with self.assertRaisesRegex(ValueError, "words.tsv, line 2: invalid frequency 'many'"):
+                preload_transliterations(f'{tmp_dir}/words.tsv')
+        configure_word_cache()
+
+    def test_irregular_exceptions(self):
+        testing_text = ['сегодня', 'отель', 'кафе', 'дом']
+        res = [RuTranscript._lpt_1(token, token + '+')[0] for token in testing_text]
+        print(testing_text, res, word_cache_info()['stems'])
+        self.assertEqual(['севодня', 'отэль', 'кафэ', 'дом'], res)
+        self.assertEqual('сегодн', stem('сегодня'))
+        self.assertIn('отель', stem_cache)
+        # tokens that can't have an exception stem aren't stemmed
+        self.assertNotIn('дом', stem_cache)
+
+    def test_stress_cache(self):
+        testing_stresses = {'замок': 'за+мок', 'молоко': 'молоко+'}
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            stress_cache = StressCache(f'{tmp_dir}/stresses.sqlite3', model_version='test')
+            stress_cache.put_many(testing_stresses, 0.86)
+            stress_cache.export(f'{tmp_dir}/stresses.tsv')
+            new_stress_cache = StressCache(f'{tmp_dir}/new_stresses.sqlite3', model_version='test')
+            new_stress_cache.warm(f'{tmp_dir}/stresses.tsv', 0.86)
+            res = new_stress_cache.get_many(['замок', 'молоко', 'нос'], 0.86)
+            print(testing_stresses, res)
+            self.assertEqual(testing_stresses, res)
+            self.assertEqual({}, new_stress_cache.get_many(['замок'], 0.5))
+
+    def test_stresses_of_many_tokens(self):
+        testing_text = ['замок', 'молоко', 'дорога', 'стрелки', 'облака', 'писатель', 'замок', 'руки', 'окна', 'города']
+        with unittest.mock.patch(
+            'ru_transcript.tools.stress_tools.get_stress_cache', lambda: StressCache(None, model_version='test')
+        ):
+            res = put_stresses(testing_text)
+        print(testing_text, res)
+        # tokens of many sections are predicted together, but every token gets the stress it gets alone
+        self.assertEqual([get_stress_rnn().put_stress(token, accuracy_threshold=0.86) for token in testing_text], res)
+
+    def test_clitics_lexicon(self):
+        testing_text = ['да', 'это', 'же', 'писатель', 'для', 'её', 'ежика']
+        res = find_clitics_lexicon(testing_text)
+        print(testing_text, res)
+        self.assertEqual({(1, 0), (1, 2)}, res)
+
+    def test_join_phonemes_long_section(self):
+        testing_text = ['ʂ+ɨ', 'n+oʂ'] * 5000
+        res = RuTranscript._join_phonemes(testing_text)
+        print(len(testing_text), len(res))
+        self.assertEqual(['ʂ', '+', 'ɨ', '_', 'n', '+', 'o'], res[:7])
+        self.assertEqual(5000 * 3 + 5000 * 4 + 9999, len(res))
+        with self.assertRaises(ValueError):
+            RuTranscript._join_phonemes(['n+oQʂ', 'ʂ+ɨ'])
+
+    def test_join_words(self):
+        testing_text = [['ʂ+ɨ', 'n+oʂ'], ['ʂ+ɨ', ''], ['ʂ+ɨ', '', ''], ['', 'ʂ+ɨ'], [''], ['ʂ+ɨ', '-']]
+        configure_word_cache(1000)
+        res = [_join_words(tokens) for tokens in testing_text]
+        print(testing_text, res)
+        self.assertEqual([RuTranscript._join_phonemes(tokens) for tokens in testing_text], res)
+        self.assertEqual(['ʂ', '+', 'ɨ'], res[1])
+
+    def test_long_consonants_long_section(self):
+        testing_section = ['t', 't', 'a', 's', '_', 's', 'o', 'z', 'ʐ', 'u', 'ʐ', 'ʐ', 'ɨ'] * 3000
+        res = testing_section[:]
+        long_consonants(res)
+        long_ge(res)
+        print(len(testing_section), len(res))
+        self.assertEqual(['tː', 'a', 'sː', '_', 'o', 'ʑː', 'u', 'ʑː', 'ɨ'] * 3000, res)
+
+    def test_prestressed_syllable_sign_long_section(self):
+        testing_section = ['m', 'a', 'l', 'a', 'k', 'o', '+', '_'] * 2000
+        res = RuTranscript.add_prestressed_syllable_sign(testing_section)
+        print(len(testing_section), len(res))
+        self.assertEqual(['m', 'a', 'l', 'a', '-', 'k', 'o', '+', '_'] * 2000, res)
+
+    def test_merge_phrasal_words(self):
+        testing_text = ['v', '_', 's', 't', '+', 'o', 'l', '_', 's', '_', 's', 'a', 'x', '+', 'a', 'r', 'o', 'm', '_', 'ʐ', 'e']
+        res = merge_phrasal_words(testing_text, {(1, 0), (3, 2), (3, 4)})
+        print(testing_text, res)
+        self.assertEqual(
+            ['v', 's', 't', '+', 'o', 'l', '_', 's', 's', 'a', 'x', '+', 'a', 'r', 'o', 'm', 'ʐ', 'e'], res
+        )
+
+    def test_merge_chained_clitics(self):
+        testing_text = [['i', '_', 'v', '_', 'd', 'o', 'm', '+', 'a'], ['v', '_', 'd', 'o', 'm', '+', 'e', '_', 'i', '_', 'v', '_', 's', '+', 'a', 'd']]
+        res = [
+            ''.join(merge_phrasal_words(testing_text[0], {(1, 0), (2, 1)})),
+            ''.join(merge_phrasal_words(testing_text[1], {(1, 0), (4, 3)})),
+        ]
+        print(testing_text, res)
+        self.assertEqual(['iv_dom+a', 'vdom+e_i_vs+ad'], res)
+
+    def test_allophone_records(self):
+        testing_allophone = 't͡s'
+        res = allophone_records[testing_allophone]
+        print(testing_allophone, res)
+        self.assertEqual(
+            {
+                'phon': 'C',
+                'place': 'lingual, dental',
+                'manner': 'obstruent, affricate',
+                'palatalization': 'ahard',
+                'voice': 'voiceless',
+                'pair': None,
+                'hissing': None,
+                'class': 'voiceless',
+            },
+            get_allophone_info(testing_allophone),
+        )
+        self.assertEqual((True, True, True, False), (res.is_consonant, res.is_hard, res.always_hard, res.is_voiced))
+
+    def test_clitics_parse(self):
+        testing_text = ['в', 'стол', 'с', 'сахаром', 'же']
+        parse = SectionParse(
+            pos=['ADP', 'NOUN', 'ADP', 'NOUN', 'PART'],
+            heads=[1, 1, 3, 1, 3],
+            spans=[(0, 0), (0, 4), (2, 2), (2, 4), (4, 4)],
+        )
+        res = find_clitics(parse, testing_text)
+        print(testing_text, res)
+        self.assertEqual({(1, 0), (3, 2), (3, 4)}, res)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,52 @@
+import multiprocessing
+import os
+import time
+import unittest
+import unittest.mock
+
+from ru_transcript.parallel import CRASH_ERROR, transcribe_corpus
+
+
+def fake_transcribe_batch(texts, stressed_texts, batch_size, **kwargs):
+    # the workers are forked, so they use this function instead of the real pipeline
+    if 'crash' in texts:
+        os._exit(1)
+    # later chunks are ready earlier
+    time.sleep(0.2 / (1 + int(texts[0].split()[-1])))
+    return [text.upper() for text in texts]
+
+
+@unittest.skipUnless(multiprocessing.get_start_method() == 'fork', 'the workers must inherit the patches')
+class TestParallel(unittest.TestCase):
+
+    def setUp(self):
+        patches = [
+            unittest.mock.patch('ru_transcript.parallel.transcribe_batch', fake_transcribe_batch),
+            unittest.mock.patch('ru_transcript.parallel.preload', lambda: None),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def test_input_order(self):
+        testing_texts = [f'text {i}' for i in range(30)]
+        res = list(transcribe_corpus(testing_texts, workers=3, chunksize=2))
+        print(testing_texts, res)
+        self.assertEqual(list(range(30)), [r.index for r in res])
+        self.assertEqual([text.upper() for text in testing_texts], [r.transcript for r in res])
+        self.assertEqual([None] * 30, [r.error for r in res])
+
+    def test_crashing_text(self):
+        testing_texts = [f'text {i}' for i in range(30)]
+        testing_texts[5] = testing_texts[22] = 'crash'
+        res = list(transcribe_corpus(testing_texts, workers=3, chunksize=4))
+        print(testing_texts, res)
+        self.assertEqual(list(range(30)), [r.index for r in res])
+        self.assertEqual(
+            [None if text == 'crash' else text.upper() for text in testing_texts], [r.transcript for r in res]
+        )
+        self.assertEqual([CRASH_ERROR if text == 'crash' else None for text in testing_texts], [r.error for r in res])
+
+
+if __name__ == '__main__':
+    unittest.main()
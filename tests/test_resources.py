@@ -0,0 +1,77 @@
+import socket
+import tempfile
+import threading
+import time
+import unittest
+import unittest.mock
+from pathlib import Path
+
+import tps
+
+from ru_transcript import resources
+from ru_transcript.resources import ResourceChecksumError, ResourceUnavailableError, file_checksum, resource_path
+
+
+class TestResources(unittest.TestCase):
+
+    def test_pinned_checksum(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            source = Path(tmp_dir) / 'source.dict'
+            source.write_text('елка|ёлка\n', encoding='utf-8')
+            cache_dir = Path(tmp_dir) / 'cache'
+            pins = {'yo.dict': file_checksum(source), 'e.dict': '0' * 64}
+            with unittest.mock.patch.dict(resources.PINNED_CHECKSUMS, pins, clear=True), unittest.mock.patch(
+                'ru_transcript.resources._locate', return_value=source
+            ):
+                res = resource_path('yo.dict', cache_dir=cache_dir)
+                print(pins, res)
+                self.assertEqual(pins['yo.dict'], file_checksum(res))
+                # a tampered download is rejected and not cached
+                with self.assertRaises(ResourceChecksumError):
+                    resource_path('e.dict', cache_dir=cache_dir)
+                self.assertFalse((cache_dir / 'e.dict').exists())
+                # a tampered cached file is rejected even if the manifest is updated
+                res.write_text('елка|елка\n', encoding='utf-8')
+                (cache_dir / 'manifest.json').write_text('{}', encoding='utf-8')
+                with self.assertRaises(ResourceChecksumError):
+                    resource_path('yo.dict', cache_dir=cache_dir)
+
+    def test_download_timeout(self):
+        release = threading.Event()
+        downloads = []
+
+        def slow_download(name):
+            downloads.append(name)
+            release.wait(5)
+            path = Path(tmp_dir) / 'tps' / name
+            path.parent.mkdir(exist_ok=True)
+            path.write_text('елка|ёлка\n', encoding='utf-8')
+            return path
+
+        default_timeout = socket.getdefaulttimeout()
+        with tempfile.TemporaryDirectory() as tmp_dir, unittest.mock.patch.object(
+            tps, 'find', side_effect=FileNotFoundError
+        ), unittest.mock.patch.object(tps, 'download', slow_download), unittest.mock.patch.object(
+            resources, 'DOWNLOAD_TIMEOUT', 0.1
+        ):
+            start = time.perf_counter()
+            with self.assertRaises(ResourceUnavailableError):
+                resource_path('yo.dict', cache_dir=tmp_dir, offline=False)
+            elapsed = time.perf_counter() - start
+            # the download that timed out is still running, so it isn't started again
+            with self.assertRaises(ResourceUnavailableError):
+                resource_path('yo.dict', cache_dir=tmp_dir, offline=False)
+            release.set()
+            while 'yo.dict' in resources._abandoned_downloads and time.perf_counter() - start < 5:
+                time.sleep(0.01)
+            print(elapsed, downloads)
+            self.assertLess(elapsed, 2)
+            self.assertEqual(['yo.dict'], downloads)
+            # the file written after the timeout is removed
+            self.assertNotIn('yo.dict', resources._abandoned_downloads)
+            self.assertFalse((Path(tmp_dir) / 'tps' / 'yo.dict').exists())
+        self.assertEqual(default_timeout, socket.getdefaulttimeout())
+
+
+if __name__ == '__main__':
+    unittest.main()
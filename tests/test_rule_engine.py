@@ -0,0 +1,68 @@
+import random
+import unittest
+
+from ru_transcript.tools import allophones, consonant_rules, first_jot, nasal_m_n, silent_r, stunning, voiced_ts
+from ru_transcript.tools.phoneme_codes import decode, encode, has_feature
+
+
+def apply_passes(section):
+    stunning(section)
+    first_jot(section)
+    nasal_m_n(section)
+    silent_r(section)
+    voiced_ts(section)
+
+
+class TestRuleEngine(unittest.TestCase):
+
+    def test_consonant_rules(self):
+        testing_section = ['j', 'a', 'r', 't͡s', 'm', 'v', 'a', 'z', '_', 'a', 'd', '_', 'k', 'o', 'r']
+        res = testing_section[:]
+        consonant_rules.apply(res)
+        print(testing_section, res)
+        self.assertEqual(['ʝ', 'a', 'r̥', 'd̻͡z̪', 'ɱ', 'v', 'a', 'z', '_', 'a', 't', '_', 'k', 'o', 'r̥'], res)
+
+    def test_consonant_rules_equivalence(self):
+        rng = random.Random(0)
+        frequent = ['_', '+', 'r', 'rʲ', 'm', 'n', 'nʲ', 't͡s', 'j', 'z', 'd', 'v', 'f', 'k', 'a', 'o']
+        symbols = [phon for phon in allophones if phon]
+        checked = 0
+        for _ in range(20000):
+            testing_section = [
+                rng.choice(frequent if rng.random() < 0.6 else symbols) for _ in range(rng.randint(0, 10))
+            ]
+            expected = testing_section[:]
+            try:
+                apply_passes(expected)
+            except KeyError:  # the separate passes fail on pairs that aren't in the table of allophones
+                continue
+            res = testing_section[:]
+            consonant_rules.apply(res)
+            self.assertEqual(expected, res, testing_section)
+            checked += 1
+
+        print('checked sections:', checked)
+
+    def test_consonant_rules_batch(self):
+        rng = random.Random(1)
+        frequent = ['_', '+', 'r', 'rʲ', 'm', 'n', 'nʲ', 't͡s', 'j', 'z', 'd', 'v', 'f', 'k', 'a', 'o']
+        testing_sections = [[rng.choice(frequent) for _ in range(rng.randint(0, 12))] for _ in range(200)]
+        expected = [section[:] for section in testing_sections]
+        for section in expected:
+            consonant_rules.apply(section)
+        res = [section[:] for section in testing_sections]
+        consonant_rules.apply_batch(res)
+        print(testing_sections[:3], res[:3])
+        self.assertEqual(expected, res)
+
+    def test_phoneme_codes(self):
+        testing_section = ['z', 'a', '_', 'ɱ', 'unknown']
+        codes = encode(testing_section)
+        res = has_feature('voice', 'voiced')[codes].tolist()
+        print(testing_section, codes, res)
+        self.assertEqual(['z', 'a', '_', 'ɱ'], decode(codes[:4]))
+        self.assertEqual([True, False, False, True, False], res)
+
+
+if __name__ == '__main__':
+    unittest.main()
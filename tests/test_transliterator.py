@@ -0,0 +1,39 @@
+import itertools
+import random
+import unittest
+
+from ru_transcript.data_bundle import load_tables
+from ru_transcript.models import get_epitran
+from ru_transcript.transliterator import EpitranTransliterator, RusCyrlTransliterator
+
+LETTERS = 'абвгдеёжзийклмнопрстуфхцчшщъыьэюя'
+
+
+class TestTransliterator(unittest.TestCase):
+
+    def test_transliterate(self):
+        testing_text = ['мо+локо', 'объё+м', 'съе+л', 'ёлка', 'но+чь', 'джо+ут', 'ша+хматы']
+        res = [RusCyrlTransliterator().transliterate(token) for token in testing_text]
+        print(testing_text, res)
+        self.assertEqual(['mo+loko', 'obʲjo+m', 'sʲje+l', 'jolka', 'no+t͡ɕ', 'd͡ʒo+ut', 'ʂa+xmatɨ'], res)
+
+    def test_epitran_equivalence(self):
+        rng = random.Random(0)
+        symbols = LETTERS + '+-'
+        # all contexts of the rules of Epitran are not longer than 3 letters
+        testing_words = [''.join(word) for n in range(1, 4) for word in itertools.product(symbols, repeat=n)]
+        testing_words += list(load_tables()['stress_default_dict'].values())
+        testing_words += [
+            ''.join(rng.choice(symbols) for _ in range(rng.randint(4, 14))) for _ in range(20000)
+        ]
+        testing_words += [word.capitalize() for word in testing_words[-1000:]]
+
+        builtin = RusCyrlTransliterator()
+        epi = EpitranTransliterator(get_epitran())
+        res = [word for word in testing_words if builtin.transliterate(word) != epi.transliterate(word)]
+        print('checked words:', len(testing_words), 'different:', res[:10])
+        self.assertEqual([], res)
+
+
+if __name__ == '__main__':
+    unittest.main()